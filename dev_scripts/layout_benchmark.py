@@ -0,0 +1,73 @@
+"""Measure the time taken to break a long flowable into lines.
+
+This times both a full layout and laying out again after a change near the end of
+the flowable, when earlier lines can be kept.
+
+The flowable has a break opportunity and a margin controller in every measure, like a
+long part with a time signature change in each bar.
+
+Usage: python dev_scripts/layout_benchmark.py [measure_count] [--optimal]
+
+Pass ``--optimal`` to use an ``OptimalLineBreaker`` instead of the default greedy one.
+"""
+
+import sys
+import time
+
+from neoscore.common import *
+from neoscore.core.break_hint import BreakHint
+from neoscore.core.layout_controllers import MarginController
+from neoscore.core.line_breaking import GreedyLineBreaker, OptimalLineBreaker
+
+MEASURE_WIDTH = Mm(30)
+
+
+def main(measure_count: int, optimal: bool):
+    neoscore.setup()
+    flowable = Flowable(
+        ORIGIN,
+        None,
+        MEASURE_WIDTH * measure_count,
+        Mm(20),
+        line_breaker=OptimalLineBreaker() if optimal else GreedyLineBreaker(),
+    )
+    for i in range(measure_count):
+        BreakHint((MEASURE_WIDTH * i, ZERO), flowable)
+    # Take the best of several runs to reduce noise
+    full_best = None
+    edit_best = None
+    for run in range(3):
+        add_margin_controllers(flowable, measure_count)
+        # Forget the previous layout so every line is laid out again
+        flowable._line_layout_inputs = None
+        start = time.perf_counter()
+        flowable._generate_lines()
+        full_elapsed = time.perf_counter() - start
+        full_best = full_elapsed if full_best is None else min(full_best, full_elapsed)
+        flowable.post_render_hook()
+        # Then lay out again after an edit three quarters of the way through
+        add_margin_controllers(flowable, measure_count)
+        edit_x = MEASURE_WIDTH * ((measure_count * 3) // 4) + Mm(run + 1)
+        BreakHint((edit_x, ZERO), flowable)
+        start = time.perf_counter()
+        flowable._generate_lines()
+        edit_elapsed = time.perf_counter() - start
+        edit_best = edit_elapsed if edit_best is None else min(edit_best, edit_elapsed)
+        flowable.post_render_hook()
+    print(
+        f"{measure_count} measures, {len(flowable.lines)} lines: "
+        f"{full_best * 1000:.1f} ms, "
+        f"{edit_best * 1000:.1f} ms after an edit 3/4 through"
+    )
+
+
+def add_margin_controllers(flowable: Flowable, measure_count: int):
+    for i in range(measure_count):
+        flowable.add_margin_controller(
+            MarginController(MEASURE_WIDTH * i, Mm(i % 3), "benchmark")
+        )
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--optimal"]
+    main(int(args[0]) if args else 10000, "--optimal" in sys.argv)
@@ -0,0 +1,61 @@
+"""Measure the memory used per object by common notation classes.
+
+Each class is compared against an otherwise identical subclass which doesn't declare
+``__slots__``, and so carries an instance ``__dict__`` like ordinary classes do.
+
+Usage: python dev_scripts/memory_benchmark.py [object_count]
+"""
+
+import sys
+import tracemalloc
+
+from neoscore.common import *
+from neoscore.western.flag import Flag
+from neoscore.western.ledger_line import LedgerLine
+from neoscore.western.rhythm_dot import RhythmDot
+from neoscore.western.stem import Stem
+
+
+def measure(factory, count: int) -> float:
+    """Find the average number of bytes allocated per object made by ``factory``"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    for obj in objects:
+        obj.remove()
+    return (after - before) / count
+
+
+def unslotted(cls):
+    return type(f"Unslotted{cls.__name__}", (cls,), {})
+
+
+def main(count: int):
+    neoscore.setup()
+    staff = Staff(ORIGIN, None, Mm(200))
+    Clef(ZERO, staff, "treble")
+    factories = {
+        Notehead: lambda cls: cls(ZERO, staff, "c'", (1, 4)),
+        Accidental: lambda cls: cls(ORIGIN, staff, AccidentalType.SHARP),
+        RhythmDot: lambda cls: cls(ORIGIN, staff),
+        LedgerLine: lambda cls: cls(ORIGIN, staff, Mm(2)),
+        Stem: lambda cls: cls(ORIGIN, staff, DirectionY.UP, Mm(7)),
+        Flag: lambda cls: cls(ORIGIN, staff, (1, 8), DirectionY.UP),
+    }
+    print(f"{'class':<12}{'slotted':>10}{'with dict':>12}{'saved':>10}")
+    for cls, factory in factories.items():
+        dict_cls = unslotted(cls)
+        # Take the best of several runs, so growth of caches shared between objects
+        # isn't counted
+        slotted_size = min(measure(lambda: factory(cls), count) for _ in range(3))
+        dict_size = min(measure(lambda: factory(dict_cls), count) for _ in range(3))
+        print(
+            f"{cls.__name__:<12}{slotted_size:>9.0f}B{dict_size:>11.0f}B"
+            f"{dict_size - slotted_size:>9.0f}B"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,85 @@
+"""Measure the speed of ``Unit`` and ``Point`` arithmetic and the layout code using it.
+
+Each case is timed over many repetitions, keeping the best of several runs to reduce
+noise, and reported in nanoseconds per operation. Run this before and after changes to
+units, points, or the listed layout code to catch slowdowns.
+
+Usage: python dev_scripts/unit_benchmark.py [repetitions]
+"""
+
+import sys
+import timeit
+
+from neoscore.common import *
+
+
+def unit_cases() -> dict:
+    a = Mm(3)
+    b = Mm(4)
+    return {
+        "Mm(float)": lambda: Mm(3),
+        "Mm(Unit)": lambda: Mm(b),
+        "Unit + Unit": lambda: a + b,
+        "Unit - Unit": lambda: a - b,
+        "Unit * float": lambda: a * 2,
+        "float * Unit": lambda: 2 * a,
+        "Unit / float": lambda: a / 2,
+        "Unit / Unit": lambda: a / b,
+        "-Unit": lambda: -a,
+        "abs(Unit)": lambda: abs(a),
+        "Unit < Unit": lambda: a < b,
+        "Unit == Unit": lambda: a == b,
+    }
+
+
+def point_cases() -> dict:
+    p = Point(Mm(3), Mm(4))
+    q = Point(Mm(5), Mm(6))
+    return {
+        "Point + Point": lambda: p + q,
+        "Point - Point": lambda: p - q,
+        "Point * float": lambda: p * 2,
+        "-Point": lambda: -p,
+    }
+
+
+def layout_cases() -> dict:
+    staff = Staff(ORIGIN, None, Mm(200))
+    Clef(ZERO, staff, "treble")
+    nested = staff
+    for _ in range(5):
+        nested = PositionedObject((Mm(1), Mm(1)), nested)
+    path = Path(ORIGIN, None)
+    for i in range(50):
+        path.line_to(Mm(i), Mm(i % 3))
+    chord = Chordrest(Mm(10), staff, ["c", "e", "g", "c'", "d'"], (1, 4))
+    return {
+        "map_x_to": lambda: staff.map_x_to(nested),
+        "descendant_pos_x": lambda: staff.descendant_pos_x(nested),
+        # Call the functions behind cached properties so nothing is reused
+        "Path breakable length (50 elements)": (
+            lambda: Path._cacheable_breakable_length.func(path)
+        ),
+        "Chordrest notehead column rect": (
+            lambda: Chordrest.notehead_column_bounding_rect.func(chord)
+        ),
+        "Chordrest rebuild (5 notes)": chord._rebuild,
+    }
+
+
+def report(cases: dict, repetitions: int):
+    for name, func in cases.items():
+        number = max(repetitions // 100, 1) if "rebuild" in name else repetitions
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name:<40}{best / number * 1e9:>12.0f} ns")
+
+
+def main(repetitions: int):
+    neoscore.setup()
+    report(unit_cases(), repetitions)
+    report(point_cases(), repetitions)
+    report(layout_cases(), repetitions // 10)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -55,6 +55,12 @@ class Brush:
         """Create a non-drawing brush."""
         return Brush(pattern=BrushPattern.INVISIBLE)
 
+    def _note_change(self):
+        # Imported here to work around a cyclic import
+        from neoscore.core import neoscore
+
+        neoscore._note_document_change()
+
     def _regenerate_interface(self):
         self._interface = BrushInterface(self.color, self.pattern)
 
@@ -67,6 +73,7 @@ class Brush:
     def color(self, value: Color):
         self._color = value
         self._regenerate_interface()
+        self._note_change()
 
     @property
     def pattern(self) -> BrushPattern:
@@ -77,6 +84,7 @@ class Brush:
     def pattern(self, value: BrushPattern):
         self._pattern = value
         self._regenerate_interface()
+        self._note_change()
 
     @property
     def interface(self) -> BrushInterface:
@@ -1,12 +1,21 @@
-from collections.abc import Callable
-from typing import Optional
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 from neoscore.core.brush import Brush
 from neoscore.core.page_supplier import PageOverlayFunc, PageSupplier
 from neoscore.core.paper import Paper
 from neoscore.core.point import Point
+from neoscore.core.positioned_object import _begin_render_epoch, _end_render_epoch
+from neoscore.core.rect import Rect
+from neoscore.core.spatial_index import SpatialIndex
 from neoscore.core.units import ZERO, Mm
 
+if TYPE_CHECKING:
+    from neoscore.core.page import Page
+    from neoscore.core.positioned_object import PositionedObject
+    from neoscore.interface.positioned_object_interface import PositionedObjectInterface
+
 _PAGE_DISPLAY_GAP = Mm(50)
 
 
@@ -27,6 +36,29 @@ class Document:
         """
         self._paper = paper
         self._pages = PageSupplier(self, overlay_func)
+        self._dirty_tracking_enabled = False
+        self._currently_rendering = False
+        self._generation = 0
+        self._reuse_render_caches = False
+        # The render epoch of the last full render and the generation it rendered
+        self._last_render_epoch: Optional[int] = None
+        self._last_render_epoch_generation: Optional[int] = None
+        # An index of rendered objects by their interfaces' bounding rects, built
+        # on demand after each render
+        self._rendered_object_index: Optional[SpatialIndex[PositionedObject]] = None
+        # The region rendered in the last full render, if it was restricted, and the
+        # pages skipped for lying outside it
+        self._render_region: Optional[Rect] = None
+        self._culled_pages: Dict[Page, None] = {}
+        # Insertion-ordered dicts keyed by object ID, used as ordered sets
+        self._dirty_objects: Dict[int, PositionedObject] = {}
+        self._detached_objects: Dict[int, PositionedObject] = {}
+        # Interfaces from the previous render of subtrees being re-rendered, keyed
+        # by owner object ID and index in `interfaces`, or `None` for an owner's
+        # `interface_for_children`.
+        self._reusable_interfaces: Dict[
+            Tuple[int, Optional[int]], PositionedObjectInterface
+        ] = {}
 
     @property
     def paper(self) -> Paper:
@@ -36,6 +68,7 @@ class Document:
     @paper.setter
     def paper(self, value):
         self._paper = value
+        self._note_change()
 
     @property
     def pages(self) -> PageSupplier:
@@ -63,12 +96,86 @@ class Document:
         """
         return self._pages
 
-    def _run_on_all_descendants(self, func: Callable):
-        for page in self.pages:
-            for obj in page.descendants:
-                func(obj)
+    @property
+    def dirty_tracking_enabled(self) -> bool:
+        """Whether tree mutations are being recorded for incremental rendering.
 
-    def render(self, display_page_geometry: bool, background_brush: Brush):
+        This is managed by :obj:`.neoscore.set_incremental_render` and should not be
+        set directly.
+        """
+        return self._dirty_tracking_enabled
+
+    @dirty_tracking_enabled.setter
+    def dirty_tracking_enabled(self, value: bool):
+        self._dirty_tracking_enabled = value
+        self._dirty_objects.clear()
+        self._detached_objects.clear()
+
+    @property
+    def reuse_render_caches(self) -> bool:
+        """Whether full renders may reuse values cached by the previous render.
+
+        Values of :obj:`.render_cached_property` properties are normally discarded
+        between renders. If this is enabled, a full render of a document which has
+        not changed (see :obj:`.generation`) since the previous full render reuses
+        them instead, which can speed up repeated renders of static scores, like
+        frames of a refresh function which only moves the viewport.
+
+        This is disabled by default, since changes neoscore can't observe, like
+        mutating a font or a path element's anchor object, are not detected.
+        """
+        return self._reuse_render_caches
+
+    @reuse_render_caches.setter
+    def reuse_render_caches(self, value: bool):
+        self._reuse_render_caches = value
+
+    @property
+    def generation(self) -> int:
+        """A counter incremented by every change to the document.
+
+        This is bumped by changes to the document tree and object properties, as
+        well as changes to the paper and to :obj:`.Pen` and :obj:`.Brush` objects.
+        Changes made by objects during rendering are not counted. Exports use this
+        to skip rebuilding the scene when nothing has changed since the last render.
+        """
+        return self._generation
+
+    def _note_change(self):
+        """Record that something affecting the rendered document changed."""
+        if not self._currently_rendering:
+            self._generation += 1
+
+    def _mark_dirty(self, obj: PositionedObject):
+        """Record that an object's subtree needs re-rendering."""
+        if not self._currently_rendering:
+            self._generation += 1
+            if self._dirty_tracking_enabled:
+                self._dirty_objects[id(obj)] = obj
+
+    def _mark_detached(self, obj: PositionedObject):
+        """Record that an object's subtree is leaving its rendered location."""
+        if not self._currently_rendering:
+            self._generation += 1
+            if self._dirty_tracking_enabled:
+                self._detached_objects[id(obj)] = obj
+
+    def _render_hook_objects(self) -> List[PositionedObject]:
+        """Find all objects in the document whose classes override render hooks.
+
+        Every object comes after all of its own descendants.
+        """
+        objects = []
+        for page in self.pages._created_pages():
+            objects.extend(page._descendants_with_render_hooks())
+        return objects
+
+    def render(
+        self,
+        display_page_geometry: bool,
+        background_brush: Brush,
+        find_render_region: Optional[Callable[[], Rect]] = None,
+    ):
         """Render all items in the document.
 
         This should not be called directly.
@@ -76,14 +183,251 @@ class Document:
         Args:
             display_page_geometry: Whether to include a preview of page geometry.
             background_brush: The brush used to draw the scene background.
+            find_render_region: An optional function giving the region of the
+                document to render. This is called once layout is complete, just
+                before graphical objects are created. Pages outside the region
+                other than the first, which holds page geometry previews, are
+                skipped, as are flowable lines outside it.
+        """
+        if (
+            self._reuse_render_caches
+            and self._last_render_epoch_generation == self._generation
+        ):
+            epoch = _begin_render_epoch(self._last_render_epoch)
+        else:
+            epoch = _begin_render_epoch()
+        # Pages skipped in the last render have no interfaces left to drop, unless
+        # objects have since been moved into them
+        if self._last_render_epoch_generation == self._generation:
+            previously_culled_pages = self._culled_pages
+        else:
+            previously_culled_pages = {}
+        self._culled_pages = {}
+        self._rendered_object_index = None
+        self._currently_rendering = True
+        try:
+            hook_objects = self._render_hook_objects()
+            for obj in hook_objects:
+                obj.pre_render_hook()
+            self._render_region = find_render_region() if find_render_region else None
+            pages = self.pages
+            region = self._render_region
+            # Placeholder pages outside the region are left uncreated
+            pages_in_region = [
+                pages[i]
+                for i in range(len(pages))
+                if i == 0
+                or region is None
+                or region.intersects(pages._document_space_bounding_rect(i))
+            ]
+            if display_page_geometry:
+                for page in pages_in_region:
+                    page.create_geometry_preview(background_brush)
+            rendered_pages = set(pages_in_region)
+            for page in pages._created_pages():
+                if page in rendered_pages:
+                    page.render()
+                else:
+                    self._render_culled_page(page, page in previously_culled_pages)
+                    self._culled_pages[page] = None
+            for obj in hook_objects:
+                obj.post_render_hook()
+        finally:
+            self._currently_rendering = False
+            _end_render_epoch()
+        self._last_render_epoch = epoch
+        self._last_render_epoch_generation = self._generation
+        self._dirty_objects.clear()
+        self._detached_objects.clear()
+
+    def _render_culled_page(self, page: Page, previously_culled: bool):
+        """Render only the flowables in a page outside the render region.
+
+        Flowables are rendered since their lines may lie on other pages.
         """
-        self._run_on_all_descendants(lambda g: g.pre_render_hook())
-        if display_page_geometry:
-            for page in self.pages:
-                page.create_geometry_preview(background_brush)
-        for page in self.pages:
-            page.render()
-        self._run_on_all_descendants(lambda g: g.post_render_hook())
+        if not previously_culled:
+            # Drop interfaces left from the previous render
+            for obj in [page, *page.descendants]:
+                obj.interfaces.clear()
+                obj._interface_for_children = None
+        for flowable in page.descendants_with_attribute(
+            "_neoscore_flowable_type_marker"
+        ):
+            if flowable.flowable is None:
+                flowable.render()
+
+    def render_incremental(self, display_page_geometry: bool) -> bool:
+        """Re-render only the parts of the document changed since the last render.
+
+        Subtrees recorded as detached have their graphical interfaces torn down, and
+        subtrees recorded as dirty are rendered again, while everything else is left
+        untouched in the scene. Where a re-rendered interface differs from its
+        counterpart in the previous render only in properties which can be updated
+        in place (like position), the existing Qt object is updated and reused
+        rather than rebuilt. Changes to objects inside a :obj:`.Flowable` re-render
+        that entire flowable, since any change in it may affect its line layout.
+        Documents last rendered with a restricted render region (see
+        :obj:`.render`) always need a full render.
+
+        This should not be called directly.
+
+        Args:
+            display_page_geometry: Whether to include a preview of page geometry.
+
+        Returns:
+            Whether the incremental render succeeded. If ``False``, a full
+            render is required.
+        """
+        if not self._dirty_tracking_enabled or self._render_region is not None:
+            return False
+        pages = self.pages
+        if display_page_geometry and not all(
+            pages._is_created(i) and pages[i]._geometry_preview_created
+            for i in range(len(pages))
+        ):
+            return False
+        page_count = len(self.pages)
+        detached = list(self._detached_objects.values())
+        dirty = list(self._dirty_objects.values())
+        self._detached_objects.clear()
+        self._dirty_objects.clear()
+        for obj in detached:
+            Document._clear_rendered_subtree(obj)
+        roots = self._resolve_dirty_roots(dirty)
+        hook_objects = []
+        for root in roots:
+            self._collect_reusable_interfaces(root)
+            hook_objects.extend(root._descendants_with_render_hooks())
+            if root._has_render_hooks:
+                hook_objects.append(root)
+        _begin_render_epoch()
+        self._last_render_epoch = None
+        self._rendered_object_index = None
+        self._currently_rendering = True
+        try:
+            for obj in hook_objects:
+                obj.pre_render_hook()
+            if len(self.pages) != page_count:
+                # Layout created new pages, which need a full render.
+                success = False
+            else:
+                for root in roots:
+                    root.render()
+                success = True
+            for obj in hook_objects:
+                obj.post_render_hook()
+        finally:
+            self._currently_rendering = False
+            _end_render_epoch()
+            # Unrender everything before dropping references, since Qt child items
+            # are destroyed along with their parents.
+            for interface in self._reusable_interfaces.values():
+                interface.unrender()
+            self._reusable_interfaces.clear()
+        return success
+
+    def rendered_object_index(self) -> SpatialIndex[PositionedObject]:
+        """Get a spatial index of objects by where they were drawn in the last render.
+
+        Objects are indexed by the document-space bounding rects of their graphical
+        interfaces, so objects drawn across several flowable lines have several
+        rects. Objects drawing nothing, or which have not been rendered, are left
+        out. The index is built when first requested after a render, and is in the
+        order objects were rendered.
+
+        Usually this is accessed through :obj:`.neoscore.objects_at` and
+        :obj:`.neoscore.objects_in`.
+        """
+        if self._rendered_object_index is None:
+            entries = []
+            stack: List[PositionedObject] = list(self.pages._created_pages())[::-1]
+            while stack:
+                obj = stack.pop()
+                for interface in obj.interfaces:
+                    rect = interface.scene_bounding_rect()
+                    if rect is not None:
+                        entries.append((rect, obj))
+                stack.extend(reversed(obj.children))
+            self._rendered_object_index = SpatialIndex(entries)
+        return self._rendered_object_index
+
+    def _render_interface(
+        self,
+        owner: PositionedObject,
+        slot: Optional[int],
+        interface: PositionedObjectInterface,
+    ):
+        """Render an interface for an object, reusing the Qt object of the interface
+        in the same slot from the previous render where possible.
+
+        This should not be called directly. Use ``PositionedObject._render_interface``.
+        """
+        key = (id(owner), slot)
+        if interface.render_reusing(self._reusable_interfaces.get(key)):
+            del self._reusable_interfaces[key]
+
+    def _collect_reusable_interfaces(self, root: PositionedObject):
+        """Detach the interfaces of an object and its descendants for reuse.
+
+        The interfaces are left rendered until the re-render completes.
+        """
+        for obj in [root, *root.descendants]:
+            for i, interface in enumerate(obj.interfaces):
+                self._reusable_interfaces[(id(obj), i)] = interface
+            if obj.interface_for_children is not None:
+                self._reusable_interfaces[(id(obj), None)] = obj.interface_for_children
+            obj.interfaces.clear()
+            obj._interface_for_children = None
+
+    def _resolve_dirty_roots(
+        self, dirty: List[PositionedObject]
+    ) -> List[PositionedObject]:
+        """Find the minimal set of subtree roots covering every dirty object.
+
+        Objects inside flowables are promoted to their flowable and objects no longer
+        attached to the document are dropped.
+        """
+        roots: Dict[int, PositionedObject] = {}
+        for obj in dirty:
+            root = self._attached_render_root(obj)
+            if root is not None:
+                roots[id(root)] = root
+        return [
+            root
+            for root in roots.values()
+            if not any(id(ancestor) in roots for ancestor in root.ancestors)
+        ]
+
+    def _attached_render_root(
+        self, obj: PositionedObject
+    ) -> Optional[PositionedObject]:
+        root = obj
+        current = obj
+        while True:
+            parent = current.parent
+            if parent is self:
+                return root
+            if parent is None or not current._attached:
+                # Object has been removed from the tree
+                return None
+            if hasattr(parent, "_neoscore_flowable_type_marker"):
+                root = parent
+            current = parent
+
+    @staticmethod
+    def _clear_rendered_subtree(root: PositionedObject):
+        """Remove all graphical interfaces of an object and its descendants."""
+        objects = [root, *root.descendants]
+        # Unrender everything before dropping references, since Qt child items are
+        # destroyed along with their parents.
+        for obj in objects:
+            for interface in obj.interfaces:
+                interface.unrender()
+            if obj.interface_for_children is not None:
+                obj.interface_for_children.unrender()
+        for obj in objects:
+            obj.interfaces.clear()
+            obj._interface_for_children = None
 
     def page_origin(self, index: int) -> Point:
         """Find the origin point of a given page number.
@@ -1,16 +1,70 @@
 from __future__ import annotations
 
-from typing import Optional
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 from sortedcontainers import SortedKeyList
 
 from neoscore.core import neoscore
 from neoscore.core.layout_controllers import MarginController, NewLine
+from neoscore.core.line_breaking import GreedyLineBreaker, LineBreaker
 from neoscore.core.point import Point, PointDef
 from neoscore.core.positioned_object import PositionedObject
+from neoscore.core.rect import Rect
 from neoscore.core.units import ZERO, Mm, Unit
 
 
+@dataclass(frozen=True)
+class _LineLayoutInputs:
+
+    """The inputs which determined a flowable's line layout."""
+
+    settings: tuple
+    """Values whose change requires laying out every line again."""
+
+    length: float
+
+    break_opps: List[Tuple[float]]
+    """The x position of each break opportunity, in order."""
+
+    controllers: List[Tuple[float, float, str]]
+    """The x position, margin, and layer of each margin controller, in order."""
+
+    def first_change_x(self, previous: _LineLayoutInputs) -> Optional[float]:
+        """Find the flowable x position of the first change since a previous layout.
+
+        Changes to ``settings`` are not considered. Returns ``None`` if nothing else
+        changed.
+        """
+        change_xs = [
+            _LineLayoutInputs._first_difference_x(previous.break_opps, self.break_opps),
+            _LineLayoutInputs._first_difference_x(
+                previous.controllers, self.controllers
+            ),
+        ]
+        if previous.length != self.length:
+            change_xs.append(min(previous.length, self.length))
+        return min((x for x in change_xs if x is not None), default=None)
+
+    @staticmethod
+    def _first_difference_x(
+        previous: List[Tuple[float, ...]], current: List[Tuple[float, ...]]
+    ) -> Optional[float]:
+        """Find the x position of the first entry differing between two lists.
+
+        Entries are tuples starting with their x position.
+        """
+        for previous_entry, entry in zip(previous, current):
+            if previous_entry != entry:
+                return min(previous_entry[0], entry[0])
+        if len(previous) > len(current):
+            return previous[len(current)][0]
+        if len(current) > len(previous):
+            return current[len(previous)][0]
+        return None
+
+
 class Flowable(PositionedObject):
 
     """A flowable coordinate space container.
@@ -36,6 +90,7 @@ class Flowable(PositionedObject):
         height: Unit,
         y_padding: Unit = Mm(5),
         break_threshold: Unit = Mm(5),
+        line_breaker: Optional[LineBreaker] = None,
     ):
         """
         Args:
@@ -49,14 +104,25 @@ class Flowable(PositionedObject):
             y_padding: The vertical gap between flowable sections
             break_threshold: The maximum distance the flowable will shorten a line
                 to allow a break to occur on a ``BreakOpportunity``
+            line_breaker: The strategy used to choose line breaks. Defaults to a
+                :obj:`.GreedyLineBreaker`.
         """
         super().__init__(pos, parent)
         self._length = length
         self._height = height
         self._y_padding = y_padding
         self._break_threshold = break_threshold
+        self._line_breaker = line_breaker or GreedyLineBreaker()
         self._lines = []
+        # The flowable x position where each line ends, as base unit values. Lines
+        # are contiguous, so these also give where the following lines start.
+        self._line_end_xs: List[float] = []
+        # The inputs which determined the current lines
+        self._line_layout_inputs: Optional[_LineLayoutInputs] = None
         self._provided_controllers = Flowable._new_provided_controllers_list()
+        # Whether each line is in the region being rendered, or `None` if all are.
+        # This is only set while rendering.
+        self._lines_in_render_region: Optional[List[bool]] = None
 
     @property
     def length(self) -> Unit:
@@ -71,6 +137,7 @@ class Flowable(PositionedObject):
     @height.setter
     def height(self, value: Unit):
         self._height = value
+        self.mark_dirty()
 
     @property
     def y_padding(self) -> Unit:
@@ -80,6 +147,7 @@ class Flowable(PositionedObject):
     @y_padding.setter
     def y_padding(self, value: Unit):
         self._y_padding = value
+        self.mark_dirty()
 
     @property
     def break_threshold(self) -> Unit:
@@ -91,12 +159,28 @@ class Flowable(PositionedObject):
         If set to ``ZERO``, break opportunities will be entirely ignored during
         layout. On the other hand, if set to a value larger than the live page width,
         all break opportunities will be taken.
+
+        This only applies to the default :obj:`.GreedyLineBreaker`.
         """
         return self._break_threshold
 
     @break_threshold.setter
     def break_threshold(self, value: Unit):
         self._break_threshold = value
+        self.mark_dirty()
+
+    @property
+    def line_breaker(self) -> LineBreaker:
+        """The strategy used to choose where this flowable breaks into lines.
+
+        See :obj:`.GreedyLineBreaker` and :obj:`.OptimalLineBreaker`.
+        """
+        return self._line_breaker
+
+    @line_breaker.setter
+    def line_breaker(self, value: LineBreaker):
+        self._line_breaker = value
+        self.mark_dirty()
 
     @property
     def lines(self) -> List[NewLine]:
@@ -108,6 +192,9 @@ class Flowable(PositionedObject):
     @lines.setter
     def lines(self, value: List[NewLine]):
         self._lines = value
+        self._line_end_xs = [
+            (line.flowable_x + line.length).base_value for line in value
+        ]
 
     @property
     def provided_controllers(self) -> SortedKeyList[MarginController]:
@@ -154,60 +241,121 @@ class Flowable(PositionedObject):
 
         The generated controllers are stored in ``self.layout_controllers``
         in sorted order by ascending x position
+
+        The inputs determining the layout are remembered, so when this is called
+        again, lines before the first changed input which the :obj:`.line_breaker`
+        would choose again are kept as they are. Later lines matching ones from the
+        previous layout are reused too.
         """
         live_page_width = neoscore.document.paper.live_width
         live_page_height = neoscore.document.paper.live_height
+        first_page = self.first_ancestor_with_attr("_neoscore_page_type_marker")
+        flowable_page_pos = first_page.map_to(self)
+        margin_at = self._margin_finder()
+
+        def max_line_length(flowable_x: Unit) -> Unit:
+            line_x = margin_at(flowable_x)
+            if flowable_x == ZERO:
+                line_x += flowable_page_pos.x
+            return live_page_width - line_x
+
         break_opps = self._find_break_opportunities()
-        for c in self.lines:
-            c.remove()
-        self.lines = []
-        while True:
+        layout_inputs = _LineLayoutInputs(
+            (
+                live_page_width,
+                live_page_height,
+                first_page,
+                flowable_page_pos,
+                self.height,
+                self.y_padding,
+                self.break_threshold,
+                self.line_breaker,
+            ),
+            self.length.base_value,
+            [(opp.base_value,) for opp in break_opps],
+            [
+                (c.flowable_x.base_value, c.margin_left.base_value, c.layer_key)
+                for c in self.provided_controllers
+            ],
+        )
+        previous_inputs = self._line_layout_inputs
+        self._line_layout_inputs = layout_inputs
+        kept_line_count = 0
+        if (
+            previous_inputs is not None
+            and previous_inputs.settings == layout_inputs.settings
+        ):
+            changed_x = layout_inputs.first_change_x(previous_inputs)
+            if changed_x is None:
+                return
+            kept_line_count = self.line_breaker.reusable_line_count(
+                self,
+                [line.length for line in self.lines],
+                Unit(changed_x),
+                max_line_length,
+            )
+        if kept_line_count:
+            last = self.lines[kept_line_count - 1]
+            start_x = last.flowable_x + last.length
+        else:
+            start_x = ZERO
+        lengths = self.line_breaker.line_lengths(
+            self, break_opps, max_line_length, start_x
+        )
+        previous_lines = self.lines[kept_line_count:]
+        self.lines = self.lines[:kept_line_count]
+        # Place lines working with base values, only making units for the lines
+        epsilon = Unit._CMP_POS_EPSILON
+        height = self.height.base_value
+        line_spacing = height + self.y_padding.base_value
+        live_page_height_value = live_page_height.base_value
+        for i, length in enumerate(lengths):
             if not self.lines:
-                flowable_start_x = ZERO
-                page = self.first_ancestor_with_attr("_neoscore_page_type_marker")
-                flowable_page_pos = page.map_to(self)
-                new_line_x = flowable_page_pos.x + self._active_margin_at(
-                    flowable_start_x
-                )
-                new_line_y = flowable_page_pos.y
+                flowable_start_x = 0.0
+                page = first_page
+                new_line_x = (flowable_page_pos.x + margin_at(ZERO)).base_value
+                new_line_y = flowable_page_pos.y.base_value
             else:
                 last = self.lines[-1]
-                flowable_start_x = last.flowable_x + last.length
+                flowable_start_x = last.flowable_x.base_value + last.length.base_value
                 page = last.page
-                new_line_x = self._active_margin_at(flowable_start_x)
-                new_line_y = last.y + self.height + self.y_padding
-                new_line_bottom_y = new_line_y + self.height
+                new_line_x = margin_at(Unit(flowable_start_x)).base_value
+                new_line_y = last.y.base_value + line_spacing
                 if (
-                    new_line_y > live_page_height
-                    or new_line_bottom_y > live_page_height
+                    new_line_y - live_page_height_value > epsilon
+                    or new_line_y + height - live_page_height_value > epsilon
                 ):
                     page = neoscore.document.pages[page.index + 1]
-                    new_line_y = ZERO
-            # Now determine this line's length
-            max_length = live_page_width - new_line_x
-            max_line_end_flowable_x = flowable_start_x + max_length
-            nearest_break_opp = next(
-                (opp for opp in reversed(break_opps) if opp < max_line_end_flowable_x),
-                None,
-            )
+                    new_line_y = 0.0
+            previous_line = previous_lines[i] if i < len(previous_lines) else None
             if (
-                nearest_break_opp
-                and max_line_end_flowable_x - nearest_break_opp < self.break_threshold
+                previous_line is not None
+                and previous_line.page is page
+                and abs(previous_line.x.base_value - new_line_x) < epsilon
+                and abs(previous_line.y.base_value - new_line_y) < epsilon
+                and abs(previous_line.flowable_x.base_value - flowable_start_x)
+                < epsilon
+                and previous_line.length == length
+                and previous_line.height == self.height
             ):
-                length = nearest_break_opp - flowable_start_x
-            else:
-                length = max_length
+                previous_lines[i] = None
+                self.lines.append(previous_line)
+                continue
             self.lines.append(
                 NewLine(
-                    (new_line_x, new_line_y),
+                    (Unit(new_line_x), Unit(new_line_y)),
                     page,
-                    flowable_start_x,
+                    Unit(flowable_start_x),
                     length,
                     self.height,
                 )
             )
-            if flowable_start_x + length > self.length:
-                break
+        for line in previous_lines:
+            if line is not None:
+                line.remove()
+        self._line_end_xs = [
+            (line.flowable_x + line.length).base_value for line in self.lines
+        ]
 
     def _find_break_opportunities(self) -> List[Unit]:
         """Find the relative X positions of every break hint in this flowable.
@@ -217,15 +365,34 @@ class Flowable(PositionedObject):
         opps = self.descendants_with_attribute(
             "_neoscore_break_opportunity_type_marker"
         )
-        return sorted((self.map_x_to(opp) for opp in opps))
+        return sorted((self.map_x_to(opp) for opp in opps), key=lambda x: x.base_value)
 
-    def _active_margin_at(self, flowable_x: Unit) -> Unit:
-        active_margin_layers: Dict[str, Unit] = {}
+    def _margin_finder(self) -> Callable[[Unit], Unit]:
+        """Make a function finding the total left margin of a line at a flowable x.
+
+        Each margin layer takes its value from its last controller at or before the
+        given position.
+        """
+        controller_xs = []
+        # The total margin once each controller is applied
+        total_margins = []
+        active_margin_layers: Dict[str, float] = {}
         for controller in self.provided_controllers:
-            if controller.flowable_x > flowable_x:
-                break
-            active_margin_layers[controller.layer_key] = controller.margin_left
-        return sum(active_margin_layers.values(), ZERO)
+            active_margin_layers[
+                controller.layer_key
+            ] = controller.margin_left.base_value
+            controller_xs.append(controller.flowable_x.base_value)
+            total_margins.append(sum(active_margin_layers.values()))
+
+        def margin_at(flowable_x: Unit) -> Unit:
+            # Controllers within `Unit` comparison tolerance after the position
+            # are considered at it
+            i = bisect_right(
+                controller_xs, flowable_x.base_value + Unit._CMP_POS_EPSILON
+            )
+            return Unit(total_margins[i - 1]) if i else ZERO
+
+        return margin_at
 
     def map_to_canvas(self, local_point: Point) -> Point:
         """Convert a local point to its position in the canvas.
@@ -258,15 +425,44 @@ class Flowable(PositionedObject):
         """
         # Note that this assumes that all layout controllers are line
         # breaks, and will not work if/when other types are added
-        remaining_x = flowable_x
-        for i, controller in enumerate(self.lines):
-            remaining_x -= controller.length
-            if remaining_x <= ZERO:
-                return i
-        else:
-            return len(self.lines) - 1
+        # Positions within `Unit` comparison tolerance of a line's end are
+        # considered in that line.
+        return min(
+            bisect_right(
+                self._line_end_xs, flowable_x.base_value - Unit._CMP_POS_EPSILON
+            ),
+            len(self._lines) - 1,
+        )
+
+    def last_break_indices_at(self, flowable_xs: Sequence[Unit]) -> List[int]:
+        """Like ``last_break_index_at``, but for many positions at once.
+
+        This walks the lines once alongside the positions, so it is faster than
+        separate lookups when many positions are needed.
+
+        Args:
+            flowable_xs: x-axis locations in the virtual flowable space, sorted in
+                ascending order.
+        """
+        line_end_xs = self._line_end_xs
+        last_index = len(self._lines) - 1
+        indices = []
+        i = 0
+        for flowable_x in flowable_xs:
+            x = flowable_x.base_value - Unit._CMP_POS_EPSILON
+            while i < last_index and line_end_xs[i] <= x:
+                i += 1
+            indices.append(i)
+        return indices
 
     def render(self):
+        region = neoscore.document._render_region
+        if region is not None:
+            self._lines_in_render_region = []
+            for line in self.lines:
+                line_pos = line.canvas_pos()
+                line_rect = Rect(line_pos.x, line_pos.y, line.length, line.height)
+                self._lines_in_render_region.append(region.intersects(line_rect))
         super().render()
 
     def pre_render_hook(self):
@@ -277,6 +473,7 @@ class Flowable(PositionedObject):
         # Clear all auto-generated margin controllers
         super().post_render_hook()
         self._provided_controllers = Flowable._new_provided_controllers_list()
+        self._lines_in_render_region = None
 
     @staticmethod
     def _new_provided_controllers_list() -> SortedKeyList[MarginController]:
@@ -21,6 +21,8 @@ class HasMusicFont:
     ancestors. Subclasses will often want to override this.
     """
 
+    __slots__ = ()
+
     @property
     def music_font(self) -> MusicFont:
         """The music font used by this object."""
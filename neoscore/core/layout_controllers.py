@@ -90,6 +90,9 @@ class NewLine(LayoutController, PositionedObject):
     def height(self, value: Unit):
         self._height = value
 
+    def render(self):
+        """Lines are purely logical layout markers, so rendering is a no-op."""
+
 
 class MarginController(LayoutController):
     """A controller defining flowable line margins.
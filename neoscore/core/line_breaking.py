@@ -0,0 +1,256 @@
+"""Strategies for choosing where flowables break into lines"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+from neoscore.core.units import ZERO, Unit
+
+if TYPE_CHECKING:
+    from neoscore.core.flowable import Flowable
+
+
+class LineBreaker:
+
+    """A strategy for choosing where a :obj:`.Flowable` breaks into lines.
+
+    Line breakers only decide how long each line is. The flowable then lays the lines
+    out one after another, moving on to a new page whenever one fills up.
+
+    Custom strategies can be made by subclassing this and implementing
+    :obj:`.line_lengths`. Pass them to a flowable with :obj:`.Flowable.line_breaker`.
+    Strategies which can tell when earlier lines are unaffected by a change later in
+    the flowable can also implement :obj:`.reusable_line_count`, letting flowables
+    keep those lines when laying out again.
+    """
+
+    def line_lengths(
+        self,
+        flowable: Flowable,
+        break_opps: List[Unit],
+        max_line_length: Callable[[Unit], Unit],
+        start_x: Unit = ZERO,
+    ) -> List[Unit]:
+        """Find the length of each line in a flowable.
+
+        Lines are contiguous, starting at ``start_x``, and together they must cover
+        the rest of the flowable.
+
+        Subclasses must implement this.
+
+        Args:
+            flowable: The flowable being laid out.
+            break_opps: The flowable x positions of all break opportunities in the
+                flowable, in ascending order.
+            max_line_length: A function giving the longest line which fits in the
+                page's live area if started at a flowable x position. This accounts
+                for the flowable's margin controllers.
+            start_x: Where the first line starts. This is ``ZERO`` unless earlier
+                lines are being kept from a previous layout.
+        """
+        raise NotImplementedError
+
+    def reusable_line_count(
+        self,
+        flowable: Flowable,
+        line_lengths: List[Unit],
+        changed_x: Unit,
+        max_line_length: Callable[[Unit], Unit],
+    ) -> int:
+        """Find how many lines of a previous layout would be chosen again.
+
+        This is used when a flowable is laid out again after changes to its break
+        opportunities, margin controllers, or length, all at or after ``changed_x``.
+        Kept lines are passed on to :obj:`.line_lengths` through its ``start_x``.
+
+        By default no lines are kept.
+
+        Args:
+            flowable: The flowable being laid out.
+            line_lengths: The line lengths of the previous layout.
+            changed_x: The flowable x position of the first changed input.
+            max_line_length: Like in :obj:`.line_lengths`.
+        """
+        return 0
+
+
+class GreedyLineBreaker(LineBreaker):
+
+    """A line breaker which fills each line as much as it can.
+
+    Each line runs to the edge of the live page area, unless a break opportunity lies
+    within the flowable's :obj:`.Flowable.break_threshold` before that, in which case
+    the line ends at the last such opportunity.
+
+    This is the default line breaker.
+    """
+
+    def line_lengths(
+        self,
+        flowable: Flowable,
+        break_opps: List[Unit],
+        max_line_length: Callable[[Unit], Unit],
+        start_x: Unit = ZERO,
+    ) -> List[Unit]:
+        # Work with base values, only making units at the boundaries
+        break_opp_xs = [opp.base_value for opp in break_opps]
+        break_threshold = flowable.break_threshold.base_value
+        flowable_length = flowable.length.base_value
+        epsilon = Unit._CMP_POS_EPSILON
+        lengths = []
+        line_start_x = start_x.base_value
+        while True:
+            max_length = max_line_length(Unit(line_start_x)).base_value
+            max_line_end_x = line_start_x + max_length
+            # Find the last break opportunity before the max line end, using the
+            # same tolerance as `Unit` comparisons
+            break_opp_i = bisect_left(break_opp_xs, max_line_end_x - epsilon)
+            if (
+                break_opp_i
+                and max_line_end_x - break_opp_xs[break_opp_i - 1] - break_threshold
+                < -epsilon
+            ):
+                length = break_opp_xs[break_opp_i - 1] - line_start_x
+            else:
+                length = max_length
+            lengths.append(Unit(length))
+            if line_start_x + length - flowable_length > epsilon:
+                return lengths
+            line_start_x += length
+
+    def reusable_line_count(
+        self,
+        flowable: Flowable,
+        line_lengths: List[Unit],
+        changed_x: Unit,
+        max_line_length: Callable[[Unit], Unit],
+    ) -> int:
+        # Each line is chosen only from the inputs before its furthest possible end
+        count = 0
+        line_start_x = 0.0
+        changed_x_value = changed_x.base_value
+        for length in line_lengths:
+            max_length = max_line_length(Unit(line_start_x)).base_value
+            if line_start_x + max_length - changed_x_value > Unit._CMP_NEG_EPSILON:
+                break
+            count += 1
+            line_start_x += length.base_value
+        return count
+
+
+class OptimalLineBreaker(LineBreaker):
+
+    """A line breaker which chooses breaks minimizing uneven line lengths overall.
+
+    Like the Knuth-Plass algorithm for paragraphs of text, this considers every
+    combination of breaks at the flowable's break opportunities (typically barlines)
+    and picks the one with the least total demerits, instead of choosing one line at a
+    time. Each line's badness grows with the cube of the fraction of its available
+    length left unused, and a line's demerits are ``(line_penalty + badness) ** 2``.
+    The last line's unused space is not penalized. Since a line can only start where
+    an earlier one could end, and lines can't run past the page margin, only break
+    opportunities within a line's length of the current one need to be considered,
+    so layout takes time proportional to the number of break opportunities.
+
+    Where no break opportunity fits within a line, as with measures wider than the
+    page, lines are broken at the page margin like :obj:`.GreedyLineBreaker` does.
+
+    :obj:`.Flowable.break_threshold` is ignored by this breaker. Since a change
+    anywhere in a flowable can make different breaks optimal throughout it, flowables
+    using this breaker always lay out all lines again after changes.
+    """
+
+    def __init__(self, line_penalty: float = 10, forced_break_demerits: float = 1e10):
+        """
+        Args:
+            line_penalty: A penalty added to the badness of every line. Larger values
+                favor using fewer lines.
+            forced_break_demerits: The demerits of a line which had to be broken away
+                from a break opportunity.
+        """
+        self.line_penalty = line_penalty
+        self.forced_break_demerits = forced_break_demerits
+
+    def line_lengths(
+        self,
+        flowable: Flowable,
+        break_opps: List[Unit],
+        max_line_length: Callable[[Unit], Unit],
+        start_x: Unit = ZERO,
+    ) -> List[Unit]:
+        epsilon = Unit._CMP_POS_EPSILON
+        end_x = flowable.length.base_value
+        # Candidate line starts, with the end of the flowable as a final candidate
+        candidate_xs = [start_x.base_value]
+        for opp in break_opps:
+            x = opp.base_value
+            if candidate_xs[-1] + epsilon < x < end_x - epsilon:
+                candidate_xs.append(x)
+        candidate_xs.append(end_x)
+        # Nodes are breakpoints lines can start at, stored as parallel lists of their
+        # flowable x, max line length, total demerits of the best layout reaching
+        # them, and the node that layout's previous line started at.
+        node_xs: List[float] = []
+        node_max_lengths: List[float] = []
+        node_demerits: List[float] = []
+        node_prevs: List[Optional[int]] = []
+
+        def add_node(x: float, demerits: float, prev: Optional[int]) -> int:
+            node_xs.append(x)
+            node_max_lengths.append(max_line_length(Unit(x)).base_value)
+            node_demerits.append(demerits)
+            node_prevs.append(prev)
+            return len(node_xs) - 1
+
+        # Nodes which lines could still start at and reach the current candidate
+        active = [add_node(candidate_xs[0], 0.0, None)]
+        last_candidate_i = len(candidate_xs) - 1
+        for candidate_i in range(1, last_candidate_i + 1):
+            x = candidate_xs[candidate_i]
+            is_end = candidate_i == last_candidate_i
+            # Candidates only move right, so nodes too far away are done for good
+            active = [
+                n for n in active if x - node_xs[n] <= node_max_lengths[n] + epsilon
+            ]
+            if not active:
+                # Nothing reaches this candidate, so force breaks at the page margin
+                # from the last node until one can.
+                node = len(node_xs) - 1
+                while x - node_xs[node] > node_max_lengths[node] + epsilon:
+                    node = add_node(
+                        node_xs[node] + node_max_lengths[node],
+                        node_demerits[node] + self.forced_break_demerits,
+                        node,
+                    )
+                active = [node]
+            best_node = None
+            best_demerits = 0.0
+            for node in active:
+                if is_end:
+                    badness = 0.0
+                else:
+                    max_length = node_max_lengths[node]
+                    unused_fraction = (max_length - (x - node_xs[node])) / max_length
+                    badness = 100 * (max(unused_fraction, 0.0) ** 3)
+                demerits = node_demerits[node] + (self.line_penalty + badness) ** 2
+                if best_node is None or demerits < best_demerits:
+                    best_node = node
+                    best_demerits = demerits
+            end_node = add_node(x, best_demerits, best_node)
+            if not is_end:
+                active.append(end_node)
+        # Walk back from the end to find the chosen line starts
+        line_starts = []
+        node = node_prevs[end_node]
+        while node is not None:
+            line_starts.append(node)
+            node = node_prevs[node]
+        line_starts.reverse()
+        lengths = [
+            Unit(node_xs[next_node] - node_xs[node])
+            for node, next_node in zip(line_starts, line_starts[1:])
+        ]
+        # The last line fills its available space like other lines
+        lengths.append(Unit(node_max_lengths[line_starts[-1]]))
+        return lengths
@@ -19,6 +19,8 @@ class MusicPath(Path, HasMusicFont):
     appearance, but it can also be instantiated directly.
     """
 
+    __slots__ = ("_music_font",)
+
     def __init__(
         self,
         pos: PointDef,
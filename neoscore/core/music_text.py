@@ -50,6 +50,8 @@ class MusicText(Text, HasMusicFont):
     longer strings are supported too.
     """
 
+    __slots__ = ("_music_chars",)
+
     def __init__(
         self,
         pos: PointDef,
@@ -123,6 +125,7 @@ class MusicText(Text, HasMusicFont):
     def music_chars(self, value: List[MusicChar]):
         self._music_chars = value
         self._text = MusicText._music_chars_to_str(value)
+        self.mark_dirty()
 
     @property
     def text(self) -> str:
@@ -137,6 +140,7 @@ class MusicText(Text, HasMusicFont):
         self._music_chars = MusicText._resolve_music_chars(self.music_font, value)
         resolved_str = MusicText._music_chars_to_str(self._music_chars)
         self._text = resolved_str
+        self.mark_dirty()
 
     @property
     def music_font(self) -> MusicFont:
@@ -149,6 +153,7 @@ class MusicText(Text, HasMusicFont):
     @music_font.setter
     def music_font(self, value: MusicFont):
         self._font = value
+        self.mark_dirty()
 
     @property
     def unit(self) -> Type[Unit]:
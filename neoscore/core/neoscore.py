@@ -1,14 +1,27 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
 import os
 import pathlib
+import sys
+from collections import deque
 from dataclasses import dataclass
+from multiprocessing.pool import AsyncResult
 from time import time
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 from warnings import warn
 
-import img2pdf  # type: ignore
 from typing_extensions import TypeAlias
 
 from neoscore.core.brush import Brush, BrushDef
@@ -17,16 +30,19 @@ from neoscore.core.exceptions import InvalidImageFormatError
 from neoscore.core.key_event import KeyEvent
 from neoscore.core.mouse_event import MouseEvent
 from neoscore.core.paper import A4, Paper
+from neoscore.core.pdf_writer import PdfPageImage, PdfWriter
 from neoscore.core.pen import Pen
+from neoscore.core.pixel_buffer import PixelBuffer
 from neoscore.core.point import Point, PointDef
 from neoscore.core.propagating_thread import PropagatingThread
-from neoscore.core.rect import RectDef
-from neoscore.core.units import Unit
+from neoscore.core.rect import Rect, RectDef
+from neoscore.core.units import Mm, Unit
 from neoscore.interface.app_interface import AppInterface
 
 if TYPE_CHECKING:
     from neoscore.core.document import Document
     from neoscore.core.font import Font
+    from neoscore.core.positioned_object import PositionedObject
 
 
 """The global application state module."""
@@ -69,6 +85,24 @@ When refresh functions indicate no re-render is required, that indication takes
 precedence over this flag.
 """
 
+_last_render_state: Optional[Tuple[int, bool, Brush]] = None
+"""The document generation and render arguments of the last scene render.
+
+Exports skip rebuilding the scene when these are unchanged.
+"""
+
+_incremental_render_enabled: bool = False
+"""Whether renders after the first only rebuild changed parts of the scene.
+
+Set this using :obj:`.set_incremental_render`.
+"""
+
+_viewport_culling_margin: Optional[Unit] = None
+"""How far around the viewport interactive renders reach, or ``None`` to render all.
+
+Set this using :obj:`.set_viewport_culling`.
+"""
+
 _supported_image_extensions = {
     ".bmp",
     ".jpg",
@@ -168,6 +202,71 @@ def set_background_brush(brush: BrushDef):
     app_interface.background_brush = background_brush.interface
 
 
+def set_incremental_render(enabled: bool):
+    """Set whether re-renders only rebuild the parts of the scene which changed.
+
+    By default, every render (including every frame of a refresh function and every
+    image export) clears the whole scene and rebuilds it from scratch. In incremental
+    mode, neoscore instead tracks which objects were mutated, created, or removed
+    since the previous render, and only tears down and rebuilds their subtrees,
+    leaving everything else live in the scene. This can make animations of large
+    scores with few moving parts dramatically faster.
+
+    Some caveats apply:
+
+    * Any change to an object inside a :obj:`.Flowable` re-renders that whole
+      flowable, since changes there may affect its line layout.
+    * Changes neoscore can't observe, like mutating a :obj:`.Pen` shared by many
+      objects or moving an object a path element is anchored to, are not detected.
+      Use :obj:`.PositionedObject.mark_dirty` to flag such objects manually.
+    * Re-rendered objects may be drawn above overlapping objects which were not
+      re-rendered.
+    """
+    global _incremental_render_enabled
+    global document
+    _incremental_render_enabled = enabled
+    if not enabled:
+        document.dirty_tracking_enabled = False
+
+
+def set_viewport_culling(enabled: bool, margin: Unit = Mm(100)):
+    """Set whether interactive renders only build the scene near the viewport.
+
+    By default, renders by :obj:`.show` and refresh functions create graphical
+    objects for the whole document, so their cost grows with the length of the
+    score even though only a page or two can be seen at once. With viewport culling
+    enabled, these renders skip pages lying entirely outside the viewport (expanded
+    by ``margin`` on every side), along with any :obj:`.Flowable` lines outside it.
+    Whenever the viewport is scrolled, zoomed, or resized so that part of it leaves
+    the rendered region, the document is rendered again around the new viewport.
+
+    Some caveats apply:
+
+    * Layout still covers the whole document; only the creation of graphical
+      objects is skipped.
+    * The first page is always rendered, since it holds page geometry previews.
+      Objects on other pages drawn far outside their page's bounds may not appear
+      until their page is near the viewport.
+    * :obj:`.objects_at` and :obj:`.objects_in` only find objects which were
+      rendered.
+    * Culled renders are always full renders, so this takes precedence over
+      :obj:`.set_incremental_render`.
+    * Exports like :obj:`.render_image` are unaffected and always render the whole
+      document.
+
+    Args:
+        enabled: Whether to enable viewport culling.
+        margin: How far beyond each edge of the viewport to render. Larger margins
+            make re-renders while scrolling less frequent.
+    """
+    global _viewport_culling_margin
+    global app_interface
+    _viewport_culling_margin = margin if enabled else None
+    app_interface.set_viewport_change_handler(
+        _render_newly_visible_region if enabled else None
+    )
+
+
 def register_font(font_file_path: str | pathlib.Path) -> List[str]:
     """Register a font file with the application.
 
@@ -294,33 +393,126 @@ def show(
     global _display_page_geometry_in_refresh_func
     _display_page_geometry_in_refresh_func = display_page_geometry
 
-    _render_document(display_page_geometry, background_brush)
+    _render_document(display_page_geometry, background_brush, cull_to_viewport=True)
     if refresh_func:
         set_refresh_func(refresh_func)
     app_interface.auto_viewport_interaction_enabled = auto_viewport_interaction_enabled
     app_interface.show(min_window_size, max_window_size, fullscreen)
 
 
-def _render_document(display_page_geometry: bool, background_brush: Brush):
+def _note_document_change():
+    """Record a change affecting the rendered document, if there is one."""
+    current_document = globals().get("document")
+    if current_document is not None:
+        current_document._note_change()
+
+
+def _render_document(
+    display_page_geometry: bool,
+    background_brush: Brush,
+    reuse_unchanged: bool = False,
+    cull_to_viewport: bool = False,
+):
     """Render the document, clearing the scene before if needed.
 
     This should be used instead of using ``document.render`` directly.
+
+    Args:
+        display_page_geometry: Whether to include a preview of page geometry.
+        background_brush: The brush used to draw the scene background.
+        reuse_unchanged: Whether to keep the existing scene as-is if the document
+            has not changed (see :obj:`.Document.generation`) since the last render
+            with the same arguments.
+        cull_to_viewport: Whether to only render the region around the interactive
+            viewport if viewport culling is enabled (see
+            :obj:`.set_viewport_culling`).
     """
     global document
     global app_interface
     global _must_clear_scene_before_next_render
+    global _last_render_state
 
+    culling = cull_to_viewport and _viewport_culling_margin is not None
+    if (
+        reuse_unchanged
+        and _must_clear_scene_before_next_render
+        and _last_render_state is not None
+        and _last_render_state[0] == document.generation
+        and _last_render_state[1] == display_page_geometry
+        and _last_render_state[2] is background_brush
+    ):
+        return
+    _last_render_state = None
     if _must_clear_scene_before_next_render:
+        if (
+            not culling
+            and _incremental_render_enabled
+            and document.render_incremental(display_page_geometry)
+        ):
+            _last_render_state = (
+                document.generation,
+                display_page_geometry,
+                background_brush,
+            )
+            return
+        # Objects drop their stale interfaces as they are rendered again
         app_interface.clear_scene()
-        for page in document.pages:
-            for obj in page.descendants:
-                interfaces = getattr(obj, "interfaces", None)
-                if interfaces:
-                    interfaces.clear()
-                if hasattr(obj, "_interface_for_children"):
-                    obj._interface_for_children = None
-    document.render(display_page_geometry, background_brush)
+    if culling:
+        document.render(
+            display_page_geometry, background_brush, _find_viewport_render_region
+        )
+        # Culled scenes are incomplete, so exports can't reuse them
+    else:
+        app_interface.scene_rect = None
+        document.render(display_page_geometry, background_brush)
+        _last_render_state = (
+            document.generation,
+            display_page_geometry,
+            background_brush,
+        )
     _must_clear_scene_before_next_render = True
+    if _incremental_render_enabled and not document.dirty_tracking_enabled:
+        document.dirty_tracking_enabled = True
+
+
+def _find_viewport_render_region() -> Rect:
+    """Find the region to render in viewport culling mode.
+
+    This also makes the whole document scrollable, since the scene only covers
+    what has been rendered.
+    """
+    global document
+    global app_interface
+    document.pages.ensure(1)
+    pages_rect = document.pages._document_space_bounding_rect(0).merge(
+        document.pages._document_space_bounding_rect(-1)
+    )
+    scene_rect = app_interface.scene_rect
+    app_interface.scene_rect = (
+        pages_rect if scene_rect is None else scene_rect.merge(pages_rect)
+    )
+    viewport_rect = app_interface.viewport_rect
+    margin = _viewport_culling_margin
+    return Rect(
+        viewport_rect.x - margin,
+        viewport_rect.y - margin,
+        viewport_rect.width + (margin * 2),
+        viewport_rect.height + (margin * 2),
+    )
+
+
+def _render_newly_visible_region():
+    """Render the scene again if the viewport left the region last rendered."""
+    global document
+    global app_interface
+    global background_brush
+    region = document._render_region
+    if region is not None and not region.contains(app_interface.viewport_rect):
+        _render_document(
+            _display_page_geometry_in_refresh_func,
+            background_brush,
+            cull_to_viewport=True,
+        )
 
 
 def set_viewport_center_pos(document_pos: PointDef):
@@ -387,36 +579,99 @@ def get_viewport_rotation() -> float:
     return app_interface.viewport_rotation
 
 
-def render_pdf(pdf_path: str | pathlib.Path, dpi: int = 300):
+def render_pdf(
+    pdf_path: str | pathlib.Path,
+    dpi: int = 300,
+    workers: int = 1,
+    vector: bool = False,
+    max_in_flight_pages: Optional[int] = None,
+):
     """Render the score as a pdf.
 
+    By default pages are rasterized at ``dpi`` and embedded as images. Pages are
+    streamed to the file in document order as they finish, so at most
+    ``max_in_flight_pages`` page images are held in memory at once regardless of
+    the document length. With ``vector=True``, the scene is instead drawn directly
+    to the PDF as vector graphics, one PDF page per document page, so output size
+    and export time scale with the amount of content rather than the resolution.
+    Rich text is embedded as real text with font subsets, while other text is drawn
+    as glyph outlines.
+
+    Pages can be rasterized in parallel by passing ``workers > 1``. Worker processes
+    are forked from the current one after the scene is built, so they share the
+    already-rendered scene instead of reconstructing it. Workers only paint the
+    scene and encode pages on their own main thread, which is safe after forking;
+    see :obj:`.AppInterface.render_pdf_page`. Parallel rasterization is only
+    supported on Linux; elsewhere this falls back to rendering pages in the current
+    process with a warning.
+
     Args:
         pdf_path: The output pdf path
         dpi: Resolution to render at
+        workers: The number of worker processes to rasterize pages with.
+        vector: Whether to export vector graphics instead of rasterized pages.
+            ``dpi``, ``workers``, and ``max_in_flight_pages`` are ignored when this
+            is set.
+        max_in_flight_pages: The maximum number of rasterized pages waiting to be
+            written at once. Defaults to ``max(workers, 2)``.
     """
     global app_interface
     global background_brush
-    _render_document(False, background_brush)
-    # Render all pages to temp files
-    page_imgs = []
-    render_threads = []
-    for page in document.pages:
-        img_buffer = bytearray()
-        page_imgs.append(img_buffer)
-        render_threads.append(
-            render_image(
-                page.document_space_bounding_rect,
-                img_buffer,
-                dpi,
-                preserve_alpha=False,
-                wait=False,
-            )
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if max_in_flight_pages is None:
+        max_in_flight_pages = max(workers, 2)
+    elif max_in_flight_pages < 1:
+        raise ValueError("max_in_flight_pages must be at least 1")
+    if vector:
+        _render_document(False, background_brush, reuse_unchanged=True)
+        app_interface.render_vector_pdf(
+            [page.document_space_bounding_rect for page in document.pages], pdf_path
         )
-    for thread in render_threads:
-        thread.join()
-    # Assemble into PDF and write it to file path
-    with open(pdf_path, "wb") as f:
-        f.write(img2pdf.convert([bytes(buf) for buf in page_imgs]))
+        return
+    if workers > 1 and not _forked_workers_supported():
+        warn("Parallel PDF rendering is not supported on this platform")
+        workers = 1
+    _render_document(False, background_brush, reuse_unchanged=True)
+    rects = [page.document_space_bounding_rect for page in document.pages]
+    workers = min(workers, len(rects))
+    if workers <= 1:
+        app_interface.render_pdf(
+            rects, pdf_path, dpi, background_brush.color, max_in_flight_pages
+        )
+        return
+    with multiprocessing.get_context("fork").Pool(workers) as pool, open(
+        pdf_path, "wb"
+    ) as f:
+        writer = PdfWriter(f)
+        pending: Deque[Tuple[AsyncResult, Rect]] = deque()
+        for rect in rects:
+            if len(pending) >= max_in_flight_pages:
+                _write_pdf_page(writer, *pending.popleft())
+            result = pool.apply_async(_rasterize_pdf_page, (rect, dpi))
+            pending.append((result, rect))
+        while pending:
+            _write_pdf_page(writer, *pending.popleft())
+        writer.close()
+
+
+def _forked_workers_supported() -> bool:
+    # Forking a process with a live Qt application is only reliable on Linux
+    return sys.platform.startswith("linux") and (
+        "fork" in multiprocessing.get_all_start_methods()
+    )
+
+
+def _rasterize_pdf_page(rect: Rect, dpi: int) -> PdfPageImage:
+    """Rasterize part of the already-rendered scene as a PDF page image.
+
+    This runs in forked worker processes of :obj:`.render_pdf`.
+    """
+    return app_interface.render_pdf_page(rect, dpi, background_brush.color)
+
+
+def _write_pdf_page(writer: PdfWriter, result: AsyncResult, rect: Rect):
+    writer.add_page(result.get(), rect.width.base_value, rect.height.base_value)
 
 
 def render_image(
@@ -427,6 +682,8 @@ def render_image(
     autocrop: bool = False,
     preserve_alpha: bool = True,
     wait: bool = True,
+    crop_to_items: bool = False,
+    buffer_format: str = "png",
 ) -> PropagatingThread:
     """Render a section of the document to an image.
 
@@ -454,9 +711,9 @@ def render_image(
         rect: The part of the document to render, in document coordinates.
             If ``None``, the entire scene will be rendered.
         dest: An output file path or a bytearray to save to. If a bytearray
-            is given, the output format will be PNG.
-        dpi: The pixels per inch of the rendered image. quality: The quality of the
-        output image for compressed
+            is given, the output format is given by ``buffer_format``.
+        dpi: The pixels per inch of the rendered image.
+        quality: The quality of the output image for compressed
             image formats. Must be either ``-1`` (default compression) or between ``0``
             (most compressed) and ``100`` (least compressed).
         autocrop: Whether to crop the output image to tightly
@@ -464,10 +721,73 @@ def render_image(
         preserve_alpha: Whether to preserve the alpha channel. This should be set ``false``
             for export formats that don't support alpha.
         wait: Whether to block until the image is fully exported.
+        crop_to_items: Whether to crop the rendered region to the bounding rects of
+            the objects in it. This is much faster than ``autocrop`` since no pixels
+            are examined, but may leave a small margin around the contents.
+        buffer_format: The image format to use when ``dest`` is a bytearray, given
+            as one of the supported file extensions without the leading dot.
 
     Raises:
         InvalidImageFormatError: If the given ``image_path`` does not have a
-            supported image format file extension.
+            supported image format file extension, or ``buffer_format`` is not a
+            supported format.
+        ImageExportError: If low level Qt image export fails for
+            unknown reasons.
+    """
+
+    (thread,) = render_images(
+        [(rect, dest)],
+        dpi,
+        quality,
+        autocrop,
+        preserve_alpha,
+        wait,
+        crop_to_items,
+        buffer_format,
+    )
+    return thread
+
+
+def render_images(
+    renders: Iterable[Tuple[Optional[RectDef], str | pathlib.Path | bytearray]],
+    dpi: int = 300,
+    quality: int = -1,
+    autocrop: bool = False,
+    preserve_alpha: bool = True,
+    wait: bool = True,
+    crop_to_items: bool = False,
+    buffer_format: str = "png",
+) -> List[PropagatingThread]:
+    """Render several sections of the document to images.
+
+    This works like calling :obj:`.render_image` for each ``(rect, dest)`` pair, but
+    the document is only rendered once, so it is much faster for exporting many
+    crops of the same document. Images are painted one after another on the main
+    thread, then autocropped and saved on spawned threads.
+
+    Args:
+        renders: ``(rect, dest)`` pairs as taken by :obj:`.render_image`.
+        dpi: The pixels per inch of the rendered images.
+        quality: The quality of the output images for compressed image formats. Must
+            be either ``-1`` (default compression) or between ``0`` (most
+            compressed) and ``100`` (least compressed).
+        autocrop: Whether to crop the output images to tightly fit the contents of
+            their frames.
+        preserve_alpha: Whether to preserve the alpha channel. This should be set
+            ``false`` for export formats that don't support alpha.
+        wait: Whether to block until all images are fully exported.
+        crop_to_items: Whether to crop each rendered region to the bounding rects of
+            the objects in it, as in :obj:`.render_image`.
+        buffer_format: The image format to use for bytearray destinations, as in
+            :obj:`.render_image`.
+
+    Returns:
+        The threads saving each image, in the order of ``renders``.
+
+    Raises:
+        InvalidImageFormatError: If any given destination path does not have a
+            supported image format file extension. This is checked before anything
+            is rendered.
         ImageExportError: If low level Qt image export fails for
             unknown reasons.
     """
@@ -479,28 +799,90 @@ def render_image(
         warn("render_image quality {} invalid; using default.".format(quality))
         quality = -1
 
-    if (
-        not isinstance(dest, bytearray)
-        and not os.path.splitext(dest)[1] in _supported_image_extensions
-    ):
+    if "." + buffer_format.lower() not in _supported_image_extensions:
         raise InvalidImageFormatError(
-            "image_path {} is not in a supported format.".format(dest)
+            "buffer_format {} is not a supported format.".format(buffer_format)
         )
+    renders = list(renders)
+    for _, dest in renders:
+        if (
+            not isinstance(dest, bytearray)
+            and not os.path.splitext(dest)[1] in _supported_image_extensions
+        ):
+            raise InvalidImageFormatError(
+                "image_path {} is not in a supported format.".format(dest)
+            )
 
-    _render_document(False, background_brush)
+    _render_document(False, background_brush, reuse_unchanged=True)
+
+    threads = [
+        app_interface.render_image(
+            rect,
+            dest,
+            dpi,
+            quality,
+            background_brush.color,
+            autocrop,
+            preserve_alpha,
+            crop_to_items,
+            buffer_format,
+        )
+        for rect, dest in renders
+    ]
+    if wait:
+        for thread in threads:
+            thread.join()
+    return threads
 
-    thread = app_interface.render_image(
-        rect,
-        dest,
-        dpi,
-        quality,
-        background_brush.color,
-        autocrop,
-        preserve_alpha,
+
+def render_pixels(
+    rect: Optional[RectDef],
+    dpi: int = 300,
+    autocrop: bool = False,
+    preserve_alpha: bool = True,
+    grayscale: bool = False,
+) -> PixelBuffer:
+    """Render a section of the document to raw pixels without encoding them.
+
+    The returned :obj:`.PixelBuffer` shares memory with the rendered image, and
+    supports the NumPy array interface, so ``numpy.asarray(pixels)`` gives a
+    ``(height, width, channels)`` array of the rendered pixels without any copies.
+
+    Args:
+        rect: The part of the document to render, in document coordinates.
+            If ``None``, the entire scene will be rendered.
+        dpi: The pixels per inch of the rendered image.
+        autocrop: Whether to crop the image to tightly fit the contents of the
+            frame.
+        preserve_alpha: Whether to preserve the alpha channel. If false, every
+            pixel is fully opaque.
+        grayscale: Whether to render a single grayscale channel instead of RGBA.
+    """
+    global app_interface
+    global background_brush
+    _render_document(False, background_brush, reuse_unchanged=True)
+    return app_interface.render_pixels(
+        rect, dpi, background_brush.color, autocrop, preserve_alpha, grayscale
     )
-    if wait:
-        thread.join()
-    return thread
+
+
+def render_svg(rect: Optional[RectDef], dest: str | pathlib.Path | bytearray):
+    """Render a section of the document to an SVG image.
+
+    Unlike :obj:`.render_image`, this writes vector graphics, so output size scales
+    with the amount of content rather than the resolution. Paths and text glyphs are
+    written as SVG paths, with each distinct shape defined once and reused, so
+    repeated glyphs like noteheads add only a short reference each.
+
+    Args:
+        rect: The part of the document to render, in document coordinates.
+            If ``None``, the entire scene will be rendered.
+        dest: An output file path or a bytearray to save to.
+    """
+    global app_interface
+    global background_brush
+    _render_document(False, background_brush, reuse_unchanged=True)
+    app_interface.render_svg(rect, dest, background_brush.color)
 
 
 def render_to_notebook(
@@ -538,7 +920,9 @@ def _repl_refresh_func(_: float) -> float:
     """
     global background_brush
     global _display_page_geometry_in_refresh_func
-    _render_document(_display_page_geometry_in_refresh_func, background_brush)
+    _render_document(
+        _display_page_geometry_in_refresh_func, background_brush, cull_to_viewport=True
+    )
     return 0.2
 
 
@@ -565,7 +949,11 @@ def set_refresh_func(refresh_func: RefreshFunc, target_fps: int = 60):
             # Construct default result if none was provided
             result = RefreshFuncResult()
         if result.scene_render_needed:
-            _render_document(_display_page_geometry_in_refresh_func, background_brush)
+            _render_document(
+                _display_page_geometry_in_refresh_func,
+                background_brush,
+                cull_to_viewport=True,
+            )
         elapsed_time = time() - frame_time
         return max(frame_wait - elapsed_time, 0)
 
@@ -587,6 +975,42 @@ def set_mouse_event_handler(handler: Callable[[MouseEvent], None]):
     app_interface.set_mouse_event_handler(handler)
 
 
+def objects_at(document_pos: PointDef) -> List[PositionedObject]:
+    """Find the objects drawn at a position in the document.
+
+    This looks objects up by the bounding rects they were drawn with in the most
+    recent render, using a spatial index rather than checking every object, so it
+    is well suited to hit testing in a mouse event handler (see
+    :obj:`.set_mouse_event_handler`). Changes made since the last render are not
+    reflected, and nothing is found before the first render.
+
+    Args:
+        document_pos: The position to look up, in document coordinates.
+
+    Returns:
+        The objects, ordered from last to first rendered, so objects drawn on top
+        of others usually come first.
+    """
+    global document
+    return document.rendered_object_index().items_at(Point.from_def(document_pos))[::-1]
+
+
+def objects_in(rect: RectDef) -> List[PositionedObject]:
+    """Find the objects drawn overlapping a region of the document.
+
+    Like :obj:`.objects_at`, this uses the bounding rects objects were drawn with in
+    the most recent render.
+
+    Args:
+        rect: The region to look up, in document coordinates.
+
+    Returns:
+        The objects, ordered from last to first rendered.
+    """
+    global document
+    return document.rendered_object_index().items_in(Rect.from_def(rect))[::-1]
+
+
 def set_key_event_handler(handler: Callable[[KeyEvent], None]):
     """Set the global key event handler function.
 
@@ -619,7 +1043,13 @@ def shutdown():
     global app_interface
     global default_font
     global document
+    global _incremental_render_enabled
+    global _viewport_culling_margin
+    global _last_render_state
     app_interface.destroy()
     app_interface = None
     document = None
     default_font = None
+    _incremental_render_enabled = False
+    _viewport_culling_margin = None
+    _last_render_state = None
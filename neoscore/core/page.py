@@ -78,17 +78,7 @@ class Page(PositionedObject):
     @cached_property
     def bounding_rect(self) -> Rect:
         """The page bounding rect, positioned relative to the ``pos``."""
-        if self.page_side == DirectionX.RIGHT:
-            # Page is on right side, apply gutter on left side
-            rect_x = -(self.paper.gutter + self.paper.margin_left)
-        else:
-            rect_x = -self.paper.margin_left
-        return Rect(
-            rect_x,
-            -self.paper.margin_top,
-            self.paper.width,
-            self.paper.height,
-        )
+        return Page._find_bounding_rect(self.paper, self.page_side)
 
     @cached_property
     def document_space_bounding_rect(self) -> Rect:
@@ -157,6 +147,25 @@ class Page(PositionedObject):
         """
         return self.paper.live_width / 2
 
+    @staticmethod
+    def _find_bounding_rect(paper: Paper, page_side: DirectionX) -> Rect:
+        """Find the bounding rect of a page relative to its ``pos``.
+
+        This is separate from :obj:`.bounding_rect` so the geometry of pages which
+        haven't been created yet can be found.
+        """
+        if page_side == DirectionX.RIGHT:
+            # Page is on right side, apply gutter on left side
+            rect_x = -(paper.gutter + paper.margin_left)
+        else:
+            rect_x = -paper.margin_left
+        return Rect(
+            rect_x,
+            -paper.margin_top,
+            paper.width,
+            paper.height,
+        )
+
     def create_geometry_preview(self, background_brush: Brush):
         """Create and render child objects which show the page geometry.
 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, Optional
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Union
 
 from typing_extensions import TypeAlias
 
 from neoscore.core.directions import DirectionX
 from neoscore.core.page import Page
+from neoscore.core.paper import Paper
+from neoscore.core.rect import Rect
 
 if TYPE_CHECKING:
     from neoscore.core.document import Document
@@ -21,15 +23,33 @@ See :obj:`.simple_header_footer` for a ready-made simple overlay function.
 """
 
 
+class _PagePlaceholder:
+
+    """A stand-in for a page which has been requested but not yet created.
+
+    This keeps the settings in effect when the page was requested, so creating the
+    page later gives the same result as creating it right away.
+    """
+
+    __slots__ = ("paper", "overlay_func")
+
+    def __init__(self, paper: Paper, overlay_func: Optional[PageOverlayFunc]):
+        self.paper = paper
+        self.overlay_func = overlay_func
+
+
 class PageSupplier:
     """A supplier and generator-on-demand of document :obj:`.Page` objects.
 
     This acts like a list of ``Page`` objects which generates them as needed.
     Externally, it can be used mostly as a list. If an index is requested for which no
-    page yet exists, that page will be generated, as well as any missing pages between
-    the previous last page and the one requested. Consequently, keep in mind that
-    innocent looking operations such as ``page_suppler[100000]`` are actually expensive
-    operations, as they implicitly generate thousands of Page objects.
+    page yet exists, that page will be generated, and any missing pages between the
+    previous last page and the one requested are added as lightweight placeholders.
+    Placeholders are turned into real pages, running the :obj:`.overlay_func`, only
+    when they are accessed by index or iteration, which full document renders do.
+    This makes operations like ``page_supplier[100000]`` cheap, though rendering such
+    a document still creates every page. :obj:`.ensure` adds pages in bulk the same
+    way.
 
     The contents of the ``PageSupplier`` should be treated as immutable. Attempts to
     modify the pages it contains will likely result in unexpected behavior.
@@ -48,31 +68,36 @@ class PageSupplier:
                 This can be used to create headers and footers.
         """
         self._document = document
-        self._page_list: List[Page] = []
+        self._page_list: List[Union[Page, _PagePlaceholder]] = []
         self.overlay_func = overlay_func
 
     def __getitem__(self, index):
         if index >= len(self._page_list):
-            for new_index in range(len(self._page_list), index + 1):
-                page_side = DirectionX.LEFT if new_index % 2 else DirectionX.RIGHT
-                new_page = Page(
-                    self.document.page_origin(new_index),
-                    self.document,
-                    new_index,
-                    page_side,
-                    self.document.paper,
-                )
-                self._page_list.append(new_page)
-                if self.overlay_func:
-                    self.overlay_func(new_page)
-        return self._page_list[index]
-
-    def __iter__(self):
-        return self._page_list.__iter__()
+            self.ensure(index + 1)
+        page = self._page_list[index]
+        if isinstance(page, _PagePlaceholder):
+            page = self._create_page(index % len(self._page_list), page)
+        return page
+
+    def __iter__(self) -> Iterator[Page]:
+        for index in range(len(self._page_list)):
+            yield self[index]
 
     def __len__(self):
         return len(self._page_list)
 
+    def ensure(self, count: int):
+        """Make sure at least ``count`` pages exist.
+
+        Missing pages are added as placeholders in a single step, and are only fully
+        created once accessed. Pages added this way use the :obj:`.overlay_func` set
+        when this is called.
+        """
+        missing = count - len(self._page_list)
+        if missing > 0:
+            placeholder = _PagePlaceholder(self.document.paper, self.overlay_func)
+            self._page_list.extend([placeholder] * missing)
+
     @property
     def document(self) -> Document:
         return self._document
@@ -82,10 +107,62 @@ class PageSupplier:
         """A function to call on every page generation.
 
         This function is called with every generated page at the time of generation. If
-        the value is changed it will only affect pages generated after the change.
+        the value is changed it will only affect pages requested after the change.
         """
         return self._overlay_func
 
     @overlay_func.setter
     def overlay_func(self, value: Optional[PageOverlayFunc]):
         self._overlay_func = value
+
+    def _is_created(self, index: int) -> bool:
+        """Whether the page at an existing index has been fully created."""
+        return not isinstance(self._page_list[index], _PagePlaceholder)
+
+    def _created_pages(self) -> Iterator[Page]:
+        """Iterate through pages which have been fully created, skipping placeholders.
+
+        Placeholder pages have no children, so this is enough for anything looking
+        for objects in the document.
+        """
+        for page in self._page_list:
+            if not isinstance(page, _PagePlaceholder):
+                yield page
+
+    def _document_space_bounding_rect(self, index: int) -> Rect:
+        """Find the document-space bounding rect of an existing page.
+
+        Unlike accessing the page's :obj:`.Page.document_space_bounding_rect`, this
+        doesn't create placeholder pages.
+        """
+        page = self._page_list[index]
+        if not isinstance(page, _PagePlaceholder):
+            return page.document_space_bounding_rect
+        index %= len(self._page_list)
+        local_rect = Page._find_bounding_rect(
+            page.paper, PageSupplier._page_side(index)
+        )
+        origin = self.document.page_origin(index)
+        return Rect(
+            local_rect.x + origin.x,
+            local_rect.y + origin.y,
+            local_rect.width,
+            local_rect.height,
+        )
+
+    def _create_page(self, index: int, placeholder: _PagePlaceholder) -> Page:
+        page = Page(
+            self.document.page_origin(index),
+            self.document,
+            index,
+            PageSupplier._page_side(index),
+            placeholder.paper,
+        )
+        self._page_list[index] = page
+        if placeholder.overlay_func:
+            placeholder.overlay_func(page)
+        return page
+
+    @staticmethod
+    def _page_side(index: int) -> DirectionX:
+        return DirectionX.LEFT if index % 2 else DirectionX.RIGHT
@@ -15,6 +15,8 @@ class PaintedObject(PositionedObject):
     behavior.
     """
 
+    __slots__ = ("_pen", "_brush")
+
     def __init__(
         self,
         pos: PointDef,
@@ -32,7 +34,6 @@ class PaintedObject(PositionedObject):
         super().__init__(pos, parent)
         self.pen = pen
         self.brush = brush
-        self._children: List[PositionedObject] = []
 
     @property
     def pen(self) -> Pen:
@@ -45,6 +46,7 @@ class PaintedObject(PositionedObject):
             self._pen = Pen.from_def(value)
         else:
             self._pen = Pen()
+        self.mark_dirty()
 
     @property
     def brush(self) -> Brush:
@@ -62,3 +64,4 @@ class PaintedObject(PositionedObject):
             self._brush = Brush.from_def(value)
         else:
             self._brush = Brush()
+        self.mark_dirty()
@@ -38,6 +38,8 @@ class Path(PaintedObject):
     not be in one either.
     """
 
+    __slots__ = ("elements", "_background_brush", "_current_subpath_start")
+
     def __init__(
         self,
         pos: PointDef,
@@ -387,18 +389,19 @@ class Path(PaintedObject):
 
     @render_cached_property
     def _cacheable_breakable_length(self) -> Unit:
-        # Find the positions of every path element relative to the path
-        min_x = Unit(float("inf"))
-        max_x = Unit(-float("inf"))
+        # Find the positions of every path element relative to the path, working
+        # with base values until the result
+        min_x = float("inf")
+        max_x = -float("inf")
         for element in self.elements:
             # Determine element X relative to self
-            relative_x = self.map_x_to(element)
+            relative_x = self.map_x_to(element).base_value
             # Now update min/max accordingly
             if relative_x > max_x:
                 max_x = relative_x
             if relative_x < min_x:
                 min_x = relative_x
-        return max_x - min_x
+        return Unit(max_x - min_x)
 
     @property
     def breakable_length(self) -> Unit:
@@ -425,6 +428,7 @@ class Path(PaintedObject):
             self._background_brush = Brush.from_def(value)
         else:
             self._background_brush = None
+        self.mark_dirty()
 
     def line_to(self, x: Unit, y: Unit, parent: Optional[PositionedObject] = None):
         """Draw a path from the current position to a new point.
@@ -442,6 +446,7 @@ class Path(PaintedObject):
         if not len(self.elements):
             self.move_to(ZERO, ZERO)
         self.elements.append(LineTo(Point(x, y), parent or self))
+        self.mark_dirty()
 
     def move_to(self, x: Unit, y: Unit, parent: Optional[PositionedObject] = None):
         """Close the current sub-path and start a new one.
@@ -454,6 +459,7 @@ class Path(PaintedObject):
         """
         self._current_subpath_start = (Point(x, y), parent or self)
         self.elements.append(MoveTo(Point(x, y), parent or self))
+        self.mark_dirty()
 
     def close_subpath(self):
         """Close the current sub-path with a line.
@@ -512,6 +518,7 @@ class Path(PaintedObject):
         if not len(self.elements):
             self.move_to(ZERO, ZERO)
         self.elements.append(CurveTo(Point(end_x, end_y), end_parent or self, c1, c2))
+        self.mark_dirty()
 
     def _relative_element_pos(self, element: PositionedObject) -> Point:
         return self.map_to(element)
@@ -568,8 +575,7 @@ class Path(PaintedObject):
             clip_start_x,
             clip_width,
         )
-        slice_interface.render()
-        self.interfaces.append(slice_interface)
+        self._render_interface(slice_interface)
 
     def render_complete(
         self,
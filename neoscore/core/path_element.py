@@ -16,6 +16,13 @@ class PathElement(PositionedObject):
     def __repr__(self) -> str:
         return f"{type(self).__name__}(pos={self.pos}, parent={self.parent})"
 
+    def mark_dirty(self):
+        # Elements are drawn by their path, which is usually their parent.
+        super().mark_dirty()
+        parent = getattr(self, "_parent", None)
+        if parent is not None:
+            parent.mark_dirty()
+
 
 class MoveTo(PathElement):
     """An element representing the start of a new subpath"""
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import BinaryIO, List, NamedTuple
+
+_PAGES_OBJ_NUM = 1
+_CATALOG_OBJ_NUM = 2
+
+
+class PdfPageImage(NamedTuple):
+    """A rasterized page ready to be written by a :obj:`.PdfWriter`."""
+
+    pixel_width: int
+    """"""
+    pixel_height: int
+    """"""
+    data: bytes
+    """Zlib-compressed 8-bit RGB samples, row by row with no row padding."""
+
+
+class PdfWriter:
+
+    """A minimal PDF writer which streams raster pages to a file as they are added.
+
+    Each page is written out as soon as it is added, so memory use does not grow
+    with the number of pages. Only the small cross-reference table is kept until
+    :obj:`.close` is called.
+
+        >>> import io, zlib
+        >>> stream = io.BytesIO()
+        >>> writer = PdfWriter(stream)
+        >>> writer.add_page(PdfPageImage(1, 1, zlib.compress(bytes(3))), 72, 72)
+        >>> writer.close()
+        >>> stream.getvalue().startswith(b"%PDF-1.4")
+        True
+    """
+
+    def __init__(self, stream: BinaryIO):
+        """
+        Args:
+            stream: A binary stream to write to. This is not closed by the writer.
+        """
+        self._stream = stream
+        self._offset = 0
+        # Byte offsets of written objects, indexed by object number - 1
+        self._obj_offsets: List[int] = [0, 0]
+        self._page_obj_nums: List[int] = []
+        self._closed = False
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def add_page(self, image: PdfPageImage, width: float, height: float):
+        """Write a page showing an image stretched over the whole page.
+
+        Args:
+            image: The page image.
+            width: The page width in points.
+            height: The page height in points.
+        """
+        if self._closed:
+            raise ValueError("Cannot add pages to a closed PdfWriter")
+        image_num = self._write_obj(
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d"
+            b" /ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode"
+            b" /Length %d >>\nstream\n"
+            % (image.pixel_width, image.pixel_height, len(image.data)),
+            image.data,
+            b"\nendstream",
+        )
+        content = b"q %s 0 0 %s 0 0 cm /Im0 Do Q" % (
+            _format_number(width),
+            _format_number(height),
+        )
+        content_num = self._write_obj(
+            b"<< /Length %d >>\nstream\n" % len(content), content, b"\nendstream"
+        )
+        page_num = self._write_obj(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %s %s]"
+            b" /Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+            % (
+                _PAGES_OBJ_NUM,
+                _format_number(width),
+                _format_number(height),
+                image_num,
+                content_num,
+            )
+        )
+        self._page_obj_nums.append(page_num)
+
+    def close(self):
+        """Write the document trailer, completing the PDF.
+
+        This must be called exactly once after all pages have been added.
+        """
+        if self._closed:
+            raise ValueError("PdfWriter is already closed")
+        self._closed = True
+        kids = b" ".join(b"%d 0 R" % num for num in self._page_obj_nums)
+        self._write_obj(
+            b"<< /Type /Pages /Kids [%s] /Count %d >>"
+            % (kids, len(self._page_obj_nums)),
+            obj_num=_PAGES_OBJ_NUM,
+        )
+        self._write_obj(
+            b"<< /Type /Catalog /Pages %d 0 R >>" % _PAGES_OBJ_NUM,
+            obj_num=_CATALOG_OBJ_NUM,
+        )
+        xref_offset = self._offset
+        xref = [b"xref\n0 %d\n0000000000 65535 f \n" % (len(self._obj_offsets) + 1)]
+        xref.extend(b"%010d 00000 n \n" % offset for offset in self._obj_offsets)
+        self._write(b"".join(xref))
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(self._obj_offsets) + 1, _CATALOG_OBJ_NUM, xref_offset)
+        )
+
+    def _write(self, data: bytes):
+        self._stream.write(data)
+        self._offset += len(data)
+
+    def _write_obj(self, *parts: bytes, obj_num: int = 0) -> int:
+        """Write an object, allocating a new object number unless one is given."""
+        if obj_num:
+            self._obj_offsets[obj_num - 1] = self._offset
+        else:
+            self._obj_offsets.append(self._offset)
+            obj_num = len(self._obj_offsets)
+        self._write(b"%d 0 obj\n" % obj_num)
+        for part in parts:
+            self._write(part)
+        self._write(b"\nendobj\n")
+        return obj_num
+
+
+def _format_number(value: float) -> bytes:
+    return (b"%.4f" % value).rstrip(b"0").rstrip(b".")
@@ -77,6 +77,12 @@ class Pen:
         else:
             return Pen(pen_def)
 
+    def _note_change(self):
+        # Imported here to work around a cyclic import
+        from neoscore.core import neoscore
+
+        neoscore._note_document_change()
+
     def _regenerate_interface(self):
         self._interface = PenInterface(
             self.color,
@@ -97,6 +103,7 @@ class Pen:
     def color(self, value: ColorDef):
         self._color = Color.from_def(value)
         self._regenerate_interface()
+        self._note_change()
 
     @property
     def thickness(self) -> Unit:
@@ -107,6 +114,7 @@ class Pen:
     def thickness(self, value: Unit):
         self._thickness = value
         self._regenerate_interface()
+        self._note_change()
 
     @property
     def pattern(self) -> PenPattern:
@@ -117,6 +125,7 @@ class Pen:
     def pattern(self, value: PenPattern):
         self._pattern = value
         self._regenerate_interface()
+        self._note_change()
 
     @property
     def join_style(self) -> PenJoinStyle:
@@ -130,6 +139,7 @@ class Pen:
     def join_style(self, value: PenJoinStyle):
         self._join_style = value
         self._regenerate_interface()
+        self._note_change()
 
     @property
     def cap_style(self) -> PenCapStyle:
@@ -142,6 +152,7 @@ class Pen:
     def cap_style(self, value: PenCapStyle):
         self._cap_style = value
         self._regenerate_interface()
+        self._note_change()
 
     @property
     def interface(self) -> PenInterface:
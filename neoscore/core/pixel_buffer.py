@@ -0,0 +1,95 @@
+from typing import Any, Dict, Tuple
+
+
+class PixelBuffer:
+
+    """Raw 8-bit pixels of a rendered image, shared with the image without copying.
+
+    Pixels are stored row by row, each row taking ``bytes_per_line`` bytes, which
+    may include some padding after the last pixel. Pixels have either 4 channels in
+    RGBA order or a single grayscale channel.
+
+    This supports the NumPy array interface, so ``numpy.asarray(pixel_buffer)``
+    gives a ``(height, width, channels)`` ``uint8`` array viewing the same memory
+    without a copy. Arrays created this way keep the buffer alive.
+    """
+
+    def __init__(
+        self,
+        owner: Any,
+        data: memoryview,
+        width: int,
+        height: int,
+        channels: int,
+        bytes_per_line: int,
+    ):
+        """
+        Args:
+            owner: The object owning the pixel memory. This is kept alive as long as
+                the buffer is.
+            data: A flat byte view of the pixel memory.
+            width: The image width in pixels.
+            height: The image height in pixels.
+            channels: The number of bytes per pixel.
+            bytes_per_line: The number of bytes per row of pixels.
+        """
+        self._owner = owner
+        self._data = data
+        self._width = width
+        self._height = height
+        self._channels = channels
+        self._bytes_per_line = bytes_per_line
+
+    @property
+    def data(self) -> memoryview:
+        """A flat byte view of the pixels.
+
+        This view is only valid while the ``PixelBuffer`` is alive.
+        """
+        return self._data
+
+    @property
+    def width(self) -> int:
+        """The image width in pixels."""
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """The image height in pixels."""
+        return self._height
+
+    @property
+    def channels(self) -> int:
+        """The number of channels (and bytes) per pixel."""
+        return self._channels
+
+    @property
+    def bytes_per_line(self) -> int:
+        """The number of bytes per row of pixels, including any padding."""
+        return self._bytes_per_line
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """The ``(height, width, channels)`` shape of the pixel data."""
+        return (self._height, self._width, self._channels)
+
+    def row(self, y: int) -> memoryview:
+        """Get a byte view of a row of pixels, excluding any padding.
+
+        Like :obj:`.data`, this view is only valid while the ``PixelBuffer`` is
+        alive.
+        """
+        if not 0 <= y < self._height:
+            raise IndexError(f"Row {y} out of range")
+        start = y * self._bytes_per_line
+        return self._data[start : start + (self._width * self._channels)]
+
+    @property
+    def __array_interface__(self) -> Dict[str, Any]:
+        return {
+            "version": 3,
+            "shape": self.shape,
+            "typestr": "|u1",
+            "data": self._data,
+            "strides": (self._bytes_per_line, self._channels, 1),
+        }
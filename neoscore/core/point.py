@@ -6,6 +6,10 @@ from typing_extensions import TypeAlias
 
 from neoscore.core.units import ZERO, Unit
 
+# Point arithmetic builds results with this directly, skipping the slower generated
+# ``Point.__new__``.
+_new_tuple = tuple.__new__
+
 
 class Point(NamedTuple):
     """A two-dimensional point.
@@ -28,14 +32,14 @@ class Point(NamedTuple):
     def __add__(self, other: Point) -> Point:
         """Points are added by adding their x and y values respectively"""
         try:
-            return Point(self.x + other.x, self.y + other.y)
+            return _new_tuple(Point, (self.x + other.x, self.y + other.y))
         except AttributeError:
             raise TypeError
 
     def __sub__(self, other: Point) -> Point:
         """Points are subtracted by subtracting their x and y values respectively"""
         try:
-            return Point(self.x - other.x, self.y - other.y)
+            return _new_tuple(Point, (self.x - other.x, self.y - other.y))
         except AttributeError:
             raise TypeError
 
@@ -45,17 +49,17 @@ class Point(NamedTuple):
         This is done by multiplying the x and y values by that scalar.
         """
         try:
-            return Point(self.x * other, self.y * other)
+            return _new_tuple(Point, (self.x * other, self.y * other))
         except AttributeError:
             raise TypeError
 
     def __abs__(self) -> Point:
         """Get a Point whose x and y values are the absolute values of this point's."""
-        return Point(abs(self.x), abs(self.y))
+        return _new_tuple(Point, (abs(self.x), abs(self.y)))
 
     def __neg__(self) -> Point:
         """Get a Point whose x and y values are the negation of this point's."""
-        return Point(-self.x, -self.y)
+        return _new_tuple(Point, (-self.x, -self.y))
 
 
 ORIGIN = Point(ZERO, ZERO)
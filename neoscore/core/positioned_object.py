@@ -2,20 +2,26 @@ from __future__ import annotations
 
 import math
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, Any, List, Optional, Set, Type, cast
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Type, cast
 
 from backports.cached_property import cached_property
 
 from neoscore.core import neoscore
 from neoscore.core.point import ORIGIN, Point, PointDef
+from neoscore.core.text_alignment import AlignmentX, AlignmentY
 from neoscore.core.units import ZERO, Unit
 from neoscore.interface.invisible_object_interface import InvisibleObjectInterface
+from neoscore.interface.path_interface import PathInterface, ResolvedPathElement
 from neoscore.interface.positioned_object_interface import PositionedObjectInterface
+from neoscore.interface.text_interface import TextInterface
 
 if TYPE_CHECKING:
     # Used in type annotations, imported here to avoid cyclic imports
+    from neoscore.core.brush import Brush
     from neoscore.core.flowable import Flowable
+    from neoscore.core.font import Font
     from neoscore.core.layout_controllers import NewLine
+    from neoscore.core.pen import Pen
 
 
 class render_cached_property(cached_property):  # noqa
@@ -32,6 +38,11 @@ class render_cached_property(cached_property):  # noqa
 
     Such properties must be immutable during rendering. Typical ``@property`` setters
     are not supported.
+
+    Values are cached per object along with the render epoch they were computed in
+    (see ``_begin_render_epoch``), so they are only reused within the same epoch and
+    never need to be cleared explicitly. Outside rendering, values are computed on
+    every access.
     """
 
     # Note that this class extends `cached_property`, but this is just a hack to make
@@ -44,22 +55,63 @@ class render_cached_property(cached_property):  # noqa
         self.func = func
         self.attrname = None
         self.__doc__ = func.__doc__
+        self._cache_key = func.__name__
 
     def __get__(self, obj, cls):  # noqa
         if obj is None:
             return self
-        result = self.func(obj)
-        if not getattr(obj, "_currently_rendering", None):
-            return result
-        property_name = self.func.__name__
-        value = obj.__dict__[property_name] = result
-        obj._render_cached_properties.add(property_name)  # noqa
-        return value
+        epoch = _render_epoch
+        if not epoch:
+            return self.func(obj)
+        if obj._render_cache_epoch == epoch:
+            cache = obj._render_cache
+            try:
+                return cache[self._cache_key]
+            except KeyError:
+                pass
+        else:
+            cache = obj._render_cache = {}
+            obj._render_cache_epoch = epoch
+        result = cache[self._cache_key] = self.func(obj)
+        return result
 
     def __set__(self, obj, val):
         raise AttributeError(f"can't set attribute '{self.func.__name__}'")
 
 
+_render_epoch: int = 0
+"""The render epoch in progress, or ``0`` outside rendering."""
+
+_last_render_epoch: int = 0
+"""The most recently started render epoch."""
+
+
+def _begin_render_epoch(epoch: Optional[int] = None) -> int:
+    """Enable ``render_cached_property`` caching for a render.
+
+    Args:
+        epoch: A previously started epoch to resume, keeping values cached in it
+            valid. If omitted, a new epoch is started, which invalidates every
+            value cached before.
+
+    Returns:
+        The epoch now in progress.
+    """
+    global _render_epoch
+    global _last_render_epoch
+    if epoch is None:
+        _last_render_epoch += 1
+        epoch = _last_render_epoch
+    _render_epoch = epoch
+    return epoch
+
+
+def _end_render_epoch():
+    """Disable ``render_cached_property`` caching after a render."""
+    global _render_epoch
+    _render_epoch = 0
+
+
 class PositionedObject:
     """An object positioned in the scene
 
@@ -81,6 +133,37 @@ class PositionedObject:
     ``neoscore.document.pages[n]``
     """
 
+    # Slots keep the many small objects in large scores compact. Subclasses which
+    # don't declare their own ``__slots__`` get an instance ``__dict__`` as usual.
+    __slots__ = (
+        "_pos",
+        "_children",
+        "_descendant_index",
+        "_anchored_pos_cache",
+        "_attached",
+        "_parent",
+        "_render_cache",
+        "_render_cache_epoch",
+        "_currently_rendering",
+        "_interfaces",
+        "_interface_for_children",
+        "_scale",
+        "_rotation",
+        "_transform_origin",
+        "__weakref__",
+    )
+
+    # Whether this class overrides `pre_render_hook` or `post_render_hook`. Document
+    # renders only run the hooks of objects whose classes do.
+    _has_render_hooks = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._has_render_hooks = (
+            cls.pre_render_hook is not PositionedObject.pre_render_hook
+            or cls.post_render_hook is not PositionedObject.post_render_hook
+        )
+
     def __init__(
         self,
         pos: PointDef,
@@ -91,11 +174,27 @@ class PositionedObject:
             pos: The position of the object relative to its parent
             parent: The parent object. Defaults to the document's first page.
         """
+        # Child containers are only allocated once needed, since most objects in a
+        # score are leaves. Children are kept as dict keys, so they stay in insertion
+        # order and can be removed in constant time.
+        self._children: Optional[Dict[PositionedObject, None]] = None
+        # This object's position relative to its nearest flowable or root ancestor,
+        # along with that ancestor. See `_anchored_pos`.
+        self._anchored_pos_cache: Optional[Tuple[Point, Any]] = None
         self.pos = pos
-        self._children: List[PositionedObject] = []
+        # All descendants grouped by exact class, kept up to date as the tree changes.
+        # Inner dicts are used as insertion-ordered sets.
+        self._descendant_index: Optional[
+            Dict[Type[PositionedObject], Dict[PositionedObject, None]]
+        ] = None
+        # Whether this object is currently in its parent's `children`
+        self._attached = False
         self._parent = PositionedObject._resolve_parent(parent)
         self._set_parent_and_register_self(parent)
-        self._render_cached_properties: Set[str] = set()
+        # Values of `render_cached_property`s computed in render epoch
+        # `_render_cache_epoch`
+        self._render_cache: Optional[Dict[str, Any]] = None
+        self._render_cache_epoch = 0
         self._currently_rendering = False
         self._interfaces = []
         self._interface_for_children = None
@@ -111,6 +210,8 @@ class PositionedObject:
     @pos.setter
     def pos(self, value: PointDef):
         self._pos = Point.from_def(value)
+        self._invalidate_anchored_pos()
+        self.mark_dirty()
 
     @property
     def scale(self) -> float:
@@ -126,6 +227,7 @@ class PositionedObject:
     @scale.setter
     def scale(self, value: float):
         self._scale = value
+        self.mark_dirty()
 
     @property
     def rotation(self) -> float:
@@ -141,6 +243,7 @@ class PositionedObject:
     @rotation.setter
     def rotation(self, value: float):
         self._rotation = value
+        self.mark_dirty()
 
     @property
     def transform_origin(self) -> Point:
@@ -150,6 +253,7 @@ class PositionedObject:
     @transform_origin.setter
     def transform_origin(self, value: PointDef):
         self._transform_origin = Point.from_def(value)
+        self.mark_dirty()
 
     @property
     def x(self) -> Unit:
@@ -191,32 +295,58 @@ class PositionedObject:
 
     @parent.setter
     def parent(self, value: Optional[PositionedObject]):
+        self._mark_detached()
         self._parent._unregister_child(self)
         self._set_parent_and_register_self(value)
+        self._invalidate_anchored_pos()
+        self.mark_dirty()
 
     @property
     def children(self) -> List[PositionedObject]:
-        """All direct children of this object."""
-        return self._children
+        """All direct children of this object, in the order they were added.
+
+        This gives a new list each time, so modifying it doesn't change the tree. To
+        rearrange children, set their ``parent`` or assign a new list here.
+        """
+        return list(self._children or ())
 
     @children.setter
-    def children(self, value: List[PositionedObject]):
-        self._children = value
+    def children(self, value: Iterable[PositionedObject]):
+        new_children = dict.fromkeys(value)
+        old_children = self._children or {}
+        for child in old_children:
+            child._attached = False
+            if child not in new_children:
+                self._update_descendant_index(child, False)
+        self._children = new_children
+        for child in new_children:
+            child._attached = True
+            if child not in old_children:
+                self._update_descendant_index(child, True)
+        self.mark_dirty()
 
     @property
     def descendants(self) -> Iterator[PositionedObject]:
         """All the objects in the children subtree.
 
-        This recursively searches all the object's children
-        (and their children, etc.) and provides an iterator over them.
+        This searches all the object's children (and their children, etc.) and
+        provides an iterator over them. Each object is given after all of its own
+        descendants.
 
-        The current implementation performs a simple recursive DFS over
-        the tree, and has the potential to be rather slow.
+        The search is a depth-first traversal using an explicit stack, so deep trees
+        don't incur nested generator overhead.
         """
-        for child in self.children:
-            for subchild in child.descendants:
-                yield subchild
-            yield child
+        # Children are snapshotted so the tree can be changed during iteration
+        stack = [(self, iter(tuple(self._children or ())))]
+        while stack:
+            children = stack[-1][1]
+            child = next(children, None)
+            if child is None:
+                node = stack.pop()[0]
+                if stack:
+                    yield node
+            else:
+                stack.append((child, iter(tuple(child._children or ()))))
 
     @render_cached_property
     def flowable(self) -> Optional[Flowable]:
@@ -251,27 +381,52 @@ class PositionedObject:
     def descendants_of_class_or_subclass(
         self, graphic_object_class: Type[PositionedObject]
     ) -> Iterator[PositionedObject]:
-        """Yield all child descendants with a given class or its subclasses."""
-        for descendant in self.descendants:
-            if isinstance(descendant, graphic_object_class):
-                yield descendant
+        """Yield all child descendants with a given class or its subclasses.
+
+        This is looked up in an index maintained as the tree changes, so it doesn't
+        search the whole subtree. The order of results is unspecified.
+        """
+        for cls, descendants in list((self._descendant_index or {}).items()):
+            if issubclass(cls, graphic_object_class):
+                yield from list(descendants)
 
     def descendants_of_exact_class(
         self, graphic_object_class: Type[PositionedObject]
     ) -> Iterator[PositionedObject]:
-        """Yield all child descendants of a given class, excluding sublcasses"""
-        for descendant in self.descendants:
-            if type(descendant) == graphic_object_class:
-                yield descendant
+        """Yield all child descendants of a given class, excluding sublcasses
+
+        Like :obj:`.descendants_of_class_or_subclass`, this is looked up in an index
+        and the order of results is unspecified.
+        """
+        yield from list((self._descendant_index or {}).get(graphic_object_class, ()))
 
     def descendants_with_attribute(self, attribute: str) -> Iterator[PositionedObject]:
-        """Yield all child descendants which has a given attribute.
+        """Yield all child descendants whose class has a given attribute.
 
-        This is useful for searching descendants for duck-typing matches.
+        This is useful for searching descendants for duck-typing matches, typically
+        with class-level type markers like ``_neoscore_break_opportunity_type_marker``.
+        Only class attributes are considered, since matches are looked up by class in
+        an index maintained as the tree changes. The order of results is unspecified.
         """
-        for descendant in self.descendants:
-            if hasattr(descendant, attribute):
-                yield descendant
+        for cls, descendants in list((self._descendant_index or {}).items()):
+            if hasattr(cls, attribute):
+                yield from list(descendants)
+
+    def _descendants_with_render_hooks(self) -> List[PositionedObject]:
+        """Find all descendants whose classes override the render hooks.
+
+        Deeper objects come first, so, like in ``descendants``, every object comes
+        after all of its own descendants.
+        """
+        found = [
+            obj
+            for cls, descendants in (self._descendant_index or {}).items()
+            if cls._has_render_hooks
+            for obj in descendants
+        ]
+        if len(found) > 1:
+            found.sort(key=lambda obj: sum(1 for _ in obj.ancestors), reverse=True)
+        return found
 
     @property
     def ancestors(self) -> Iterator[PositionedObject]:
@@ -303,6 +458,9 @@ class PositionedObject:
             ValueError:
                 If ``descendant`` is not a descendant of this object.
         """
+        if descendant in (self._descendant_index or {}).get(type(descendant), ()):
+            self_pos, descendant_pos = self._positions_in_common_anchor(descendant)
+            return descendant_pos - self_pos
         pos = descendant.pos
         for parent in descendant.ancestors:
             if parent == self:
@@ -319,11 +477,15 @@ class PositionedObject:
             ValueError:
                 If ``descendant`` is not a descendant of this object.
         """
-        pos_x = descendant.pos.x
+        if descendant in (self._descendant_index or {}).get(type(descendant), ()):
+            self_pos, descendant_pos = self._positions_in_common_anchor(descendant)
+            return descendant_pos.x - self_pos.x
+        descendant_x = descendant.pos.x
+        pos_x = descendant_x.base_value
         for parent in descendant.ancestors:
-            if parent == self:
-                return pos_x
-            pos_x += parent.pos.x
+            if parent is self:
+                return descendant_x._from_base_value(pos_x)
+            pos_x += parent.pos.x.base_value
         raise ValueError(f"{self} is not an ancestor of {descendant}")
 
     def map_to(self, dst: PositionedObject) -> Point:
@@ -335,7 +497,6 @@ class PositionedObject:
         for two objects in a ``Flowable`` container whether they are separated by
         a line break.
         """
-        # When changing this method be sure to make the equivalent change in `map_x_to`
         # Handle easy cases
         if self == dst:
             return ORIGIN
@@ -345,31 +506,11 @@ class PositionedObject:
             return dst.pos
         if self.parent == dst:
             return -self.pos
-        # Start by collecting all ancestor using IDs because they're hashable
-        self_ancestor_ids = set(id(obj) for obj in self.ancestors)
-        relative_dst_pos = dst.pos
-        for dst_ancestor in dst.ancestors:
-            if hasattr(dst_ancestor, "parent"):
-                relative_dst_pos += dst_ancestor.pos
-            if id(dst_ancestor) in self_ancestor_ids:
-                # Now find relative_self_pos and return relative_dst_pos - relative_self_pos
-                relative_self_pos = self.pos
-                for self_ancestor in self.ancestors:
-                    if hasattr(self_ancestor, "parent"):
-                        relative_self_pos += self_ancestor.pos
-                    if self_ancestor == dst_ancestor:
-                        return relative_dst_pos - relative_self_pos
-                # Since we've already determined there is a common
-                # ancestor, this should never happen
-                assert False, "Unreachable"
-        raise ValueError(f"{self} and {dst} have no common ancestor")
+        self_pos, dst_pos = self._positions_in_common_anchor(dst)
+        return dst_pos - self_pos
 
     def map_x_to(self, dst: PositionedObject) -> Unit:
         """Like :obj:`.map_to`, but only return the X distance from to ``dst``."""
-
-        # This implementation is copied from `map_to` and tweaked to only handle the X
-        # axis. This is a very common operation, so this optimization is useful.
-
         # Handle easy cases
         if self == dst:
             return ZERO
@@ -379,24 +520,8 @@ class PositionedObject:
             return dst.x
         if self.parent == dst:
             return -self.x
-        # Start by collecting all ancestor using IDs because they're hashable
-        self_ancestor_ids = set(id(obj) for obj in self.ancestors)
-        relative_dst_x = dst.x
-        for dst_ancestor in dst.ancestors:
-            if hasattr(dst_ancestor, "parent"):
-                relative_dst_x += dst_ancestor.x
-            if id(dst_ancestor) in self_ancestor_ids:
-                # Now find relative_self_x and return relative_dst_x - relative_self_x
-                relative_self_x = self.x
-                for self_ancestor in self.ancestors:
-                    if hasattr(self_ancestor, "parent"):
-                        relative_self_x += self_ancestor.x
-                    if self_ancestor == dst_ancestor:
-                        return relative_dst_x - relative_self_x
-                # Since we've already determined there is a common
-                # ancestor, this should never happen
-                assert False, "Unreachable"
-        raise ValueError(f"{self} and {dst} have no common ancestor")
+        self_pos, dst_pos = self._positions_in_common_anchor(dst)
+        return dst_pos.x - self_pos.x
 
     def distance_to(self, obj: PositionedObject, offset: Point = ORIGIN) -> Unit:
         """Find the distance to a given object, with an optional extra offset.
@@ -418,21 +543,46 @@ class PositionedObject:
         For objects in :obj:`.Flowable`\ s, this should only be accessed at render time,
         when flowable layouts are available.
         """
-        pos = ORIGIN
-        current = self
-        while hasattr(current, "parent"):
-            pos += current.pos
-            current = current.parent
-            if hasattr(current, "map_to_canvas"):
-                # Parent appears to be a flowable,
-                # so let it decide where the point goes.
-                return cast(Any, current).map_to_canvas(pos)
+        pos, anchor = self._anchored_pos()
+        pos = ORIGIN + pos
+        if hasattr(anchor, "map_to_canvas"):
+            # Anchor is a flowable, so let it decide where the point goes.
+            return anchor.map_to_canvas(pos)
         return pos
 
     def remove(self):
         """Remove this object from the document tree."""
         if self.parent:
-            self.parent.children.remove(self)
+            self._mark_detached()
+            self.parent._unregister_child(self)
+
+    def mark_dirty(self):
+        """Flag this object's subtree as needing to be re-rendered.
+
+        This is used in incremental rendering mode (see
+        :obj:`.neoscore.set_incremental_render`), and also lets exports like
+        :obj:`.neoscore.render_image` know the scene must be rebuilt (see
+        :obj:`.Document.generation`). Built-in property setters call this
+        automatically, so it only needs to be called manually when an object's
+        appearance depends on state neoscore can't observe, for instance a path whose
+        elements are anchored to objects outside its own subtree, or a mutated
+        :obj:`.Pen` shared by several objects in incremental rendering mode.
+        """
+        # Changes made during rendering must not leave stale cached values behind
+        self._render_cache_epoch = 0
+        document = getattr(neoscore, "document", None)
+        if document is not None:
+            document._mark_dirty(self)
+
+    def _mark_detached(self):
+        """Notify the document that this subtree is leaving its current location.
+
+        In incremental rendering mode this causes the subtree's existing graphical
+        interfaces to be torn down in the next render.
+        """
+        document = getattr(neoscore, "document", None)
+        if document is not None:
+            document._mark_detached(self)
 
     def pre_render_hook(self):
         """Run code once just before document rendering begins.
@@ -446,9 +596,6 @@ class PositionedObject:
 
         Implementations *must* call the superclass function as well.
         """
-        for cached_property in self._render_cached_properties:
-            del self.__dict__[cached_property]
-        self._render_cached_properties.clear()
         self._currently_rendering = False
 
     def render(self):
@@ -456,7 +603,10 @@ class PositionedObject:
 
         This and other render methods should generally not be called directly.
         """
+        # Drop interfaces left from any previous render
+        self._interfaces.clear()
         if self.flowable is not None:
+            self._interface_for_children = None
             self.render_in_flowable()
         else:
             self._interface_for_children = InvisibleObjectInterface(
@@ -467,9 +617,9 @@ class PositionedObject:
                 self.rotation,
                 self.transform_origin,
             )
-            self._interface_for_children.render()
+            self._render_interface_for_children()
             self.render_complete(self.pos)
-        for child in self.children:
+        for child in tuple(self._children or ()):
             child.render()
 
     def render_in_flowable(self):
@@ -480,6 +630,8 @@ class PositionedObject:
         """
         # Calculate position within flowable
         assert self.flowable is not None
+        # Lines outside the render region are skipped (see `Document.render`)
+        rendered_lines = self.flowable._lines_in_render_region
         pos_in_flowable = self.flowable.descendant_pos(self)
         first_line_i = self.flowable.last_break_index_at(pos_in_flowable.x)
         first_line = self.flowable.lines[first_line_i]
@@ -488,7 +640,8 @@ class PositionedObject:
         )
         remaining_x = self.breakable_length - first_line_length
         if remaining_x <= ZERO:
-            self.render_complete(self.canvas_pos(), first_line, pos_in_flowable.x)
+            if rendered_lines is None or rendered_lines[first_line_i]:
+                self.render_complete(self.canvas_pos(), first_line, pos_in_flowable.x)
             return
 
         # Render before break
@@ -501,29 +654,35 @@ class PositionedObject:
                 first_line.flowable_x + first_line.length - pos_in_flowable.x
             )
             remaining_x = self.breakable_length - first_line_length
-        line_pos = first_line.canvas_pos()
-        render_start_pos = Point(
-            line_pos.x + (pos_in_flowable.x - first_line.flowable_x),
-            line_pos.y + pos_in_flowable.y,
-        )
-        self.render_before_break(render_start_pos, first_line, pos_in_flowable.x)
+        if rendered_lines is None or rendered_lines[first_line_i]:
+            line_pos = first_line.canvas_pos()
+            render_start_pos = Point(
+                line_pos.x + (pos_in_flowable.x - first_line.flowable_x),
+                line_pos.y + pos_in_flowable.y,
+            )
+            self.render_before_break(render_start_pos, first_line, pos_in_flowable.x)
 
         # Iterate through remaining length
         for current_line_i in range(first_line_i + 1, len(self.flowable.lines)):
             current_line = self.flowable.lines[current_line_i]
-            line_pos = current_line.canvas_pos()
-            render_start_pos = Point(line_pos.x, line_pos.y + pos_in_flowable.y)
-            local_object_x = self.breakable_length - remaining_x
-            if remaining_x > current_line.length:
-                # Render spanning continuation
-                self.render_spanning_continuation(
-                    render_start_pos, current_line, local_object_x
-                )
-                remaining_x -= current_line.length
-            else:
-                # Render end
-                self.render_after_break(render_start_pos, current_line, local_object_x)
+            is_last_line = remaining_x <= current_line.length
+            if rendered_lines is None or rendered_lines[current_line_i]:
+                line_pos = current_line.canvas_pos()
+                render_start_pos = Point(line_pos.x, line_pos.y + pos_in_flowable.y)
+                local_object_x = self.breakable_length - remaining_x
+                if is_last_line:
+                    # Render end
+                    self.render_after_break(
+                        render_start_pos, current_line, local_object_x
+                    )
+                else:
+                    # Render spanning continuation
+                    self.render_spanning_continuation(
+                        render_start_pos, current_line, local_object_x
+                    )
+            if is_last_line:
                 break
+            remaining_x -= current_line.length
 
     def render_complete(
         self,
@@ -622,6 +781,199 @@ class PositionedObject:
             object_x: The local object x position of the line's start.
         """
 
+    def _render_interface(self, interface: PositionedObjectInterface):
+        """Render a graphical interface for this object and record it in
+        ``interfaces``.
+
+        During incremental renders this reuses the Qt object of the interface in
+        the same position from the previous render where possible.
+        """
+        self._render_reusing(interface, len(self._interfaces))
+        self._interfaces.append(interface)
+
+    def _render_interface_for_children(self):
+        self._render_reusing(self._interface_for_children, None)
+
+    def _render_reusing(
+        self, interface: PositionedObjectInterface, slot: Optional[int]
+    ):
+        document = getattr(neoscore, "document", None)
+        if document is None:
+            interface.render()
+        else:
+            document._render_interface(self, slot, interface)
+
+    def _draw_path(
+        self,
+        pos: Point,
+        parent: Optional[PositionedObjectInterface],
+        elements: List[ResolvedPathElement],
+        pen: Pen,
+        brush: Brush,
+    ):
+        """Render a path as part of this object without creating a :obj:`.Path`.
+
+        This is a lightweight alternative to building, rendering, and removing a
+        throwaway ``Path`` object in render methods. The created interface is
+        recorded in ``self.interfaces`` like any other.
+
+        Args:
+            pos: The path position relative to ``parent``. Inside flowables this is
+                in document coordinates.
+            parent: The interface to position the path relative to. This should be
+                ``None`` inside flowables.
+            elements: The path elements, relative to ``pos``.
+            pen: The pen to draw outlines with.
+            brush: The brush to fill shapes with.
+        """
+        self._render_interface(
+            PathInterface(
+                pos,
+                parent,
+                1,
+                0,
+                ORIGIN,
+                brush.interface,
+                pen.interface,
+                elements,
+            )
+        )
+
+    def _draw_text(
+        self,
+        pos: Point,
+        parent: Optional[PositionedObjectInterface],
+        text: str,
+        font: Font,
+        pen: Pen,
+        brush: Brush,
+        alignment_x: AlignmentX = AlignmentX.LEFT,
+        alignment_y: AlignmentY = AlignmentY.BASELINE,
+    ):
+        """Render text as part of this object without creating a :obj:`.Text`.
+
+        Like :obj:`._draw_path`, this is a lightweight alternative to rendering a
+        throwaway ``Text`` object.
+
+        Args:
+            pos: The text position relative to ``parent``. Inside flowables this is
+                in document coordinates.
+            parent: The interface to position the text relative to. This should be
+                ``None`` inside flowables.
+            text: The text to draw. For music fonts, this should be the resolved
+                codepoint string.
+            font: The font to draw the text with.
+            pen: The pen to trace text outlines with.
+            brush: The brush to fill in text shapes with.
+            alignment_x: The text's horizontal alignment relative to ``pos``.
+            alignment_y: The text's vertical alignment relative to ``pos``.
+        """
+        # Imported here to work around a cyclic import
+        from neoscore.core.text import _offset_for_alignment
+
+        if alignment_x == AlignmentX.LEFT and alignment_y == AlignmentY.BASELINE:
+            offset = ORIGIN
+        else:
+            offset = _offset_for_alignment(
+                font.bounding_rect_of(text), alignment_x, alignment_y
+            )
+        self._render_interface(
+            TextInterface(
+                pos + offset,
+                parent,
+                1,
+                0,
+                -offset,
+                brush.interface,
+                pen.interface,
+                text,
+                font.interface,
+            )
+        )
+
+    def _anchored_pos(self) -> Tuple[Point, Any]:
+        """Find this object's position relative to its nearest anchor ancestor.
+
+        Anchors are :obj:`.Flowable`\ s and the document root. The returned position
+        is the sum of the positions of this object and its ancestors below the anchor,
+        so for objects outside flowables it is the canvas position.
+
+        Results are cached on every object along the way up, and cleared by
+        ``_invalidate_anchored_pos`` when an object's position or parent changes, so
+        repeated lookups take constant time.
+
+        Returns:
+            A tuple of the position and the anchor.
+        """
+        cached = self._anchored_pos_cache
+        if cached is not None:
+            return cached
+        # Walk up to the anchor or the nearest ancestor with a cached result
+        chain = []
+        node = self
+        while True:
+            chain.append(node)
+            parent = node.parent
+            if not hasattr(parent, "parent") or hasattr(parent, "map_to_canvas"):
+                pos, anchor = None, parent
+                break
+            cached = parent._anchored_pos_cache
+            if cached is not None:
+                pos, anchor = cached
+                break
+            node = parent
+        for node in reversed(chain):
+            pos = node.pos if pos is None else node.pos + pos
+            node._anchored_pos_cache = (pos, anchor)
+        return cast(Tuple[Point, Any], self._anchored_pos_cache)
+
+    def _anchor_chain(self) -> List[Tuple[Point, Any]]:
+        """Find this object's position relative to itself and each anchor above it."""
+        chain: List[Tuple[Point, Any]] = [(ORIGIN, self)]
+        pos, anchor = self._anchored_pos()
+        chain.append((pos, anchor))
+        while hasattr(anchor, "parent"):
+            anchor_pos, anchor = anchor._anchored_pos()
+            pos = pos + anchor_pos
+            chain.append((pos, anchor))
+        return chain
+
+    def _positions_in_common_anchor(
+        self, other: PositionedObject
+    ) -> Tuple[Point, Point]:
+        """Find the positions of this object and another relative to a shared anchor.
+
+        Positions are measured from the closest anchor the objects share, where either
+        object may itself act as the anchor. This keeps positions small and exact for
+        objects in the same flowable.
+
+        Raises:
+            ValueError: If the objects have no common ancestor.
+        """
+        self_chain = self._anchor_chain()
+        for other_pos, other_anchor in other._anchor_chain():
+            for self_pos, self_anchor in self_chain:
+                if self_anchor is other_anchor:
+                    return self_pos, other_pos
+        raise ValueError(f"{self} and {other} have no common ancestor")
+
+    def _invalidate_anchored_pos(self):
+        """Clear cached anchored positions which depend on this object's position.
+
+        Caches are filled from an object up to its anchor, so descendants (within the
+        same anchor) of an object without a cached position never have one either,
+        and the walk stops there. Descendants of flowables are positioned
+        relative to their flowable, so the walk doesn't continue into them.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._anchored_pos_cache is None:
+                continue
+            node._anchored_pos_cache = None
+            if not hasattr(node, "map_to_canvas"):
+                stack.extend(node._children or ())
+
     @staticmethod
     def _resolve_parent(value: Optional[PositionedObject]) -> PositionedObject:
         if value is None:
@@ -637,8 +989,45 @@ class PositionedObject:
 
     def _register_child(self, child: PositionedObject):
         """Add an object to ``self.children``."""
-        self.children.append(child)
+        if self._children is None:
+            self._children = {}
+        self._children[child] = None
+        child._attached = True
+        self._update_descendant_index(child, True)
 
     def _unregister_child(self, child: PositionedObject):
-        """Remove an object from ``self.children``."""
-        self.children.remove(child)
+        """Remove an object from ``self.children``.
+
+        Raises:
+            ValueError: If ``child`` is not a child of this object.
+        """
+        children = self._children
+        if children is None or child not in children:
+            raise ValueError(f"{child} is not a child of {self}")
+        del children[child]
+        child._attached = False
+        self._update_descendant_index(child, False)
+
+    def _update_descendant_index(self, child: PositionedObject, added: bool):
+        """Add or remove a child's subtree in the descendant index of self and above."""
+        entries = [(type(child), child)]
+        for cls, descendants in (child._descendant_index or {}).items():
+            entries.extend((cls, descendant) for descendant in descendants)
+        node: Any = self
+        while node is not None:
+            if not hasattr(node, "_descendant_index"):
+                # Document root reached
+                break
+            index = node._descendant_index
+            if index is None:
+                index = node._descendant_index = {}
+            for cls, descendant in entries:
+                if added:
+                    index.setdefault(cls, {})[descendant] = None
+                else:
+                    descendants = index.get(cls)
+                    if descendants is not None:
+                        descendants.pop(descendant, None)
+                        if not descendants:
+                            del index[cls]
+            node = getattr(node, "parent", None)
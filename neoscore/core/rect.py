@@ -47,6 +47,32 @@ class Rect:
         bottom_edge = max(self.y + self.height, other.y + other.height)
         return Rect(x, y, right_edge - x, bottom_edge - y)
 
+    def intersects(self, other: Rect) -> bool:
+        """Whether ``self`` and ``other`` overlap.
+
+        Rects which only touch at their edges are considered overlapping.
+
+        Note: This assumes ``width`` and ``height`` in both rects are positive.
+        """
+        return (
+            self.x <= other.x + other.width
+            and other.x <= self.x + self.width
+            and self.y <= other.y + other.height
+            and other.y <= self.y + self.height
+        )
+
+    def contains(self, other: Rect) -> bool:
+        """Whether ``other`` lies entirely inside ``self``.
+
+        Note: This assumes ``width`` and ``height`` in both rects are positive.
+        """
+        return (
+            self.x <= other.x
+            and self.y <= other.y
+            and other.x + other.width <= self.x + self.width
+            and other.y + other.height <= self.y + self.height
+        )
+
     def __mul__(self, other: float) -> Rect:
         return Rect(
             self.x * other, self.y * other, self.width * other, self.height * other
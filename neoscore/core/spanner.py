@@ -46,6 +46,7 @@ class Spanner:
     @end_x.setter
     def end_x(self, value: Unit):
         self._end_x = value
+        cast(PositionedObject, self).mark_dirty()
 
     @render_cached_property
     def end_y(self) -> Unit:
@@ -68,6 +69,7 @@ class Spanner:
     @end_parent.setter
     def end_parent(self, value: PositionedObject):
         self._end_parent = value
+        cast(PositionedObject, self).mark_dirty()
 
     @render_cached_property
     def spanner_x_length(self) -> Unit:
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Generic, Iterable, List, Tuple, TypeVar
+
+from neoscore.core.point import Point
+from neoscore.core.rect import Rect
+
+T = TypeVar("T")
+
+_NODE_CAPACITY = 16
+
+
+class SpatialIndex(Generic[T]):
+
+    """A static R-tree for finding items by their bounding rects.
+
+    The tree is bulk loaded once using Sort-Tile-Recursive packing, which groups
+    nearby rects into nodes of up to 16 children, so queries only descend into
+    nodes overlapping the searched region. Items can't be added or removed after
+    construction; build a new index instead.
+
+    Items may be given several rects, for instance one per line an object is drawn
+    on. Query results contain every matching item once, in the order items were
+    first given.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Rect, T]]):
+        """
+        Args:
+            entries: Pairs of rects and the items they belong to. Items must be
+                hashable, and rects must have non-negative widths and heights.
+        """
+        item_indices: Dict[T, int] = {}
+        leaves = []
+        for rect, item in entries:
+            index = item_indices.setdefault(item, len(item_indices))
+            x = rect.x.base_value
+            y = rect.y.base_value
+            leaves.append(
+                (
+                    x,
+                    y,
+                    x + rect.width.base_value,
+                    y + rect.height.base_value,
+                    index,
+                )
+            )
+        self._items: List[T] = list(item_indices)
+        self._root = None
+        self._height = 0
+        if leaves:
+            nodes = leaves
+            while len(nodes) > 1 or self._height == 0:
+                nodes = SpatialIndex._pack(nodes)
+                self._height += 1
+            self._root = nodes[0]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def items_at(self, point: Point) -> List[T]:
+        """Find all items with a rect containing a point.
+
+        Points on rect edges are considered inside them.
+        """
+        x = point.x.base_value
+        y = point.y.base_value
+        return self._search(x, y, x, y)
+
+    def items_in(self, rect: Rect) -> List[T]:
+        """Find all items with a rect overlapping another rect.
+
+        Rects which only touch at their edges are considered overlapping.
+        """
+        x = rect.x.base_value
+        y = rect.y.base_value
+        return self._search(x, y, x + rect.width.base_value, y + rect.height.base_value)
+
+    def _search(self, x1: float, y1: float, x2: float, y2: float) -> List[T]:
+        if self._root is None:
+            return []
+        found = []
+        stack = [(self._root, self._height)]
+        while stack:
+            node, level = stack.pop()
+            for child in node[4]:
+                if (
+                    child[0] <= x2
+                    and child[2] >= x1
+                    and child[1] <= y2
+                    and child[3] >= y1
+                ):
+                    if level == 1:
+                        found.append(child[4])
+                    else:
+                        stack.append((child, level - 1))
+        items = self._items
+        return [items[i] for i in sorted(set(found))]
+
+    @staticmethod
+    def _pack(nodes: List[tuple]) -> List[tuple]:
+        """Group one tree level into parent nodes using Sort-Tile-Recursive packing.
+
+        Nodes (and leaf entries) are tuples of ``(x1, y1, x2, y2, payload)``, where the
+        payload of a parent node is its list of children.
+        """
+        parent_count = math.ceil(len(nodes) / _NODE_CAPACITY)
+        slice_size = math.ceil(math.sqrt(parent_count)) * _NODE_CAPACITY
+        nodes = sorted(nodes, key=lambda n: n[0] + n[2])
+        parents = []
+        for slice_start in range(0, len(nodes), slice_size):
+            tile = sorted(
+                nodes[slice_start : slice_start + slice_size],
+                key=lambda n: n[1] + n[3],
+            )
+            for group_start in range(0, len(tile), _NODE_CAPACITY):
+                group = tile[group_start : group_start + _NODE_CAPACITY]
+                parents.append(
+                    (
+                        min(n[0] for n in group),
+                        min(n[1] for n in group),
+                        max(n[2] for n in group),
+                        max(n[3] for n in group),
+                        group,
+                    )
+                )
+        return parents
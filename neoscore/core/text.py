@@ -20,6 +20,15 @@ class Text(PaintedObject):
 
     """A graphical text object."""
 
+    __slots__ = (
+        "_font",
+        "_text",
+        "_breakable",
+        "_alignment_x",
+        "_alignment_y",
+        "_background_brush",
+    )
+
     def __init__(
         self,
         pos: PointDef,
@@ -91,6 +100,7 @@ class Text(PaintedObject):
     @text.setter
     def text(self, value: str):
         self._text = value
+        self.mark_dirty()
 
     @property
     def font(self) -> Font:
@@ -99,6 +109,7 @@ class Text(PaintedObject):
     @font.setter
     def font(self, value: Font):
         self._font = value
+        self.mark_dirty()
 
     @property
     def background_brush(self) -> Optional[Brush]:
@@ -111,6 +122,7 @@ class Text(PaintedObject):
             self._background_brush = Brush.from_def(value)
         else:
             self._background_brush = None
+        self.mark_dirty()
 
     @property
     def breakable(self) -> bool:
@@ -120,6 +132,7 @@ class Text(PaintedObject):
     @breakable.setter
     def breakable(self, value: bool):
         self._breakable = value
+        self.mark_dirty()
 
     @property
     def alignment_x(self) -> AlignmentX:
@@ -133,6 +146,7 @@ class Text(PaintedObject):
     @alignment_x.setter
     def alignment_x(self, value: AlignmentX):
         self._alignment_x = value
+        self.mark_dirty()
 
     @property
     def alignment_y(self) -> AlignmentY:
@@ -142,6 +156,7 @@ class Text(PaintedObject):
     @alignment_y.setter
     def alignment_y(self, value: AlignmentY):
         self._alignment_y = value
+        self.mark_dirty()
 
     @render_cached_property
     def _alignment_offset(self) -> Point:
@@ -150,16 +165,9 @@ class Text(PaintedObject):
             and self.alignment_y == AlignmentY.BASELINE
         ):
             return ORIGIN
-        x = ZERO
-        y = ZERO
-        bounding_rect = self._raw_scaled_bounding_rect
-        if self.alignment_x == AlignmentX.CENTER:
-            x = (bounding_rect.width / -2) - bounding_rect.x
-        elif self.alignment_x == AlignmentX.RIGHT:
-            x = -bounding_rect.width - bounding_rect.x
-        if self.alignment_y == AlignmentY.CENTER:
-            y = (bounding_rect.height / -2) - bounding_rect.y
-        return Point(x, y)
+        return _offset_for_alignment(
+            self._raw_scaled_bounding_rect, self.alignment_x, self.alignment_y
+        )
 
     @render_cached_property
     def _raw_scaled_bounding_rect(self) -> Rect:
@@ -218,8 +226,7 @@ class Text(PaintedObject):
             clip_start_x,
             clip_width,
         )
-        slice_interface.render()
-        self.interfaces.append(slice_interface)
+        self._render_interface(slice_interface)
 
     def render_complete(
         self,
@@ -241,3 +248,18 @@ class Text(PaintedObject):
 
     def render_after_break(self, pos: Point, flowable_line: NewLine, object_x: Unit):
         self._render_slice(pos, True, object_x, None)
+
+
+def _offset_for_alignment(
+    bounding_rect: Rect, alignment_x: AlignmentX, alignment_y: AlignmentY
+) -> Point:
+    """Find the offset which aligns text with a given bounding rect."""
+    x = ZERO
+    y = ZERO
+    if alignment_x == AlignmentX.CENTER:
+        x = (bounding_rect.width / -2) - bounding_rect.x
+    elif alignment_x == AlignmentX.RIGHT:
+        x = -bounding_rect.width - bounding_rect.x
+    if alignment_y == AlignmentY.CENTER:
+        y = (bounding_rect.height / -2) - bounding_rect.y
+    return Point(x, y)
@@ -6,6 +6,8 @@ from typing import Any, Optional, Type, TypeVar, Union, cast
 
 TUnit = TypeVar("TUnit", bound="Unit")
 
+_new_object = object.__new__
+
 
 class Unit:
     """An immutable graphical distance with a unit.
@@ -44,20 +46,27 @@ class Unit:
     Subclasses should override this.
     """
 
-    def __init__(self, value: Unit | float, _raw_base_value=None):
+    def __init__(self, value: Unit | float):
         """Create a unit from another unit or a raw number."""
-        if _raw_base_value is not None:
-            # Short-circuiting constructor for internal use
-            self.base_value = _raw_base_value
+        base_value = getattr(value, "base_value", None)
+        if base_value is not None:
+            self.base_value = base_value
             self._display_value = None
         else:
-            base_value = getattr(value, "base_value", None)
-            if base_value is not None:
-                self.base_value = base_value
-                self._display_value = None
-            else:
-                self.base_value = value * self.CONVERSION_RATE
-                self._display_value = value
+            self.base_value = value * self.CONVERSION_RATE
+            self._display_value = value
+
+    @classmethod
+    def _from_base_value(cls: Type[TUnit], base_value: float) -> TUnit:
+        """Create a unit directly from a base value, skipping ``__init__``.
+
+        This is the fastest way to make a unit, used by arithmetic operators and
+        layout code which works with raw base values internally.
+        """
+        unit = _new_object(cls)
+        unit.base_value = base_value
+        unit._display_value = None
+        return unit
 
     @property
     def display_value(self) -> float:
@@ -108,37 +117,37 @@ class Unit:
         return self.base_value - other.base_value > Unit._CMP_NEG_EPSILON
 
     def __add__(self: TUnit, other: TUnit) -> TUnit:
-        return type(self)(None, _raw_base_value=self.base_value + other.base_value)
+        return self._from_base_value(self.base_value + other.base_value)
 
     def __sub__(self: TUnit, other: Unit) -> TUnit:
-        return type(self)(None, _raw_base_value=self.base_value - other.base_value)
+        return self._from_base_value(self.base_value - other.base_value)
 
     def __mul__(self: TUnit, other: float) -> TUnit:
         if hasattr(other, "base_value"):
             raise TypeError
-        return type(self)(None, _raw_base_value=self.base_value * other)
+        return self._from_base_value(self.base_value * other)
 
     def __rmul__(self: TUnit, other: float) -> TUnit:
         # __rmul__ behaves identically to __mul__
         if hasattr(other, "base_value"):
             raise TypeError
-        return type(self)(None, _raw_base_value=self.base_value * other)
+        return self._from_base_value(self.base_value * other)
 
     def __truediv__(self: TUnit, other: Union[Unit, float]) -> Union[TUnit, float]:
         if hasattr(other, "base_value"):
             # Unit / Unit -> Float
             return self.base_value / (cast(Unit, other)).base_value
         # Unit / Float -> Unit
-        return type(self)(None, _raw_base_value=self.base_value / other)
+        return self._from_base_value(self.base_value / other)
 
     def __pow__(self: TUnit, other: float, modulo: Optional[int] = None) -> TUnit:
-        return type(self)(Unit(pow(self.base_value, other, modulo)))
+        return self._from_base_value(pow(self.base_value, other, modulo))
 
     def __neg__(self: TUnit) -> TUnit:
-        return type(self)(None, _raw_base_value=-self.base_value)
+        return self._from_base_value(-self.base_value)
 
     def __abs__(self: TUnit) -> TUnit:
-        return type(self)(None, _raw_base_value=abs(self.base_value))
+        return self._from_base_value(abs(self.base_value))
 
 
 class Inch(Unit):
@@ -2,35 +2,52 @@ from __future__ import annotations
 
 import multiprocessing
 import pathlib
+import sys
 import threading
-from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
-
-from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QPoint, QRectF
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Deque, List, Optional, Tuple
+
+from PyQt5.QtCore import (
+    QBuffer,
+    QByteArray,
+    QIODevice,
+    QMarginsF,
+    QPoint,
+    QRect,
+    QRectF,
+    QSizeF,
+    Qt,
+)
 from PyQt5.QtGui import (
-    QBitmap,
     QColor,
     QFontDatabase,
     QImage,
+    QPageSize,
     QPainter,
+    QPdfWriter,
     QPixmapCache,
-    QRegion,
 )
-from PyQt5.QtWidgets import QApplication, QGraphicsScene
+from PyQt5.QtWidgets import QApplication, QGraphicsItem, QGraphicsScene
 
 from neoscore.core import env, math_helpers
 from neoscore.core.color import Color
 from neoscore.core.exceptions import FontRegistrationError, ImageExportError
 from neoscore.core.key_event import KeyEvent
 from neoscore.core.mouse_event import MouseEvent
+from neoscore.core.pdf_writer import PdfPageImage, PdfWriter
+from neoscore.core.pixel_buffer import PixelBuffer
 from neoscore.core.point import Point
 from neoscore.core.propagating_thread import PropagatingThread
 from neoscore.core.rect import Rect, RectDef
 from neoscore.core.units import Inch, Mm
 from neoscore.interface.brush_interface import BrushInterface
-from neoscore.interface.qt import file_paths
+from neoscore.interface.qt import file_paths, svg_writer
 from neoscore.interface.qt.converters import (
     color_to_q_color,
     qt_point_to_point,
+    qt_rect_to_rect,
     rect_to_qt_rect_f,
 )
 from neoscore.interface.qt.main_window import MainWindow
@@ -43,6 +60,7 @@ if TYPE_CHECKING:
 _RENDER_IMAGE_THREAD_MAX = multiprocessing.cpu_count()
 _INCHES_PER_METER: float = Inch(1) / Mm(1000)
 _QT_PIXMAP_CACHE_LIMIT_KB = 200_000
+_VECTOR_PDF_RESOLUTION = 1200
 
 
 class AppInterface:
@@ -76,6 +94,7 @@ class AppInterface:
             _RENDER_IMAGE_THREAD_MAX
         )
         self._viewport_rotation = 0
+        self._scene_rect: Optional[Rect] = None
 
     def set_refresh_func(self, refresh_func: Callable[[float], float]):
         """Set a function to run automatically on a timer in the main window."""
@@ -89,6 +108,14 @@ class AppInterface:
         """Set a function to run on keyboard input events."""
         self.main_window.graphicsView.key_event_handler = handler
 
+    def set_viewport_change_handler(self, handler: Optional[Callable[[], None]]):
+        """Set a function to run after the viewport scrolls, zooms, or resizes.
+
+        The handler is run once control returns to the Qt event loop, so it may
+        safely modify the scene.
+        """
+        self.view.viewport_change_handler = handler
+
     def show(
         self,
         min_size: Optional[Tuple[int, int]] = None,
@@ -122,6 +149,8 @@ class AppInterface:
         bg_color: Color,
         autocrop: bool,
         preserve_alpha: bool,
+        crop_to_items: bool = False,
+        buffer_format: str = "PNG",
     ) -> PropagatingThread:
         """Render the scene, or part of it, to a saved image.
 
@@ -134,7 +163,7 @@ class AppInterface:
             rect: The part of the document to render, in document coordinates.
                 If ``None``, the entire scene will be rendered.
             dest: An output file path or a bytearray to save to. If a bytearray
-                is given, the output format will be PNG.
+                is given, the output format is given by ``buffer_format``.
             dpi: The pixels per inch of the rendered image.
             quality: The quality of the output image for compressed
                 image formats. Must be either ``-1`` (default compression) or
@@ -146,39 +175,21 @@ class AppInterface:
                 ``bg_color``.
             preserve_alpha: Whether to preserve the alpha channel. If false,
                 some non-transparent ``bg_color`` should be provided.
+            crop_to_items: Whether to shrink the rendered region to the bounding
+                rects of the scene items in it before rendering. Unlike
+                ``autocrop``, this doesn't examine any pixels, but the result may be
+                slightly looser since item bounding rects can include padding.
+            buffer_format: The image format used when ``dest`` is a bytearray,
+                given as a file extension like ``"PNG"`` or ``"JPG"``.
 
         Raises:
             ImageExportError: If Qt image export fails for unknown reasons.
 
         """
-        dpm = AppInterface._dpi_to_dpm(dpi)
-        scale = dpm / Mm(1000).base_value
-        if rect:
-            source_rect = rect_to_qt_rect_f(Rect.from_def(rect))
-        else:
-            source_rect = self.scene.sceneRect()
-        pix_width = int(source_rect.width() * scale)
-        pix_height = int(source_rect.height() * scale)
-
-        if preserve_alpha:
-            q_image_format = QImage.Format_ARGB32
-        else:
-            q_image_format = QImage.Format_RGB32
-
-        q_image = QImage(pix_width, pix_height, q_image_format)
-        q_image.setDotsPerMeterX(dpm)
-        q_image.setDotsPerMeterY(dpm)
         q_bg_color = color_to_q_color(bg_color)
-        q_image.fill(q_bg_color)
-
-        painter = QPainter()
-        painter.begin(q_image)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        target_rect = QRectF(q_image.rect())
-
-        self.scene.render(painter, target=target_rect, source=source_rect)
-        painter.end()
+        if crop_to_items:
+            rect = self._items_bounding_rect(rect)
+        q_image = self._rasterize(rect, dpi, q_bg_color, preserve_alpha)
 
         def finalize():
             with self.render_image_thread_semaphore:
@@ -189,7 +200,9 @@ class AppInterface:
                     output_array = QByteArray()
                     qbuf = QBuffer(output_array)
                     qbuf.open(QIODevice.OpenModeFlag.WriteOnly)
-                    success = final_image.save(qbuf, quality=quality, format="PNG")
+                    success = final_image.save(
+                        qbuf, quality=quality, format=buffer_format
+                    )
                     qbuf.close()
                     dest.clear()
                     dest.extend(output_array)
@@ -210,6 +223,186 @@ class AppInterface:
         thread.start()
         return thread
 
+    def render_pixels(
+        self,
+        rect: Optional[RectDef],
+        dpi: int,
+        bg_color: Color,
+        autocrop: bool,
+        preserve_alpha: bool,
+        grayscale: bool,
+    ) -> PixelBuffer:
+        """Render the scene, or part of it, to raw pixels.
+
+        Args:
+            rect: The part of the document to render, in document coordinates.
+                If ``None``, the entire scene will be rendered.
+            dpi: The pixels per inch of the rendered image.
+            bg_color: The background color for the image.
+            autocrop: Whether to crop the image to tightly fit the contents of the
+                frame. This copies the cropped region.
+            preserve_alpha: Whether to preserve the alpha channel. If false, the
+                alpha channel of every pixel is fully opaque.
+            grayscale: Whether to render a single grayscale channel instead of RGBA.
+        """
+        if grayscale:
+            q_image_format = QImage.Format_Grayscale8
+        elif preserve_alpha:
+            q_image_format = QImage.Format_RGBA8888
+        else:
+            q_image_format = QImage.Format_RGBX8888
+        q_bg_color = color_to_q_color(bg_color)
+        q_image = self._rasterize(rect, dpi, q_bg_color, preserve_alpha, q_image_format)
+        if autocrop:
+            q_image = AppInterface._autocrop(q_image, q_bg_color)
+        bits = q_image.constBits()
+        bits.setsize(q_image.sizeInBytes())
+        return PixelBuffer(
+            q_image,
+            memoryview(bits),
+            q_image.width(),
+            q_image.height(),
+            q_image.depth() // 8,
+            q_image.bytesPerLine(),
+        )
+
+    def render_pdf(
+        self,
+        rects: List[RectDef],
+        dest: str | pathlib.Path,
+        dpi: int,
+        bg_color: Color,
+        max_in_flight_pages: int,
+    ):
+        """Render parts of the scene as rasterized pages to a PDF file.
+
+        Each rect is rasterized on the main thread, then encoded on a worker thread
+        and appended to the file as soon as all earlier pages are written. No more
+        than ``max_in_flight_pages`` page images exist at any time.
+
+        Args:
+            rects: The parts of the document to render, in document coordinates,
+                one per page.
+            dest: The output file path.
+            dpi: The pixels per inch of the rendered pages.
+            bg_color: The background color for the pages.
+            max_in_flight_pages: The maximum number of page images, rasterized or
+                being encoded, held in memory at once.
+        """
+        q_bg_color = color_to_q_color(bg_color)
+        with open(file_paths.resolve_qt_path(dest), "wb") as f, ThreadPoolExecutor(
+            max_in_flight_pages
+        ) as executor:
+            writer = PdfWriter(f)
+            pending: Deque[Tuple[Future, Rect]] = deque()
+            for rect_def in rects:
+                if len(pending) >= max_in_flight_pages:
+                    AppInterface._write_pdf_page(writer, *pending.popleft())
+                rect = Rect.from_def(rect_def)
+                q_image = self._rasterize(rect, dpi, q_bg_color, False)
+                future = executor.submit(AppInterface._encode_pdf_page, q_image)
+                pending.append((future, rect))
+            while pending:
+                AppInterface._write_pdf_page(writer, *pending.popleft())
+            writer.close()
+
+    def render_pdf_page(self, rect: RectDef, dpi: int, bg_color: Color) -> PdfPageImage:
+        """Rasterize and encode part of the scene as a PDF page image.
+
+        This runs entirely on the calling thread and avoids Qt calls backed by Qt's
+        global thread pool (like image format conversion), so it is safe to call in
+        processes forked from a running application, in which copies of any worker
+        threads do not exist.
+
+        Args:
+            rect: The part of the document to render, in document coordinates.
+            dpi: The pixels per inch of the rendered page.
+            bg_color: The background color for the page.
+        """
+        return AppInterface._encode_pdf_page(
+            self._rasterize(rect, dpi, color_to_q_color(bg_color), False)
+        )
+
+    def render_vector_pdf(self, rects: List[RectDef], dest: str | pathlib.Path):
+        """Render parts of the scene as vector graphics to a PDF file.
+
+        Each rect is drawn on its own PDF page whose size matches the rect. Paths
+        are written as vector outlines and rich text is written as real text with
+        embedded font subsets.
+
+        Args:
+            rects: The parts of the document to render, in document coordinates,
+                one per page.
+            dest: The output file path.
+
+        Raises:
+            ImageExportError: If Qt fails to write the PDF for unknown reasons.
+        """
+        writer = QPdfWriter(file_paths.resolve_qt_path(dest))
+        writer.setResolution(_VECTOR_PDF_RESOLUTION)
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0))
+        # Cached items are painted as pixmaps, so disable caching while exporting.
+        items = self.scene.items()
+        cache_modes = [item.cacheMode() for item in items]
+        for item in items:
+            item.setCacheMode(QGraphicsItem.CacheMode.NoCache)
+        painter = QPainter()
+        try:
+            for i, rect_def in enumerate(rects):
+                source_rect = rect_to_qt_rect_f(Rect.from_def(rect_def))
+                # Page sizes apply to the page started by the next `begin`/`newPage`
+                writer.setPageSize(
+                    QPageSize(
+                        QSizeF(source_rect.width(), source_rect.height()),
+                        QPageSize.Unit.Point,
+                    )
+                )
+                if i == 0:
+                    if not painter.begin(writer):
+                        raise ImageExportError(
+                            f"Unknown error occurred when exporting PDF to {dest}"
+                        )
+                    painter.setRenderHint(QPainter.Antialiasing)
+                else:
+                    writer.newPage()
+                target_rect = QRectF(0, 0, writer.width(), writer.height())
+                self.scene.render(painter, target=target_rect, source=source_rect)
+        finally:
+            if painter.isActive():
+                painter.end()
+            for item, cache_mode in zip(items, cache_modes):
+                item.setCacheMode(cache_mode)
+
+    def render_svg(
+        self,
+        rect: Optional[RectDef],
+        dest: str | pathlib.Path | bytearray,
+        bg_color: Color,
+    ):
+        """Render part of the scene as vector graphics to an SVG file.
+
+        Repeated path shapes, like glyphs drawn many times, are defined once and
+        reused. See :obj:`.svg_writer.scene_to_svg`.
+
+        Args:
+            rect: The part of the document to render, in document coordinates.
+                If ``None``, the entire scene will be rendered.
+            dest: An output file path or a bytearray to save to.
+            bg_color: The background color for the image.
+        """
+        if rect:
+            source_rect = rect_to_qt_rect_f(Rect.from_def(rect))
+        else:
+            source_rect = self.scene.sceneRect()
+        svg = svg_writer.scene_to_svg(
+            self.scene, source_rect, color_to_q_color(bg_color)
+        ).encode("utf-8")
+        if isinstance(dest, bytearray):
+            dest.extend(svg)
+        else:
+            with open(file_paths.resolve_qt_path(dest), "wb") as f:
+                f.write(svg)
+
     def destroy(self):
         """Destroy the window and all global interface-level data."""
         self.app.exit()
@@ -269,6 +462,31 @@ class AppInterface:
     @viewport_center_pos.setter
     def viewport_center_pos(self, value: Point):
         self.view.centerOn(value.x.base_value, value.y.base_value)
+        self.view.notify_viewport_change()
+
+    @property
+    def viewport_rect(self) -> Rect:
+        """The document-space region visible in the interactive viewport.
+
+        If the viewport is rotated, this is the bounding rect of the visible region.
+        """
+        return qt_rect_to_rect(
+            self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        )
+
+    @property
+    def scene_rect(self) -> Optional[Rect]:
+        """The document-space region the interactive viewport can scroll over.
+
+        If ``None`` (the default), this grows automatically to include every item
+        which has been in the scene.
+        """
+        return self._scene_rect
+
+    @scene_rect.setter
+    def scene_rect(self, value: Optional[Rect]):
+        self._scene_rect = value
+        self.scene.setSceneRect(rect_to_qt_rect_f(value) if value else QRectF())
 
     @property
     def viewport_scale(self) -> float:
@@ -290,6 +508,7 @@ class AppInterface:
         self.view.setTransform(
             transform.scale(relative_scale_factor, relative_scale_factor)
         )
+        self.view.notify_viewport_change()
 
     @property
     def viewport_rotation(self) -> float:
@@ -308,6 +527,7 @@ class AppInterface:
             transform = transform.rotate(-self._viewport_rotation)
         self.view.setTransform(transform.rotate(value))
         self._viewport_rotation = value
+        self.view.notify_viewport_change()
 
     def _remove_all_loaded_fonts(self):
         """Remove all fonts registered with ``register_font()``.
@@ -327,6 +547,92 @@ class AppInterface:
         self.view.setViewportUpdateMode(3)  # NoViewportUpdate
         self.scene.setItemIndexMethod(-1)  # NoIndex
 
+    def _items_bounding_rect(self, rect: Optional[RectDef]) -> Optional[Rect]:
+        """Find the bounding rect of the visible scene items in a region.
+
+        The result is clipped to the region. If there are no items in it, the
+        region is returned unchanged.
+        """
+        if rect:
+            source_rect = rect_to_qt_rect_f(Rect.from_def(rect))
+        else:
+            source_rect = self.scene.sceneRect()
+        bounding_rect = QRectF()
+        for item in self.scene.items(source_rect, Qt.IntersectsItemBoundingRect):
+            if item.isVisible() and not item.boundingRect().isEmpty():
+                bounding_rect = bounding_rect.united(item.sceneBoundingRect())
+        if bounding_rect.isNull():
+            return rect
+        return qt_rect_to_rect(bounding_rect.intersected(source_rect))
+
+    def _rasterize(
+        self,
+        rect: Optional[RectDef],
+        dpi: int,
+        q_bg_color: QColor,
+        preserve_alpha: bool,
+        q_image_format: Optional[QImage.Format] = None,
+    ) -> QImage:
+        """Paint the scene, or part of it, to a new image.
+
+        If no ``q_image_format`` is given, ``Format_ARGB32`` is used if
+        ``preserve_alpha`` is set, otherwise ``Format_RGB32``.
+
+        This must be called on the main thread.
+        """
+        dpm = AppInterface._dpi_to_dpm(dpi)
+        scale = dpm / Mm(1000).base_value
+        if rect:
+            source_rect = rect_to_qt_rect_f(Rect.from_def(rect))
+        else:
+            source_rect = self.scene.sceneRect()
+        pix_width = int(source_rect.width() * scale)
+        pix_height = int(source_rect.height() * scale)
+
+        if q_image_format is None:
+            if preserve_alpha:
+                q_image_format = QImage.Format_ARGB32
+            else:
+                q_image_format = QImage.Format_RGB32
+
+        q_image = QImage(pix_width, pix_height, q_image_format)
+        q_image.setDotsPerMeterX(dpm)
+        q_image.setDotsPerMeterY(dpm)
+        q_image.fill(q_bg_color)
+
+        painter = QPainter()
+        painter.begin(q_image)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        target_rect = QRectF(q_image.rect())
+
+        self.scene.render(painter, target=target_rect, source=source_rect)
+        painter.end()
+        return q_image
+
+    @staticmethod
+    def _encode_pdf_page(q_image: QImage) -> PdfPageImage:
+        """Compress an opaque ``Format_RGB32`` image for a :obj:`.PdfWriter`.
+
+        The conversion to packed RGB is done in Python rather than with
+        ``QImage.convertToFormat``, which may use Qt's global thread pool.
+        """
+        # RGB32 pixels are native-endian 0xffRRGGBB words with no row padding
+        raw = q_image.constBits().asstring(q_image.sizeInBytes())
+        if sys.byteorder == "little":
+            red, green, blue = raw[2::4], raw[1::4], raw[0::4]
+        else:
+            red, green, blue = raw[1::4], raw[2::4], raw[3::4]
+        rgb = bytearray(len(red) * 3)
+        rgb[0::3] = red
+        rgb[1::3] = green
+        rgb[2::3] = blue
+        return PdfPageImage(q_image.width(), q_image.height(), zlib.compress(rgb))
+
+    @staticmethod
+    def _write_pdf_page(writer: PdfWriter, future: Future, rect: Rect):
+        writer.add_page(future.result(), rect.width.base_value, rect.height.base_value)
+
     @staticmethod
     def _dpi_to_dpm(dpi: int) -> int:
         """Convert a Dots Per Inch value to Dots Per Meter"""
@@ -336,8 +642,74 @@ class AppInterface:
     def _autocrop(q_image: QImage, q_color: QColor) -> QImage:
         """Automatically crop a qt image around the pixels not of a given color.
 
-        Returns a newly cropped image; the original is left unmodified.
+        Returns a newly cropped image; the original is left unmodified. If every
+        pixel is of the given color, the image is returned uncropped.
+        """
+        crop_rect = AppInterface._content_rect(q_image, q_color)
+        return q_image.copy(crop_rect) if crop_rect else q_image.copy()
+
+    @staticmethod
+    def _content_rect(q_image: QImage, q_color: QColor) -> Optional[QRect]:
+        """Find the bounding rect of the pixels in an image not of a given color.
+
+        Rows and columns are scanned inward from each edge over the raw image data,
+        stopping at the first pixel of another color, so only the image margins are
+        examined. Returns ``None`` if every pixel is of the given color.
         """
-        mask = q_image.createMaskFromColor(q_color.rgb())
-        crop_rect = QRegion(QBitmap.fromImage(mask)).boundingRect()
-        return q_image.copy(crop_rect)
+        # Get the background pixel as stored in this image format
+        bg_image = QImage(1, 1, q_image.format())
+        bg_image.fill(q_color)
+        if q_image.depth() != 32:
+            q_image = q_image.convertToFormat(QImage.Format_ARGB32)
+            bg_image = bg_image.convertToFormat(QImage.Format_ARGB32)
+        bg_pixel = bg_image.constBits().asstring(4)
+        width = q_image.width()
+        height = q_image.height()
+        stride = q_image.bytesPerLine()
+        bits = q_image.constBits()
+        bits.setsize(q_image.sizeInBytes())
+        data = memoryview(bits)
+        blank_row = bg_pixel * width
+
+        def is_blank(y: int, start_x: int, end_x: int) -> bool:
+            row_start = y * stride
+            # Copying to bytes is much faster than comparing memoryviews directly
+            return (
+                bytes(data[row_start + (start_x * 4) : row_start + (end_x * 4)])
+                == blank_row[: (end_x - start_x) * 4]
+            )
+
+        top = 0
+        while top < height and is_blank(top, 0, width):
+            top += 1
+        if top == height:
+            return None
+        bottom = height - 1
+        while is_blank(bottom, 0, width):
+            bottom -= 1
+        # Content spans columns `left` (inclusive) to `right` (exclusive). Each row
+        # only needs checking against the current margins, which can only shrink.
+        left = width
+        right = 0
+        for y in range(top, bottom + 1):
+            if left and not is_blank(y, 0, left):
+                # Binary search for the first content pixel in `[0, left)`
+                low, high = 0, left
+                while high - low > 1:
+                    mid = (low + high) // 2
+                    if is_blank(y, low, mid):
+                        low = mid
+                    else:
+                        high = mid
+                left = low
+            if right < width and not is_blank(y, right, width):
+                # Binary search for the last content pixel in `[right, width)`
+                low, high = right, width
+                while high - low > 1:
+                    mid = (low + high) // 2
+                    if is_blank(y, mid, high):
+                        high = mid
+                    else:
+                        low = mid
+                right = low + 1
+        return QRect(left, top, right - left, bottom - top + 1)
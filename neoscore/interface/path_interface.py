@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, NamedTuple, Optional, Union
+from typing import ClassVar, FrozenSet, List, NamedTuple, Optional, Union
 
 from PyQt5.QtGui import QPainterPath
 from typing_extensions import TypeAlias
@@ -78,6 +78,10 @@ class PathInterface(PositionedObjectInterface):
     Use ``None`` to render to the end.
     """
 
+    _IN_PLACE_FIELDS: ClassVar[FrozenSet[str]] = frozenset(
+        {"pos", "parent", "brush", "pen"}
+    )
+
     @staticmethod
     def create_qt_path(elements: List[ResolvedPathElement]) -> QPainterPath:
         path = QPainterPath()
@@ -105,6 +109,12 @@ class PathInterface(PositionedObjectInterface):
         """Render the path to the scene."""
         self._register_qt_object(self._create_qt_object())
 
+    def _update_qt_object(self, qt_object: QClippingPath):
+        super()._update_qt_object(qt_object)
+        qt_object.setBrush(self.brush.qt_object)
+        qt_object.setPen(self.pen.qt_object)
+        qt_object.update_geometry()
+
     def _create_qt_object(self) -> QClippingPath:
         painter_path = PathInterface.create_qt_path(self.elements)
         qt_object = QClippingPath(
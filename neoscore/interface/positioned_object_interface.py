@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Optional
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, FrozenSet, Optional
 from warnings import warn
 
 from PyQt5.QtWidgets import QGraphicsItem
 
 from neoscore.core import neoscore
 from neoscore.core.point import Point
+from neoscore.core.rect import Rect
+from neoscore.interface.qt.converters import point_to_qt_point_f, qt_rect_to_rect
 
 
 @dataclass(frozen=True)
@@ -56,6 +58,12 @@ class PositionedObjectInterface:
     This value is set during rendering and is not meant to be set more than once.
     """
 
+    _IN_PLACE_FIELDS: ClassVar[FrozenSet[str]] = frozenset({"pos", "parent"})
+    """Fields which can be changed on an existing Qt object by `_update_qt_object`.
+
+    Interfaces differing only in these fields can share Qt objects across renders.
+    """
+
     def render(self):
         """Render the object to the scene.
 
@@ -65,6 +73,76 @@ class PositionedObjectInterface:
         """
         raise NotImplementedError
 
+    def unrender(self):
+        """Remove this interface's Qt object from the scene, if it is in one.
+
+        Any Qt children of the object are removed along with it.
+        """
+        qt_object = getattr(self, "_qt_object", None)
+        if qt_object is None:
+            return
+        scene = qt_object.scene()
+        if scene is not None:
+            scene.removeItem(qt_object)
+
+    def scene_bounding_rect(self) -> Optional[Rect]:
+        """Find the bounding rect of the rendered object in document coordinates.
+
+        Returns:
+            The rect, or ``None`` if the object is not rendered or draws nothing.
+        """
+        qt_object = getattr(self, "_qt_object", None)
+        if qt_object is None or qt_object.scene() is None:
+            return None
+        qt_rect = qt_object.sceneBoundingRect()
+        # Rects of straight lines can have no width or height, but are still drawn
+        if qt_rect.isNull():
+            return None
+        return qt_rect_to_rect(qt_rect)
+
+    def render_reusing(self, previous: Optional[PositionedObjectInterface]) -> bool:
+        """Render the object, taking over ``previous``'s Qt object where possible.
+
+        If ``previous`` is a rendered interface of the same type which differs from
+        this one only in fields that can be updated in place, its Qt object is
+        updated, moved to this interface's parent if needed, and adopted by this
+        interface. Otherwise this falls back to a normal :obj:`render`.
+
+        Returns:
+            Whether ``previous``'s Qt object was reused. If not, ``previous`` is left
+            untouched and the caller is responsible for unrendering it.
+        """
+        qt_object = getattr(previous, "_qt_object", None)
+        if (
+            qt_object is None
+            or qt_object.scene() is None
+            or not self._can_reuse(previous)
+        ):
+            self.render()
+            return False
+        self._update_qt_object(qt_object)
+        parent_obj = self._parent_qt_obj()
+        if qt_object.parentItem() is not parent_obj:
+            qt_object.setParentItem(parent_obj)
+        super().__setattr__("_qt_object", qt_object)
+        return True
+
+    def _can_reuse(self, previous: Optional[PositionedObjectInterface]) -> bool:
+        if type(previous) is not type(self):
+            return False
+        return all(
+            getattr(self, f.name) == getattr(previous, f.name)
+            for f in fields(self)
+            if f.compare and f.name not in self._IN_PLACE_FIELDS
+        )
+
+    def _update_qt_object(self, qt_object: QGraphicsItem):
+        """Apply this interface's in-place fields to an existing Qt object.
+
+        Subclasses extending ``_IN_PLACE_FIELDS`` must extend this accordingly.
+        """
+        qt_object.setPos(point_to_qt_point_f(self.pos))
+
     def _parent_qt_obj(self) -> Optional[QGraphicsItem]:
         if self.parent:
             parent_qt_obj = getattr(self.parent, "_qt_object", None)
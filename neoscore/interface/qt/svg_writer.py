@@ -0,0 +1,252 @@
+from typing import Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QBuffer, QIODevice, QRectF, Qt
+from PyQt5.QtGui import QBrush, QColor, QPainter, QPainterPath, QPen, QTransform
+from PyQt5.QtSvg import QSvgGenerator
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsScene, QStyleOptionGraphicsItem
+
+from neoscore.interface.qt.q_clipping_path import QClippingPath
+
+_CAP_STYLES = {
+    Qt.PenCapStyle.FlatCap: "butt",
+    Qt.PenCapStyle.SquareCap: "square",
+    Qt.PenCapStyle.RoundCap: "round",
+}
+
+_JOIN_STYLES = {
+    Qt.PenJoinStyle.BevelJoin: "bevel",
+    Qt.PenJoinStyle.RoundJoin: "round",
+}
+
+
+def scene_to_svg(
+    scene: QGraphicsScene, source_rect: QRectF, bg_color: Optional[QColor]
+) -> str:
+    """Write the part of a scene inside ``source_rect`` as an SVG document.
+
+    Path items, including all text glyphs, are written as SVG paths. Each distinct
+    path shape is defined once in ``<defs>`` and drawn with ``<use>`` elements, so
+    repeated glyphs like noteheads cost one small element each. Shapes are plain
+    ``<path>`` definitions rather than ``<symbol>`` elements, since ``<symbol>`` is
+    not supported by SVG Tiny renderers like Qt's. Other items are painted through
+    ``QSvgGenerator``.
+
+    Scene units are written as SVG user units, with one unit per point.
+
+    Args:
+        scene: The scene to export.
+        source_rect: The exported region in scene coordinates.
+        bg_color: A color to fill the background with, if any.
+    """
+    writer = _SvgWriter()
+    items = scene.items(
+        source_rect, Qt.IntersectsItemBoundingRect, Qt.SortOrder.AscendingOrder
+    )
+    for item in items:
+        if item.isVisible() and not item.boundingRect().isEmpty():
+            writer.add_item(item)
+    return writer.document(source_rect, bg_color)
+
+
+class _SvgWriter:
+    def __init__(self):
+        self._defs: List[str] = []
+        self._body: List[str] = []
+        self._shape_ids: Dict[Tuple[str, str], str] = {}
+        self._clip_ids: Dict[str, str] = {}
+
+    def add_item(self, item: QGraphicsItem):
+        if isinstance(item, QClippingPath):
+            self._add_clipping_path(item)
+        else:
+            self._add_painted_item(item)
+
+    def document(self, source_rect: QRectF, bg_color: Optional[QColor]) -> str:
+        view_box = _rect_attrs(source_rect)
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n',
+            '<svg xmlns="http://www.w3.org/2000/svg"'
+            ' xmlns:xlink="http://www.w3.org/1999/xlink"',
+            f' width="{_num(source_rect.width())}pt"'
+            f' height="{_num(source_rect.height())}pt"',
+            ' viewBox="{x} {y} {width} {height}">\n'.format(**view_box),
+        ]
+        if self._defs:
+            parts.append("<defs>\n")
+            parts.extend(self._defs)
+            parts.append("</defs>\n")
+        if bg_color is not None and bg_color.alpha():
+            parts.append(
+                '<rect x="{x}" y="{y}" width="{width}" height="{height}"'.format(
+                    **view_box
+                )
+                + _fill_attrs(QBrush(bg_color))
+                + "/>\n"
+            )
+        parts.extend(self._body)
+        parts.append("</svg>\n")
+        return "".join(parts)
+
+    def _add_clipping_path(self, item: QClippingPath):
+        shape_id = self._shape_id(item.path())
+        paint_attrs = _fill_attrs(item.brush()) + _stroke_attrs(item.pen())
+        transform = _transform_attr(item.sceneTransform())
+        clipped = item.clip_start_x != 0 or item.clip_width is not None
+        if not clipped and not item.background_brush:
+            self._body.append(
+                f'<use xlink:href="#{shape_id}"{transform}{paint_attrs}/>\n'
+            )
+            return
+        clip_attr = ""
+        if clipped:
+            clip_attr = f' clip-path="url(#{self._clip_id(item.bounding_rect)})"'
+        self._body.append(f"<g{transform}{clip_attr}>\n")
+        if item.background_brush:
+            self._body.append(
+                '<rect x="{x}" y="{y}" width="{width}" height="{height}"'.format(
+                    **_rect_attrs(item.bounding_rect)
+                )
+                + _fill_attrs(item.background_brush)
+                + "/>\n"
+            )
+        shift = ""
+        if item.clip_start_x != 0:
+            shift = f' transform="translate({_num(-item.clip_start_x)} 0)"'
+        self._body.append(f'<use xlink:href="#{shape_id}"{shift}{paint_attrs}/>\n')
+        self._body.append("</g>\n")
+
+    def _add_painted_item(self, item: QGraphicsItem):
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        generator = QSvgGenerator()
+        generator.setOutputDevice(buffer)
+        painter = QPainter(generator)
+        painter.setTransform(item.sceneTransform())
+        item.paint(painter, QStyleOptionGraphicsItem(), None)
+        painter.end()
+        svg = bytes(buffer.data()).decode("utf-8")
+        body_start = svg.index(">", svg.index("<svg")) + 1
+        body = svg[body_start : svg.rindex("</svg>")]
+        for tag in ("title", "desc"):
+            start = body.find(f"<{tag}>")
+            if start != -1:
+                end = body.index(f"</{tag}>", start) + len(tag) + 3
+                body = body[:start] + body[end:]
+        self._body.append(f"<g>{body.strip()}</g>\n")
+
+    def _shape_id(self, path: QPainterPath) -> str:
+        fill_rule = "nonzero" if path.fillRule() == Qt.FillRule.WindingFill else ""
+        key = (_path_data(path), fill_rule)
+        shape_id = self._shape_ids.get(key)
+        if shape_id is None:
+            shape_id = f"p{len(self._shape_ids)}"
+            self._shape_ids[key] = shape_id
+            rule_attr = ' fill-rule="evenodd"' if not fill_rule else ""
+            self._defs.append(f'<path id="{shape_id}" d="{key[0]}"{rule_attr}/>\n')
+        return shape_id
+
+    def _clip_id(self, rect: QRectF) -> str:
+        rect_element = (
+            '<rect x="{x}" y="{y}" width="{width}" height="{height}"/>'.format(
+                **_rect_attrs(rect)
+            )
+        )
+        clip_id = self._clip_ids.get(rect_element)
+        if clip_id is None:
+            clip_id = f"c{len(self._clip_ids)}"
+            self._clip_ids[rect_element] = clip_id
+            self._defs.append(f'<clipPath id="{clip_id}">{rect_element}</clipPath>\n')
+        return clip_id
+
+
+def _num(value: float) -> str:
+    """Format a number compactly, with at most 3 decimal places."""
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _rect_attrs(rect: QRectF) -> Dict[str, str]:
+    return {
+        "x": _num(rect.x()),
+        "y": _num(rect.y()),
+        "width": _num(rect.width()),
+        "height": _num(rect.height()),
+    }
+
+
+def _path_data(path: QPainterPath) -> str:
+    commands = []
+    i = 0
+    count = path.elementCount()
+    while i < count:
+        element = path.elementAt(i)
+        if element.isMoveTo():
+            commands.append(f"M{_num(element.x)} {_num(element.y)}")
+            i += 1
+        elif element.isLineTo():
+            commands.append(f"L{_num(element.x)} {_num(element.y)}")
+            i += 1
+        else:
+            # Curve elements are followed by 2 data elements
+            c2 = path.elementAt(i + 1)
+            end = path.elementAt(i + 2)
+            commands.append(
+                f"C{_num(element.x)} {_num(element.y)} {_num(c2.x)} {_num(c2.y)}"
+                f" {_num(end.x)} {_num(end.y)}"
+            )
+            i += 3
+    return "".join(commands)
+
+
+def _transform_attr(transform: QTransform) -> str:
+    if transform.isIdentity():
+        return ""
+    if transform.type() == QTransform.TransformationType.TxTranslate:
+        return f' transform="translate({_num(transform.dx())} {_num(transform.dy())})"'
+    values = " ".join(
+        _num(value)
+        for value in (
+            transform.m11(),
+            transform.m12(),
+            transform.m21(),
+            transform.m22(),
+            transform.dx(),
+            transform.dy(),
+        )
+    )
+    return f' transform="matrix({values})"'
+
+
+def _color_attrs(name: str, color: QColor) -> str:
+    attrs = f' {name}="{color.name()}"'
+    if color.alpha() != 255:
+        attrs += f' {name}-opacity="{_num(color.alphaF())}"'
+    return attrs
+
+
+def _fill_attrs(brush: QBrush) -> str:
+    if brush.style() == Qt.BrushStyle.NoBrush:
+        return ' fill="none"'
+    return _color_attrs("fill", brush.color())
+
+
+def _stroke_attrs(pen: QPen) -> str:
+    if pen.style() == Qt.PenStyle.NoPen:
+        return ""
+    attrs = _color_attrs("stroke", pen.color())
+    width = pen.widthF()
+    if width == 0:
+        # Cosmetic pens are always one device pixel wide
+        width = 1
+        attrs += ' vector-effect="non-scaling-stroke"'
+    attrs += f' stroke-width="{_num(width)}"'
+    cap = _CAP_STYLES.get(pen.capStyle(), "butt")
+    if cap != "butt":
+        attrs += f' stroke-linecap="{cap}"'
+    join = _JOIN_STYLES.get(pen.joinStyle())
+    if join:
+        attrs += f' stroke-linejoin="{join}"'
+    if pen.style() != Qt.PenStyle.SolidLine:
+        dashes = " ".join(_num(dash * width) for dash in pen.dashPattern())
+        attrs += f' stroke-dasharray="{dashes}"'
+    return attrs
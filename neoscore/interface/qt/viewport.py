@@ -1,4 +1,4 @@
-from PyQt5 import QtGui, QtWidgets
+from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import QPointF
 
 from neoscore.core.key_event import KeyEventType
@@ -34,6 +34,8 @@ class Viewport(QtWidgets.QGraphicsView):
         self.setViewportUpdateMode(_NO_VIEWPORT_UPDATE)  # noqa
         self.mouse_event_handler = None
         self.key_event_handler = None
+        self.viewport_change_handler = None
+        self._viewport_change_pending = False
 
     def set_auto_interaction(self, enabled: bool):
         """Set whether mouse and scrollbar interaction is enabled."""
@@ -67,11 +69,33 @@ class Viewport(QtWidgets.QGraphicsView):
         # Move scene to old position
         delta = new_pos - old_pos
         self.translate(delta.x(), delta.y())
+        self.notify_viewport_change()
 
     def scrollContentsBy(self, *args):
         """Override of superclass scroll action to trigger a viewport update."""
         super().scrollContentsBy(*args)
         self.viewport().update()
+        self.notify_viewport_change()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.notify_viewport_change()
+
+    def notify_viewport_change(self):
+        """Run the viewport change handler, if any, once control returns to Qt.
+
+        Changes made in quick succession, like scroll steps, are handled together.
+        Deferring the handler also lets it safely modify the scene, which may in turn
+        move the viewport.
+        """
+        if self.viewport_change_handler and not self._viewport_change_pending:
+            self._viewport_change_pending = True
+            QtCore.QTimer.singleShot(0, self._run_viewport_change_handler)
+
+    def _run_viewport_change_handler(self):
+        self._viewport_change_pending = False
+        if self.viewport_change_handler:
+            self.viewport_change_handler()
 
     def window_document_pos(self) -> QPointF:
         return self.mapToScene(0, 0)
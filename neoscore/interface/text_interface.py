@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, NamedTuple, Optional
+from typing import ClassVar, Dict, FrozenSet, NamedTuple, Optional
 
 from PyQt5.QtGui import QFont, QPainterPath
 
@@ -68,10 +68,20 @@ class TextInterface(PositionedObjectInterface):
     Use ``None`` to render to the end.
     """
 
+    _IN_PLACE_FIELDS: ClassVar[FrozenSet[str]] = frozenset(
+        {"pos", "parent", "brush", "pen"}
+    )
+
     def render(self):
         """Render the line to the scene."""
         self._register_qt_object(self._create_qt_object())
 
+    def _update_qt_object(self, qt_object: QClippingPath):
+        super()._update_qt_object(qt_object)
+        qt_object.setBrush(self.brush.qt_object)
+        qt_object.setPen(self.pen.qt_object)
+        qt_object.update_geometry()
+
     def _create_qt_object(self) -> QClippingPath:
         """Create and return this interface's underlying Qt object"""
         qt_object = self._get_path(self.text, self.font, self.scale)
@@ -2,15 +2,20 @@ from __future__ import annotations
 
 from typing import Any, List, Optional, Tuple
 
+from neoscore.core.brush import Brush
 from neoscore.core.has_music_font import HasMusicFont
 from neoscore.core.layout_controllers import NewLine
 from neoscore.core.music_font import MusicFont
 from neoscore.core.painted_object import PaintedObject
-from neoscore.core.path import Path
 from neoscore.core.pen import PenDef
 from neoscore.core.point import Point, PointDef
 from neoscore.core.positioned_object import PositionedObject
 from neoscore.core.units import ZERO, Unit
+from neoscore.interface.path_interface import (
+    ResolvedLineTo,
+    ResolvedMoveTo,
+    ResolvedPathElement,
+)
 from neoscore.western.staff_fringe_layout import StaffFringeLayout
 from neoscore.western.staff_group import StaffGroup
 
@@ -133,16 +138,19 @@ class AbstractStaff(PaintedObject, HasMusicFont):
                 slice_length = self.breakable_length - clip_start_x
         else:
             slice_length = clip_width
-        inside_flowable = bool(flowable_line)
-        if inside_flowable:
+        if flowable_line:
             segment_pos = Point(pos.x + fringe_layout.staff, pos.y)
+            parent = None
         else:
             segment_pos = Point(fringe_layout.staff, ZERO)
-        path = self._create_staff_segment_path(
-            segment_pos, slice_length - fringe_layout.staff, inside_flowable
+            parent = self.interface_for_children
+        self._draw_path(
+            segment_pos,
+            parent,
+            self._staff_segment_path_elements(slice_length - fringe_layout.staff),
+            self.pen,
+            Brush(),
         )
-        path.render()
-        path.remove()
 
     def render_complete(
         self,
@@ -168,17 +176,14 @@ class AbstractStaff(PaintedObject, HasMusicFont):
     def render_after_break(self, pos: Point, flowable_line: NewLine, object_x: Unit):
         self._render_slice(pos, object_x, None, flowable_line)
 
-    def _create_staff_segment_path(
-        self, pos: Point, length: Unit, inside_flowable: bool
-    ) -> Path:
-        parent = None if inside_flowable else self
-        path = Path(pos, parent, pen=self.pen)
+    def _staff_segment_path_elements(self, length: Unit) -> List[ResolvedPathElement]:
+        elements: List[ResolvedPathElement] = []
         line_y = ZERO
         for i in range(self.line_count):
-            path.move_to(ZERO, line_y)
-            path.line_to(length, line_y)
+            elements.append(ResolvedMoveTo(ZERO, line_y))
+            elements.append(ResolvedLineTo(length, line_y))
             line_y += self.line_spacing
-        return path
+        return elements
 
     def register_layout_controllers(self):
         """Register any flowable margin controllers needed by the staff.
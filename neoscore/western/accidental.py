@@ -13,6 +13,8 @@ class Accidental(MusicText):
 
     """A visual accidental."""
 
+    __slots__ = ("_accidental_type",)
+
     def __init__(
         self,
         pos: PointDef,
@@ -134,6 +134,7 @@ class Chordrest(PositionedObject, StaffObject):
     def notes(self, value: Optional[List[Union[PitchDef, PitchAndGlyph]]]):
         self._notes = [] if value is None else value
         self._rebuild()
+        self.mark_dirty()
 
     @property
     def noteheads(self) -> List[Notehead]:
@@ -152,6 +153,7 @@ class Chordrest(PositionedObject, StaffObject):
     def rest_y(self, value: Optional[Unit]):
         self._rest_y = value
         self._rebuild()
+        self.mark_dirty()
 
     @property
     def rest(self) -> Optional[Rest]:
@@ -213,6 +215,7 @@ class Chordrest(PositionedObject, StaffObject):
     def table(self, table: NoteheadTable):
         self._table = table
         self._rebuild()
+        self.mark_dirty()
 
     @property
     def duration(self) -> Duration:
@@ -231,6 +234,7 @@ class Chordrest(PositionedObject, StaffObject):
         self._duration = value
         if rebuild_needed:
             self._rebuild()
+        self.mark_dirty()
 
     @cached_property
     def ledger_line_positions(self) -> List[Unit]:
@@ -368,23 +372,28 @@ class Chordrest(PositionedObject, StaffObject):
         """The bounding rect of the notehead column after layout."""
         if self.rest:
             return Rect(ZERO, ZERO, ZERO, ZERO)
-        left_x = Unit(float("inf"))
-        top_y = Unit(float("inf"))
-        right_x = Unit(float("-inf"))
-        bottom_y = Unit(float("-inf"))
+        # Work with base values, only making units for the result
+        left_x = float("inf")
+        top_y = float("inf")
+        right_x = float("-inf")
+        bottom_y = float("-inf")
         for n in self.noteheads:
-            n_rect = n.bounding_rect.offset(n.pos)
-            if left_x > n_rect.x:
-                left_x = n_rect.x
-            if top_y > n_rect.y:
-                top_y = n_rect.y
-            n_rect_right_x = n_rect.x + n_rect.width
+            n_rect = n.bounding_rect
+            n_rect_x = n_rect.x.base_value + n.x.base_value
+            n_rect_y = n_rect.y.base_value + n.y.base_value
+            if left_x > n_rect_x:
+                left_x = n_rect_x
+            if top_y > n_rect_y:
+                top_y = n_rect_y
+            n_rect_right_x = n_rect_x + n_rect.width.base_value
             if right_x < n_rect_right_x:
                 right_x = n_rect_right_x
-            n_rect_bottom_y = n_rect.y + n_rect.height
+            n_rect_bottom_y = n_rect_y + n_rect.height.base_value
             if bottom_y < n_rect_bottom_y:
                 bottom_y = n_rect_bottom_y
-        return Rect(left_x, top_y, right_x - left_x, bottom_y - top_y)
+        return Rect(
+            Unit(left_x), Unit(top_y), Unit(right_x - left_x), Unit(bottom_y - top_y)
+        )
 
     @cached_property
     def noteheads_outside_staff(self) -> List[Notehead]:
@@ -455,6 +464,7 @@ class Chordrest(PositionedObject, StaffObject):
     def stem_direction(self, value: Optional[DirectionY]):
         self._stem_direction_override = value
         self._rebuild()
+        self.mark_dirty()
 
     @cached_property
     def stem_height(self) -> Unit:
@@ -610,22 +620,24 @@ class Chordrest(PositionedObject, StaffObject):
         # Start last staff pos at sentinel infinity position.
         # Rather than working with staff positions, we can work with
         # ``Notehead.y`` values directly because we know they all share
-        # ``self`` as a parent.
-        prev_y = Unit(float("inf"))
+        # ``self`` as a parent, comparing their base values.
+        prev_y = float("inf")
+        collision_distance = self.staff.unit(1).base_value
         # Start prev_side at wrong side so first note goes on the default side
         prev_side = default_side.flip()
         for note in sorted(
             self.noteheads,
-            key=lambda n: n.y,
+            key=lambda n: n.y.base_value,
             reverse=(self.stem_direction == DirectionY.UP),
         ):
-            if abs(prev_y - note.y) < self.staff.unit(1):
+            note_y = note.y.base_value
+            if abs(prev_y - note_y) - collision_distance < Unit._CMP_NEG_EPSILON:
                 # This note collides with previous, switch sides
                 prev_side = prev_side.flip()
             else:
                 prev_side = default_side
             note.x = self._resolve_notehead_x_pos(note, prev_side)
-            prev_y = note.y
+            prev_y = note_y
 
     def _resolve_notehead_x_pos(
         self, notehead: Notehead, stem_side: DirectionX
@@ -16,6 +16,8 @@ class Flag(MusicText):
 
     """A simple flag glyph determined by a duration and direction"""
 
+    __slots__ = ("_duration", "_direction")
+
     _up_glyphnames = {
         8: "flag1024thUp",
         7: "flag512thUp",
@@ -77,6 +79,7 @@ class Flag(MusicText):
         if value.display is None:
             raise ValueError(f"{value} cannot be represented as a single note")
         self._duration = value
+        self.mark_dirty()
 
     @property
     def direction(self) -> DirectionY:
@@ -85,6 +88,7 @@ class Flag(MusicText):
     @direction.setter
     def direction(self, value: DirectionY):
         self._direction = value
+        self.mark_dirty()
 
     @classmethod
     def vertical_offset_needed(cls, duration: Duration) -> int:
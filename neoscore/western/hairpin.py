@@ -68,6 +68,7 @@ class Hairpin(Spanner2D, MusicPath):
     @direction.setter
     def direction(self, value: DirectionX):
         self._direction = value
+        self.mark_dirty()
 
     def _find_hairpin_points(
         self,
@@ -138,6 +139,10 @@ class Hairpin(Spanner2D, MusicPath):
             end_center_parent,
         )
 
+    def pre_render_hook(self):
+        super().pre_render_hook()
+        self._update_path()
+
     def _draw_path(self):
         (
             first_pos,
@@ -150,3 +155,17 @@ class Hairpin(Spanner2D, MusicPath):
         self.move_to(first_pos.x, first_pos.y, first_parent)
         self.line_to(mid_pos.x, mid_pos.y, mid_parent)
         self.line_to(last_pos.x, last_pos.y, last_parent)
+
+    def _update_path(self):
+        """Move the existing path elements to match the current hairpin geometry.
+
+        This keeps the path in sync with changes to the endpoint, direction, and
+        width made after construction.
+        """
+        points = self._find_hairpin_points()
+        for i, element in enumerate(self.elements):
+            pos = points[i * 2]
+            parent = points[(i * 2) + 1]
+            if element.parent is not parent:
+                element.parent = parent
+            element.pos = pos
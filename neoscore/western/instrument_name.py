@@ -7,7 +7,6 @@ from neoscore.core.layout_controllers import MarginController, NewLine
 from neoscore.core.painted_object import PaintedObject
 from neoscore.core.pen import PenDef
 from neoscore.core.point import ORIGIN, Point, PointDef
-from neoscore.core.text import Text
 from neoscore.core.text_alignment import AlignmentX, AlignmentY
 from neoscore.core.units import Unit
 from neoscore.western.abstract_staff import AbstractStaff
@@ -67,6 +66,7 @@ class InstrumentName(PaintedObject, StaffObject):
     @relative_fringe_pos.setter
     def relative_fringe_pos(self, value: PointDef):
         self._relative_fringe_pos = Point.from_def(value)
+        self.mark_dirty()
 
     @property
     def font(self) -> Font:
@@ -76,6 +76,7 @@ class InstrumentName(PaintedObject, StaffObject):
     @font.setter
     def font(self, value: Font):
         self._font = value
+        self.mark_dirty()
 
     @property
     def first_line_text(self) -> str:
@@ -85,6 +86,7 @@ class InstrumentName(PaintedObject, StaffObject):
     @first_line_text.setter
     def first_line_text(self, value: str):
         self._first_line_text = value
+        self.mark_dirty()
 
     @property
     def later_lines_text(self) -> Optional[str]:
@@ -98,6 +100,7 @@ class InstrumentName(PaintedObject, StaffObject):
     @later_lines_text.setter
     def later_lines_text(self, value: Optional[str]):
         self._later_lines_text = value
+        self.mark_dirty()
 
     @property
     def _resolved_later_lines_text(self) -> str:
@@ -139,18 +142,16 @@ class InstrumentName(PaintedObject, StaffObject):
         if text == "":
             # Skip rendering blank strings
             return
-        line_text = Text(
+        self._draw_text(
             pos,
-            None,
+            None if flowable_line else self.parent.interface_for_children,
             text,
             self.font,
-            self.brush,
             self.pen,
+            self.brush,
             alignment_x=AlignmentX.RIGHT,
             alignment_y=AlignmentY.CENTER,
         )
-        line_text.render()
-        line_text.remove()
 
     def render_complete(
         self,
@@ -1,7 +1,9 @@
 from typing import Optional, Union
 
+from neoscore.core.brush import Brush
 from neoscore.core.layout_controllers import NewLine
-from neoscore.core.music_text import MusicText
+from neoscore.core.music_char import MusicChar
+from neoscore.core.pen import Pen
 from neoscore.core.point import Point
 from neoscore.core.positioned_object import PositionedObject, render_cached_property
 from neoscore.core.units import ZERO, Unit
@@ -89,6 +91,10 @@ class KeySignature(PositionedObject, StaffObject):
         if for_line_start:
             base_x += fringe_layout.key_signature
         clef = self.staff.active_clef_at(fringe_layout.pos_x_in_staff)
+        parent = None if inside_flowable else self.parent.interface_for_children
+        font = self.staff.music_font
+        pen = Pen.no_pen()
+        brush = Brush()
         for letter, accidental_type in self.key_signature_type.value.items():
             if accidental_type is None:
                 continue
@@ -100,12 +106,8 @@ class KeySignature(PositionedObject, StaffObject):
                 base_x + self.staff.unit(pos_tuple[0]),
                 base_y + self.staff.unit(pos_tuple[1]),
             )
-            parent = None if inside_flowable else self
-            accidental = MusicText(
-                acc_pos, parent, accidental_type.value, self.staff.music_font
-            )
-            accidental.render()
-            accidental.remove()
+            text = MusicChar(font, accidental_type.value).codepoint
+            self._draw_text(acc_pos, parent, text, font, pen, brush)
 
     def render_complete(
         self,
@@ -14,6 +14,8 @@ class LedgerLine(Path, HasMusicFont):
     but can be manually instantiated as well.
     """
 
+    __slots__ = ()
+
     def __init__(self, pos: PointDef, parent: PositionedObject, base_length: Unit):
         """
         Args:
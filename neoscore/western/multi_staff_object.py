@@ -33,6 +33,7 @@ class MultiStaffObject:
     @staves.setter
     def staves(self, value: List[AbstractStaff]):
         self._staves = value
+        self.mark_dirty()
 
     @property
     def highest(self) -> AbstractStaff:
@@ -18,6 +18,8 @@ class Notehead(MusicText, StaffObject):
 
     """A simple notehead automatically selected and vertically positioned."""
 
+    __slots__ = ("_staff", "_pitch", "_duration", "_table", "_glyph_override")
+
     def __init__(
         self,
         pos_x: Unit,
@@ -65,3 +65,4 @@ class Rest(MusicText):
         if value.display is None:
             raise ValueError(f"{value} cannot be represented as a single note")
         self._duration = value
+        self.mark_dirty()
@@ -12,6 +12,8 @@ class RhythmDot(MusicText):
 
     """A single rhythmic augmentation dot used in notes and rests"""
 
+    __slots__ = ()
+
     _glyph_name = "augmentationDot"
 
     def __init__(
@@ -18,6 +18,8 @@ class StaffObject:
     This is a mixin class for :obj:`.PositionedObject` classes.
     """
 
+    __slots__ = ()
+
     def __init__(self, parent: PositionedObject):
         staff = StaffObject._find_staff(cast(PositionedObject, parent))
         if not staff:
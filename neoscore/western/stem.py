@@ -16,6 +16,8 @@ class Stem(MusicPath):
 
     """A vertical note or chord stem path."""
 
+    __slots__ = ("_direction", "_height")
+
     def __init__(
         self,
         start: PointDef,
@@ -1,12 +1,32 @@
+import os
+import re
+import tempfile
+import unittest
+
+from PyQt5.QtGui import QImage
+
 from neoscore.core import neoscore
 from neoscore.core.brush import Brush
 from neoscore.core.color import Color
+from neoscore.core.exceptions import InvalidImageFormatError
+from neoscore.core.flowable import Flowable
 from neoscore.core.path import Path
 from neoscore.core.pen import Pen
-from neoscore.core.point import ORIGIN
+from neoscore.core.point import ORIGIN, Point
+from neoscore.core.positioned_object import PositionedObject
+from neoscore.core.rect import Rect
 from neoscore.core.text import Text
+from neoscore.core.units import ZERO, Mm
+from neoscore.western.chordrest import Chordrest
+from neoscore.western.clef import Clef
+from neoscore.western.hairpin import Hairpin
+from neoscore.western.staff import Staff
+
+from ..helpers import AppTest, render_scene
 
-from ..helpers import AppTest
+
+def _rect_center(rect: Rect) -> Point:
+    return Point(rect.x + (rect.width / 2), rect.y + (rect.height / 2))
 
 
 class TestNeoscore(AppTest):
@@ -37,3 +57,461 @@ class TestNeoscore(AppTest):
         neoscore.set_background_brush(new_brush)
         assert neoscore.background_brush == new_brush
         assert neoscore.app_interface.background_brush == new_brush.interface
+
+    def test_incremental_render_only_rebuilds_changed_objects(self):
+        neoscore.set_incremental_render(True)
+        static_text = Text(ORIGIN, None, "static")
+        moving_text = Text(ORIGIN, None, "moving")
+        render_scene()
+        static_qt_object = static_text.interfaces[0]._qt_object
+        old_moving_qt_object = moving_text.interfaces[0]._qt_object
+        moving_text.text = "changed"
+        render_scene()
+        assert static_text.interfaces[0]._qt_object is static_qt_object
+        assert len(moving_text.interfaces) == 1
+        assert moving_text.interfaces[0]._qt_object is not old_moving_qt_object
+        assert old_moving_qt_object.scene() is None
+        assert moving_text.interfaces[0]._qt_object.scene() is not None
+
+    def test_incremental_render_updates_reusable_qt_objects_in_place(self):
+        neoscore.set_incremental_render(True)
+        text = Text(ORIGIN, None, "text")
+        render_scene()
+        old_interface = text.interfaces[0]
+        qt_object = old_interface._qt_object
+        text.x = Mm(10)
+        text.brush = "#ff0000"
+        render_scene()
+        assert text.interfaces[0] is not old_interface
+        assert text.interfaces[0]._qt_object is qt_object
+        assert qt_object.scene() is not None
+        assert qt_object.pos().x() == Mm(10).base_value
+        assert qt_object.brush().color().name() == "#ff0000"
+
+    def test_incremental_render_moves_reused_qt_objects_to_new_parents(self):
+        neoscore.set_incremental_render(True)
+        parent = PositionedObject(ORIGIN, None)
+        child = Text(ORIGIN, parent, "child")
+        render_scene()
+        child_qt_object = child.interfaces[0]._qt_object
+        parent.rotation = 45
+        render_scene()
+        assert child.interfaces[0]._qt_object is child_qt_object
+        assert child_qt_object.parentItem() is parent.interface_for_children._qt_object
+        assert child_qt_object.scene() is not None
+
+    def test_incremental_render_reuses_helper_interfaces(self):
+        neoscore.set_incremental_render(True)
+        flowable = Flowable(ORIGIN, None, Mm(500), Mm(20))
+        staff = Staff(ORIGIN, flowable, Mm(400))
+        Clef(ZERO, staff, "treble")
+        text = Text((Mm(20), ZERO), staff, "text")
+        render_scene()
+        staff_qt_objects = [i._qt_object for i in staff.interfaces]
+        item_count = len(neoscore.app_interface.scene.items())
+        text.text = "changed"
+        render_scene()
+        assert [i._qt_object for i in staff.interfaces] == staff_qt_objects
+        assert len(neoscore.app_interface.scene.items()) == item_count
+
+    def test_incremental_render_removes_detached_objects(self):
+        neoscore.set_incremental_render(True)
+        parent = PositionedObject(ORIGIN, None)
+        child = Text(ORIGIN, parent, "child")
+        render_scene()
+        scene = neoscore.app_interface.scene
+        item_count = len(scene.items())
+        parent.remove()
+        render_scene()
+        # The parent's and child's invisible group items and the child's path are gone
+        assert len(scene.items()) == item_count - 3
+        assert child.interfaces == []
+
+    def test_incremental_render_rebuilds_whole_flowable(self):
+        neoscore.set_incremental_render(True)
+        flowable = Flowable(ORIGIN, None, Mm(500), Mm(20))
+        first = Text(ORIGIN, flowable, "first")
+        second = Text((Mm(20), ZERO), flowable, "second")
+        render_scene()
+        first_interface = first.interfaces[0]
+        second.text = "changed"
+        render_scene()
+        assert first.interfaces[0] is not first_interface
+        # Unchanged objects keep their Qt objects
+        assert first.interfaces[0]._qt_object is first_interface._qt_object
+
+    def test_incremental_render_rebuilds_spanner_after_end_change(self):
+        neoscore.set_incremental_render(True)
+        staff = Staff(ORIGIN, None, Mm(100))
+        hairpin = Hairpin(ORIGIN, staff, (Mm(20), ZERO))
+        render_scene()
+        old_width = hairpin.interfaces[0]._qt_object.boundingRect().width()
+        hairpin.end_x = Mm(80)
+        render_scene()
+        new_width = hairpin.interfaces[0]._qt_object.boundingRect().width()
+        assert new_width > old_width + Mm(50).base_value
+
+    def test_incremental_render_detects_removal_through_children(self):
+        neoscore.set_incremental_render(True)
+        parent = PositionedObject(ORIGIN, None)
+        child = Text(ORIGIN, parent, "child")
+        render_scene()
+        child.remove()
+        child.text = "changed"
+        render_scene()
+        assert child.interfaces == []
+
+    def test_chordrest_setters_mark_dirty(self):
+        neoscore.set_incremental_render(True)
+        staff = Staff(ORIGIN, None, Mm(100))
+        Clef(ZERO, staff, "treble")
+        chord = Chordrest(Mm(10), staff, ["c'"], (1, 4))
+        render_scene()
+        chord.stem_direction = chord.stem_direction.flip()
+        assert id(chord) in neoscore.document._dirty_objects
+
+    def test_document_generation_counts_changes(self):
+        generation = neoscore.document.generation
+        text = Text(ORIGIN, None, "text")
+        assert neoscore.document.generation > generation
+        generation = neoscore.document.generation
+        text.x = Mm(5)
+        assert neoscore.document.generation > generation
+        generation = neoscore.document.generation
+        text.remove()
+        assert neoscore.document.generation > generation
+        generation = neoscore.document.generation
+        text.brush.color = Color("#ff0000")
+        assert neoscore.document.generation > generation
+        generation = neoscore.document.generation
+        neoscore.document.paper = neoscore.document.paper
+        assert neoscore.document.generation > generation
+
+    def test_document_generation_ignores_changes_during_render(self):
+        # Hairpins update their path in a render hook
+        staff = Staff(ORIGIN, None, Mm(100))
+        Hairpin((Mm(1), ZERO), staff, (Mm(50), ZERO))
+        render_scene()
+        generation = neoscore.document.generation
+        render_scene()
+        assert neoscore.document.generation == generation
+
+    def test_exports_reuse_unchanged_scene(self):
+        text = Text(ORIGIN, None, "text")
+        render_scene()
+        qt_object = text.interfaces[0]._qt_object
+        render_scene()
+        assert text.interfaces[0]._qt_object is qt_object
+        text.x = Mm(5)
+        render_scene()
+        assert text.interfaces[0]._qt_object is not qt_object
+
+    def test_exports_rebuild_scene_after_pen_change(self):
+        path = Path.straight_line(ORIGIN, None, (Mm(10), Mm(10)))
+        render_scene()
+        qt_object = path.interfaces[0]._qt_object
+        path.pen.thickness = Mm(1)
+        render_scene()
+        assert path.interfaces[0]._qt_object is not qt_object
+        assert path.interfaces[0]._qt_object.pen().widthF() == Mm(1).base_value
+
+    def test_exports_rebuild_scene_after_background_change(self):
+        text = Text(ORIGIN, None, "text")
+        render_scene()
+        qt_object = text.interfaces[0]._qt_object
+        initial_brush = neoscore.background_brush
+        try:
+            neoscore.set_background_brush("#ff0000")
+            render_scene()
+        finally:
+            neoscore.set_background_brush(initial_brush)
+        assert text.interfaces[0]._qt_object is not qt_object
+
+    def test_disabling_incremental_render_stops_tracking(self):
+        neoscore.set_incremental_render(True)
+        render_scene()
+        assert neoscore.document.dirty_tracking_enabled
+        neoscore.set_incremental_render(False)
+        assert not neoscore.document.dirty_tracking_enabled
+
+    @unittest.skipUnless(AppTest.running_on_linux(), "Parallel PDF export needs Linux")
+    def test_objects_at(self):
+        below = Path.rect((Mm(10), Mm(10)), None, Mm(10), Mm(10))
+        above = Path.rect((Mm(15), Mm(15)), None, Mm(10), Mm(10))
+        assert neoscore.objects_at((Mm(12), Mm(12))) == []
+        render_scene()
+        assert neoscore.objects_at((Mm(12), Mm(12))) == [below]
+        assert neoscore.objects_at((Mm(17), Mm(17))) == [above, below]
+        assert neoscore.objects_at((Mm(50), Mm(50))) == []
+
+    def test_objects_in(self):
+        left = Path.rect((Mm(10), Mm(10)), None, Mm(10), Mm(10))
+        right = Path.rect((Mm(50), Mm(10)), None, Mm(10), Mm(10))
+        render_scene()
+        assert neoscore.objects_in((Mm(0), Mm(0), Mm(30), Mm(30))) == [left]
+        assert neoscore.objects_in((Mm(0), Mm(0), Mm(80), Mm(30))) == [right, left]
+
+    def test_objects_at_finds_objects_across_flowable_lines(self):
+        flowable = Flowable(ORIGIN, None, Mm(500), Mm(20))
+        path = Path.straight_line((Mm(100), Mm(5)), flowable, (Mm(300), ZERO))
+        render_scene()
+        assert len(path.interfaces) > 1
+        for interface in path.interfaces:
+            rect = interface.scene_bounding_rect()
+            center = (rect.x + rect.width / 2, rect.y + rect.height / 2)
+            assert neoscore.objects_at(center) == [path]
+
+    def test_objects_at_updates_after_render(self):
+        path = Path.rect((Mm(10), Mm(10)), None, Mm(10), Mm(10))
+        render_scene()
+        path.x = Mm(100)
+        assert neoscore.objects_at((Mm(12), Mm(12))) == [path]
+        render_scene()
+        assert neoscore.objects_at((Mm(12), Mm(12))) == []
+        assert neoscore.objects_at((Mm(102), Mm(12))) == [path]
+
+    def test_render_region_skips_pages_outside_it(self):
+        pages = neoscore.document.pages
+        texts = [Text(ORIGIN, pages[i], "test") for i in range(6)]
+        region = pages[2].document_space_bounding_rect
+        neoscore.document.render(False, Brush(), lambda: region)
+        # The first page is always rendered
+        assert len(texts[0].interfaces) == 1
+        assert [len(text.interfaces) for text in texts[1:]] == [0, 1, 0, 0, 0]
+
+    def test_render_region_drops_stale_interfaces_of_skipped_pages(self):
+        pages = neoscore.document.pages
+        text = Text(ORIGIN, pages[5], "test")
+        neoscore.document.render(False, Brush())
+        assert len(text.interfaces) == 1
+        region = pages[0].document_space_bounding_rect
+        neoscore.document.render(False, Brush(), lambda: region)
+        assert text.interfaces == []
+        assert pages[5].interface_for_children is None
+
+    def test_render_region_skips_flowable_lines_outside_it(self):
+        pages = neoscore.document.pages
+        flowable = Flowable(ORIGIN, None, Mm(10000), Mm(20))
+        paths = [
+            Path.rect((Mm(x), ZERO), flowable, Mm(1), Mm(1))
+            for x in range(25, 10000, 500)
+        ]
+        neoscore.document.render(False, Brush())
+        last_page = flowable.lines[-1].page
+        assert last_page.index > 1
+        region = last_page.document_space_bounding_rect
+        neoscore.document.render(False, Brush(), lambda: region)
+        for path in paths:
+            line = flowable.last_break_at(flowable.descendant_pos(path).x)
+            assert len(path.interfaces) == (1 if line.page is last_page else 0)
+
+    def test_render_region_does_not_create_placeholder_pages_outside_it(self):
+        pages = neoscore.document.pages
+        pages.ensure(10)
+        region = pages._document_space_bounding_rect(5)
+        neoscore.document.render(True, Brush(), lambda: region)
+        assert [i for i in range(10) if pages._is_created(i)] == [0, 5]
+        neoscore.document.render(True, Brush())
+        assert all(pages._is_created(i) for i in range(10))
+
+    def test_incremental_render_not_used_after_render_region(self):
+        neoscore.set_incremental_render(True)
+        render_scene()
+        region = neoscore.document.pages[0].document_space_bounding_rect
+        neoscore.document.render(False, Brush(), lambda: region)
+        assert not neoscore.document.render_incremental(False)
+
+    def test_viewport_culling(self):
+        pages = neoscore.document.pages
+        near_text = Text(ORIGIN, pages[1], "near")
+        far_text = Text(ORIGIN, pages[20], "far")
+        neoscore.set_viewport_culling(True, Mm(10))
+        neoscore._render_document(
+            False, neoscore.background_brush, cull_to_viewport=True
+        )
+        assert near_text.interfaces == []
+        neoscore.set_viewport_center_pos(
+            _rect_center(pages[1].document_space_bounding_rect)
+        )
+        neoscore._render_document(
+            False, neoscore.background_brush, cull_to_viewport=True
+        )
+        assert len(near_text.interfaces) == 1
+        assert far_text.interfaces == []
+        # The whole document can be scrolled over
+        scene_rect = neoscore.app_interface.scene_rect
+        assert scene_rect.contains(pages[20].document_space_bounding_rect)
+        # Exports always render everything
+        render_scene()
+        assert len(far_text.interfaces) == 1
+        assert neoscore.app_interface.scene_rect is None
+
+    def test_viewport_culling_renders_newly_visible_region(self):
+        pages = neoscore.document.pages
+        far_text = Text(ORIGIN, pages[20], "far")
+        neoscore.set_viewport_culling(True, Mm(10))
+        neoscore._render_document(
+            False, neoscore.background_brush, cull_to_viewport=True
+        )
+        assert far_text.interfaces == []
+        neoscore.set_viewport_center_pos(
+            _rect_center(pages[20].document_space_bounding_rect)
+        )
+        neoscore._render_newly_visible_region()
+        assert len(far_text.interfaces) == 1
+
+    def test_render_pdf_with_workers_matches_serial_output(self):
+        flowable = Flowable(ORIGIN, None, Mm(6000), Mm(30))
+        for i in range(120):
+            Text((Mm(i * 50), ZERO), flowable, f"page text {i}")
+        with tempfile.TemporaryDirectory() as out_dir:
+            serial_path = os.path.join(out_dir, "serial.pdf")
+            parallel_path = os.path.join(out_dir, "parallel.pdf")
+            neoscore.render_pdf(serial_path, 30)
+            neoscore.render_pdf(parallel_path, 30, workers=3)
+            assert len(neoscore.document.pages) > 3
+            with open(serial_path, "rb") as f:
+                serial = f.read()
+            with open(parallel_path, "rb") as f:
+                parallel = f.read()
+        assert serial == parallel
+
+    @unittest.skipUnless(AppTest.running_on_linux(), "Parallel PDF export needs Linux")
+    def test_render_pdf_with_workers_after_serial_export(self):
+        # Regression test: a serial export must not leave anything behind, like
+        # running Qt thread pool workers, which deadlocks later forked workers.
+        flowable = Flowable(ORIGIN, None, Mm(6000), Mm(30))
+        for i in range(120):
+            Text((Mm(i * 50), ZERO), flowable, f"page text {i}")
+        with tempfile.TemporaryDirectory() as out_dir:
+            neoscore.render_pdf(os.path.join(out_dir, "serial.pdf"), 30)
+            pdf_path = os.path.join(out_dir, "parallel.pdf")
+            neoscore.render_pdf(pdf_path, 30, workers=2, max_in_flight_pages=1)
+            with open(pdf_path, "rb") as f:
+                pdf = f.read()
+        assert len(re.findall(rb"/Type /Page\b", pdf)) == len(neoscore.document.pages)
+
+    def test_render_pdf_streams_pages_with_document_page_sizes(self):
+        flowable = Flowable(ORIGIN, None, Mm(6000), Mm(30))
+        for i in range(120):
+            Text((Mm(i * 50), ZERO), flowable, f"page text {i}")
+        with tempfile.TemporaryDirectory() as out_dir:
+            pdf_path = os.path.join(out_dir, "out.pdf")
+            neoscore.render_pdf(pdf_path, 30, max_in_flight_pages=1)
+            with open(pdf_path, "rb") as f:
+                pdf = f.read()
+        pages = neoscore.document.pages
+        assert len(re.findall(rb"/Type /Page\b", pdf)) == len(pages)
+        media_boxes = re.findall(rb"/MediaBox \[0 0 ([\d.]+) ([\d.]+)\]", pdf)
+        assert [(float(w), float(h)) for w, h in media_boxes] == [
+            (
+                round(page.document_space_bounding_rect.width.base_value, 4),
+                round(page.document_space_bounding_rect.height.base_value, 4),
+            )
+            for page in pages
+        ]
+
+    @unittest.skipUnless(AppTest.running_on_linux(), "Parallel PDF export needs Linux")
+    def test_render_pdf_with_workers_after_qt_thread_pool_use(self):
+        # Threads of Qt's global thread pool don't exist in forked workers, so
+        # workers must not use APIs backed by it. Make sure the pool is running.
+        big_image = QImage(2000, 2000, QImage.Format_ARGB32)
+        big_image.convertToFormat(QImage.Format_RGB888)
+        flowable = Flowable(ORIGIN, None, Mm(6000), Mm(30))
+        for i in range(120):
+            Text((Mm(i * 50), ZERO), flowable, f"page text {i}")
+        with tempfile.TemporaryDirectory() as out_dir:
+            pdf_path = os.path.join(out_dir, "out.pdf")
+            neoscore.render_pdf(pdf_path, 30, workers=2)
+            assert os.path.getsize(pdf_path) > 0
+
+    def test_render_images_renders_document_once(self):
+        class CountingObject(PositionedObject):
+            render_count = 0
+
+            def pre_render_hook(self):
+                super().pre_render_hook()
+                CountingObject.render_count += 1
+
+        CountingObject(ORIGIN, None)
+        Text(ORIGIN, None, "test")
+        buffers = [bytearray() for _ in range(3)]
+        with tempfile.TemporaryDirectory() as out_dir:
+            file_path = os.path.join(out_dir, "out.png")
+            threads = neoscore.render_images(
+                [
+                    ((Mm(0), Mm(-10), Mm(10 * (i + 1)), Mm(20)), buf)
+                    for i, buf in enumerate(buffers)
+                ]
+                + [((Mm(0), Mm(-10), Mm(10), Mm(20)), file_path)],
+                dpi=72,
+            )
+            assert os.path.getsize(file_path) > 0
+        assert len(threads) == 4
+        assert CountingObject.render_count == 1
+        widths = [QImage.fromData(bytes(buf)).width() for buf in buffers]
+        assert widths[0] < widths[1] < widths[2]
+
+    def test_render_images_checks_all_formats_before_rendering(self):
+        buffer = bytearray()
+        with self.assertRaises(InvalidImageFormatError):
+            neoscore.render_images([(None, buffer), (None, "out.invalid")])
+        assert not buffer
+
+    def test_render_images_to_buffer_in_other_format(self):
+        Text(ORIGIN, None, "test")
+        buffer = bytearray()
+        neoscore.render_image(
+            (ZERO, ZERO, Mm(10), Mm(10)), buffer, 72, buffer_format="jpg"
+        )
+        assert buffer.startswith(b"\xff\xd8")
+
+    def test_render_images_rejects_unsupported_buffer_format(self):
+        with self.assertRaises(InvalidImageFormatError):
+            neoscore.render_image(None, bytearray(), buffer_format="tiff")
+
+    def test_render_pixels(self):
+        Path.rect((Mm(10), Mm(10)), None, Mm(10), Mm(10), "#ff0000", Pen.no_pen())
+        pixels = neoscore.render_pixels(
+            (ZERO, ZERO, Mm(40), Mm(40)), 72, autocrop=True, preserve_alpha=False
+        )
+        assert pixels.channels == 4
+        # Autocropped to the red square
+        assert abs(pixels.width - Mm(10).base_value) <= 2
+        assert abs(pixels.height - Mm(10).base_value) <= 2
+        middle_row = pixels.row(pixels.height // 2)
+        middle = (pixels.width // 2) * 4
+        assert bytes(middle_row[middle : middle + 4]) == bytes([255, 0, 0, 255])
+
+    def test_render_svg_defines_repeated_glyphs_once(self):
+        staff = Staff(ORIGIN, None, Mm(200))
+        Clef(ZERO, staff, "treble")
+        for i in range(50):
+            Chordrest(Mm(10 + i * 3), staff, ["c'"], (1, 4))
+        with tempfile.TemporaryDirectory() as out_dir:
+            svg_path = os.path.join(out_dir, "out.svg")
+            neoscore.render_svg(None, svg_path)
+            with open(svg_path, "rb") as f:
+                svg = f.read()
+        assert svg.startswith(b"<?xml")
+        # Staff, clef, notehead, and stem shapes
+        assert len(re.findall(rb"<path id=", svg)) <= 5
+        assert len(re.findall(rb"<use ", svg)) > 100
+
+    def test_render_pdf_rejects_invalid_worker_count(self):
+        with self.assertRaises(ValueError):
+            neoscore.render_pdf("unused.pdf", workers=0)
+        with self.assertRaises(ValueError):
+            neoscore.render_pdf("unused.pdf", max_in_flight_pages=0)
+
+    def test_render_pdf_vector_writes_one_page_per_document_page(self):
+        flowable = Flowable(ORIGIN, None, Mm(6000), Mm(30))
+        for i in range(120):
+            Text((Mm(i * 50), ZERO), flowable, f"page text {i}")
+        with tempfile.TemporaryDirectory() as out_dir:
+            pdf_path = os.path.join(out_dir, "out.pdf")
+            neoscore.render_pdf(pdf_path, vector=True)
+            with open(pdf_path, "rb") as f:
+                pdf = f.read()
+        page_count = len(re.findall(rb"/Type /Page\b", pdf))
+        assert page_count == len(neoscore.document.pages)
@@ -1,4 +1,4 @@
-from neoscore.core.units import Mm
+from neoscore.core.units import Mm, Unit
 from neoscore.western.chordrest import Chordrest
 from neoscore.western.clef import Clef
 from neoscore.western.duration import Duration
@@ -20,3 +20,18 @@ class TestStaffOutsideFlowable(AppTest):
         Chordrest(unit(10), staff, [], Duration(1, 4))
 
         render_scene()
+
+    def test_key_signature_drawn_at_its_position_without_helper_objects(self):
+        staff = Staff((Mm(10), Mm(20)), None, Mm(100), line_spacing=Mm(1))
+        Clef(Mm(0), staff, "treble")
+        key_signature = KeySignature(Mm(30), staff, "g_major")
+
+        render_scene()
+
+        assert staff.children == [staff.children[0], key_signature]
+        assert key_signature.children == []
+        (accidental,) = key_signature.interfaces
+        accidental_x = Unit(accidental._qt_object.scenePos().x())
+        key_signature_x = key_signature.canvas_pos().x
+        assert key_signature_x <= accidental_x
+        assert accidental_x < key_signature_x + key_signature.visual_width
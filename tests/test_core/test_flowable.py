@@ -90,6 +90,19 @@ class TestFlowable(AppTest):
         flowable._generate_lines()
         assert flowable.lines[1].flowable_x == live_width - Mm(19)
 
+    def test_generate_layout_controllers_ignores_break_opportunities_at_line_end(
+        self,
+    ):
+        live_width = neoscore.document.paper.live_width
+        flowable = Flowable(
+            ORIGIN, None, live_width * 3, Mm(100), break_threshold=Mm(20)
+        )
+        BreakHint((live_width - Mm(5), ZERO), flowable)
+        BreakHint((live_width, ZERO), flowable)
+        BreakHint((live_width + Mm(5), ZERO), flowable)
+        flowable._generate_lines()
+        assert flowable.lines[1].flowable_x == live_width - Mm(5)
+
     def test_generate_layout_controllers_with_margin_controllers(self):
         live_width = neoscore.document.paper.live_width
         flowable = Flowable((Mm(10), ZERO), None, live_width * 3, Mm(50))
@@ -139,3 +152,74 @@ class TestFlowable(AppTest):
         flowable = Flowable((Mm(10), Mm(0)), None, Mm(10000), Mm(90), Mm(5))
         flowable._generate_lines()
         assert flowable.last_break_at(Mm(10000000)) == flowable.lines[-1]
+
+    def test_last_break_index_at_line_boundaries(self):
+        flowable = Flowable((Mm(10), Mm(0)), None, Mm(500), Mm(90), Mm(5))
+        flowable._generate_lines()
+        second_line_x = flowable.lines[1].flowable_x
+        assert flowable.last_break_index_at(Mm(-10)) == 0
+        assert flowable.last_break_index_at(ZERO) == 0
+        # Positions on a break belong to the line before it
+        assert flowable.last_break_index_at(second_line_x) == 0
+        assert flowable.last_break_index_at(second_line_x + Mm(0.01)) == 1
+
+    def test_last_break_indices_at(self):
+        flowable = Flowable((Mm(10), Mm(0)), None, Mm(2000), Mm(90), Mm(5))
+        flowable._generate_lines()
+        xs = [Mm(x) for x in range(-10, 2100, 15)]
+        xs.extend(line.flowable_x for line in flowable.lines)
+        xs.sort()
+        assert flowable.last_break_indices_at(xs) == [
+            flowable.last_break_index_at(x) for x in xs
+        ]
+
+    def test_regenerating_unchanged_layout_keeps_lines(self):
+        flowable = Flowable(ORIGIN, None, Mm(2000), Mm(20))
+        for x in range(100, 2000, 100):
+            BreakHint((Mm(x), ZERO), flowable)
+        flowable._generate_lines()
+        lines = list(flowable.lines)
+        flowable._generate_lines()
+        assert flowable.lines == lines
+        assert all(line in line.page.children for line in lines)
+
+    def test_regenerating_layout_keeps_lines_before_change(self):
+        flowable = Flowable(ORIGIN, None, Mm(2000), Mm(20), break_threshold=Mm(50))
+        for x in range(100, 2000, 100):
+            BreakHint((Mm(x), ZERO), flowable)
+        flowable._generate_lines()
+        lines = list(flowable.lines)
+        BreakHint((Mm(1250), ZERO), flowable)
+        flowable._generate_lines()
+        changed_line_i = next(
+            i for i, line in enumerate(lines) if line.flowable_x + Mm(160) >= Mm(1250)
+        )
+        assert changed_line_i > 3
+        assert flowable.lines[:changed_line_i] == lines[:changed_line_i]
+        reference = Flowable(ORIGIN, None, Mm(2000), Mm(20), break_threshold=Mm(50))
+        for x in [*range(100, 2000, 100), 1250]:
+            BreakHint((Mm(x), ZERO), reference)
+        reference._generate_lines()
+        assert [(line.flowable_x, line.length) for line in flowable.lines] == [
+            (line.flowable_x, line.length) for line in reference.lines
+        ]
+        for line in lines:
+            assert (line in flowable.lines) == (line in line.page.children)
+
+    def test_regenerating_layout_after_margin_change(self):
+        flowable = Flowable(ORIGIN, None, Mm(2000), Mm(20))
+        flowable._generate_lines()
+        lines = list(flowable.lines)
+        flowable.add_margin_controller(MarginController(Mm(1000), Mm(10)))
+        flowable._generate_lines()
+        assert flowable.lines[:6] == lines[:6]
+        assert flowable.lines[7].x == Mm(10)
+
+    def test_regenerating_layout_after_setting_change_replaces_lines(self):
+        flowable = Flowable(ORIGIN, None, Mm(2000), Mm(20))
+        flowable._generate_lines()
+        lines = list(flowable.lines)
+        flowable.height = Mm(30)
+        flowable._generate_lines()
+        assert not any(line in lines for line in flowable.lines)
+        assert not any(line in line.page.children for line in lines)
@@ -0,0 +1,108 @@
+from neoscore.core import neoscore
+from neoscore.core.break_hint import BreakHint
+from neoscore.core.flowable import Flowable
+from neoscore.core.line_breaking import GreedyLineBreaker, OptimalLineBreaker
+from neoscore.core.point import ORIGIN
+from neoscore.core.units import ZERO, Mm
+
+from ..helpers import AppTest
+
+
+def _max_line_length(flowable_x):
+    return Mm(100)
+
+
+class TestLineBreaking(AppTest):
+    def setUp(self):
+        super().setUp()
+        self.flowable = Flowable(ORIGIN, None, Mm(205), Mm(10), break_threshold=Mm(100))
+        self.break_opps = [Mm(40), Mm(90), Mm(110)]
+
+    def test_greedy_fills_each_line(self):
+        lengths = GreedyLineBreaker().line_lengths(
+            self.flowable, self.break_opps, _max_line_length
+        )
+        assert lengths == [Mm(90), Mm(20), Mm(100)]
+
+    def test_greedy_with_start_x(self):
+        lengths = GreedyLineBreaker().line_lengths(
+            self.flowable, self.break_opps, _max_line_length, Mm(90)
+        )
+        assert lengths == [Mm(20), Mm(100)]
+
+    def test_greedy_reusable_line_count(self):
+        breaker = GreedyLineBreaker()
+        lengths = [Mm(90), Mm(20), Mm(100)]
+        count = breaker.reusable_line_count(
+            self.flowable, lengths, Mm(150), _max_line_length
+        )
+        assert count == 1
+        count = breaker.reusable_line_count(
+            self.flowable, lengths, Mm(100), _max_line_length
+        )
+        assert count == 0
+
+    def test_optimal_evens_out_lines(self):
+        lengths = OptimalLineBreaker().line_lengths(
+            self.flowable, self.break_opps, _max_line_length
+        )
+        assert lengths == [Mm(40), Mm(70), Mm(100)]
+
+    def test_optimal_with_start_x(self):
+        lengths = OptimalLineBreaker().line_lengths(
+            self.flowable, self.break_opps, _max_line_length, Mm(40)
+        )
+        assert lengths == [Mm(70), Mm(100)]
+
+    def test_optimal_reuses_no_lines(self):
+        count = OptimalLineBreaker().reusable_line_count(
+            self.flowable, [Mm(40), Mm(70), Mm(100)], Mm(200), _max_line_length
+        )
+        assert count == 0
+
+    def test_optimal_without_break_opportunities(self):
+        lengths = OptimalLineBreaker().line_lengths(self.flowable, [], _max_line_length)
+        assert lengths == [Mm(100), Mm(100), Mm(100)]
+
+    def test_optimal_forces_breaks_when_no_opportunity_fits(self):
+        self.flowable._length = Mm(300)
+        lengths = OptimalLineBreaker().line_lengths(
+            self.flowable, [Mm(150)], _max_line_length
+        )
+        assert lengths == [Mm(100), Mm(50), Mm(100), Mm(100)]
+
+    def test_optimal_ignores_opportunities_at_flowable_ends(self):
+        lengths = OptimalLineBreaker().line_lengths(
+            self.flowable, [ZERO, Mm(90), Mm(205)], _max_line_length
+        )
+        assert lengths == [Mm(90), Mm(100), Mm(100)]
+
+    def test_optimal_uses_max_line_length_at_each_start(self):
+        def max_line_length(flowable_x):
+            return Mm(100) if flowable_x == ZERO else Mm(110)
+
+        lengths = OptimalLineBreaker().line_lengths(
+            self.flowable, [Mm(85), Mm(95)], max_line_length
+        )
+        assert lengths == [Mm(95), Mm(110)]
+
+    def test_flowable_uses_line_breaker(self):
+        # Like the breaks tested above, scaled to the live page width
+        live_width = neoscore.document.paper.live_width
+        flowable = Flowable(
+            ORIGIN, None, live_width * 2.05, Mm(10), line_breaker=OptimalLineBreaker()
+        )
+        for x in (live_width * 0.4, live_width * 0.9, live_width * 1.1):
+            BreakHint((x, ZERO), flowable)
+        flowable._generate_lines()
+        assert [line.flowable_x for line in flowable.lines] == [
+            ZERO,
+            live_width * 0.4,
+            live_width * 1.1,
+        ]
+
+    def test_line_breaker_setter(self):
+        breaker = OptimalLineBreaker()
+        assert isinstance(self.flowable.line_breaker, GreedyLineBreaker)
+        self.flowable.line_breaker = breaker
+        assert self.flowable.line_breaker is breaker
@@ -91,3 +91,50 @@ class TestPageSupplier(AppTest):
         page = supplier[0]
         assert len(page.children) == 1
         assert page.children[0].pos == Point(Unit(1), Unit(2))
+
+    def test_getitem_generation_skips_intermediate_pages(self):
+        created = []
+        supplier = PageSupplier(neoscore.document, created.append)
+        page = supplier[9]
+        assert len(supplier) == 10
+        assert created == [page]
+        assert [supplier._is_created(i) for i in range(10)] == [False] * 9 + [True]
+        assert supplier[-1] is page
+
+    def test_ensure(self):
+        created = []
+        supplier = PageSupplier(neoscore.document, created.append)
+        supplier.ensure(3)
+        assert len(supplier) == 3
+        assert created == []
+        supplier.ensure(2)
+        assert len(supplier) == 3
+        page = supplier[1]
+        assert created == [page]
+        assert page.index == 1
+        assert page.page_side == DirectionX.LEFT
+        assert page.pos == neoscore.document.page_origin(1)
+        assert supplier[1] is page
+
+    def test_iteration_creates_placeholder_pages(self):
+        supplier = PageSupplier(neoscore.document)
+        supplier.ensure(3)
+        pages = list(supplier)
+        assert [page.index for page in pages] == [0, 1, 2]
+        assert list(supplier._created_pages()) == pages
+
+    def test_placeholder_pages_keep_overlay_func_when_requested(self):
+        def test_overlay_func(pg: Page):
+            PositionedObject((Unit(1), Unit(2)), pg)
+
+        supplier = PageSupplier(neoscore.document, test_overlay_func)
+        supplier.ensure(2)
+        supplier.overlay_func = None
+        assert len(supplier[1].children) == 1
+
+    def test_placeholder_bounding_rect_matches_page(self):
+        supplier = PageSupplier(neoscore.document)
+        supplier.ensure(4)
+        rects = [supplier._document_space_bounding_rect(i) for i in range(4)]
+        assert not any(supplier._is_created(i) for i in range(4))
+        assert rects == [page.document_space_bounding_rect for page in supplier]
@@ -87,6 +87,14 @@ class TestPath(AppTest):
             ResolvedLineTo(Unit(10), Unit(12)),
         ]
 
+    def test_breakable_length(self):
+        path = Path((Unit(5), Unit(6)), None)
+        parent = PositionedObject((Unit(100), Unit(50)), None)
+        path.line_to(Unit(10), Unit(12))
+        path.line_to(Unit(-20), Unit(3), parent)
+        # Elements span from the path origin to the last element at x=(100 - 20 - 5)
+        assert path.breakable_length == Unit(75)
+
     def test_line_to_with_parent(self):
         path = Path((Unit(5), Unit(6)), None)
         parent = PositionedObject((Unit(100), Unit(50)), None)
@@ -0,0 +1,76 @@
+import io
+import re
+import unittest
+import zlib
+
+from neoscore.core.pdf_writer import PdfPageImage, PdfWriter
+
+
+def _solid_page(pixel_width: int, pixel_height: int, value: int) -> PdfPageImage:
+    rgb = bytes([value]) * (pixel_width * pixel_height * 3)
+    return PdfPageImage(pixel_width, pixel_height, zlib.compress(rgb))
+
+
+class TestPdfWriter(unittest.TestCase):
+    def _write(self, pages) -> bytes:
+        stream = io.BytesIO()
+        writer = PdfWriter(stream)
+        for image, width, height in pages:
+            writer.add_page(image, width, height)
+        writer.close()
+        return stream.getvalue()
+
+    def test_writes_one_page_per_added_page(self):
+        pdf = self._write([(_solid_page(2, 3, 0), 72, 72)] * 4)
+        assert len(re.findall(rb"/Type /Page\b", pdf)) == 4
+        assert b"/Count 4" in pdf
+        assert pdf.endswith(b"%%EOF\n")
+
+    def test_media_boxes_match_page_sizes_in_order(self):
+        pdf = self._write(
+            [
+                (_solid_page(1, 1, 0), 100, 200),
+                (_solid_page(1, 1, 0), 300.5, 400),
+                (_solid_page(1, 1, 0), 50, 60.25),
+            ]
+        )
+        assert re.findall(rb"/MediaBox \[([^\]]*)\]", pdf) == [
+            b"0 0 100 200",
+            b"0 0 300.5 400",
+            b"0 0 50 60.25",
+        ]
+
+    def test_page_tree_lists_pages_in_order_added(self):
+        pdf = self._write(
+            [(_solid_page(i + 1, 1, 0), 72, 72) for i in range(3)],
+        )
+        kids = re.search(rb"/Kids \[([^\]]*)\]", pdf).group(1)
+        page_nums = [int(num) for num in re.findall(rb"(\d+) 0 R", kids)]
+        widths = []
+        for num in page_nums:
+            page = re.search(rb"\n%d 0 obj\n(.*?)endobj" % num, pdf, re.S).group(1)
+            image_num = int(re.search(rb"/Im0 (\d+) 0 R", page).group(1))
+            image = re.search(rb"\n%d 0 obj\n(.*?)stream" % image_num, pdf, re.S)
+            widths.append(int(re.search(rb"/Width (\d+)", image.group(1)).group(1)))
+        assert widths == [1, 2, 3]
+
+    def test_image_data_is_embedded_unchanged(self):
+        image = _solid_page(4, 5, 0x7F)
+        pdf = self._write([(image, 72, 72)])
+        assert image.data in pdf
+        assert b"/Width 4 /Height 5" in pdf
+
+    def test_xref_offsets_point_at_objects(self):
+        pdf = self._write([(_solid_page(1, 1, 0), 72, 72)] * 2)
+        xref_offset = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+        entries = re.findall(rb"(\d{10}) 00000 n ", pdf[xref_offset:])
+        for obj_num, offset in enumerate(entries, start=1):
+            assert pdf[int(offset) :].startswith(b"%d 0 obj\n" % obj_num)
+
+    def test_add_page_after_close_fails(self):
+        writer = PdfWriter(io.BytesIO())
+        writer.close()
+        with self.assertRaises(ValueError):
+            writer.add_page(_solid_page(1, 1, 0), 72, 72)
+        with self.assertRaises(ValueError):
+            writer.close()
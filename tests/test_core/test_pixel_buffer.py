@@ -0,0 +1,37 @@
+import unittest
+
+from neoscore.core.pixel_buffer import PixelBuffer
+
+
+class TestPixelBuffer(unittest.TestCase):
+    def setUp(self):
+        # 2x3 image with 2 channels and 2 bytes of padding per row
+        self.memory = bytearray(range(18))
+        self.buffer = PixelBuffer(self.memory, memoryview(self.memory), 2, 3, 2, 6)
+
+    def test_properties(self):
+        assert self.buffer.width == 2
+        assert self.buffer.height == 3
+        assert self.buffer.channels == 2
+        assert self.buffer.bytes_per_line == 6
+        assert self.buffer.shape == (3, 2, 2)
+
+    def test_data_shares_memory(self):
+        self.memory[0] = 100
+        assert self.buffer.data[0] == 100
+
+    def test_row_excludes_padding(self):
+        assert bytes(self.buffer.row(1)) == bytes([6, 7, 8, 9])
+
+    def test_row_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.buffer.row(3)
+        with self.assertRaises(IndexError):
+            self.buffer.row(-1)
+
+    def test_array_interface(self):
+        interface = self.buffer.__array_interface__
+        assert interface["shape"] == (3, 2, 2)
+        assert interface["typestr"] == "|u1"
+        assert interface["strides"] == (6, 2, 1)
+        assert interface["data"].obj is self.memory
@@ -1,13 +1,49 @@
 from neoscore.core import neoscore
+from neoscore.core.brush import Brush
 from neoscore.core.flowable import Flowable
 from neoscore.core.paper import Paper
 from neoscore.core.point import ORIGIN, Point
-from neoscore.core.positioned_object import PositionedObject
+from neoscore.core.positioned_object import (
+    PositionedObject,
+    _begin_render_epoch,
+    _end_render_epoch,
+    render_cached_property,
+)
+from neoscore.core.text import Text
 from neoscore.core.units import ZERO, Mm, Unit
 
 from ..helpers import AppTest, assert_almost_equal
 
 
+class _CountingObject(PositionedObject):
+    def __init__(self, pos, parent):
+        super().__init__(pos, parent)
+        self.compute_count = 0
+
+    @render_cached_property
+    def counted(self) -> int:
+        self.compute_count += 1
+        return self.compute_count
+
+    def render_complete(self, pos, flowable_line=None, flowable_x=None):
+        self.counted
+        self.counted
+
+
+class _HookRecordingObject(PositionedObject):
+    def __init__(self, pos, parent, log):
+        super().__init__(pos, parent)
+        self.log = log
+
+    def pre_render_hook(self):
+        super().pre_render_hook()
+        self.log.append(("pre", self))
+
+    def post_render_hook(self):
+        super().post_render_hook()
+        self.log.append(("post", self))
+
+
 class TestPositionedObject(AppTest):
     def setUp(self):
         super().setUp()
@@ -34,6 +70,43 @@ class TestPositionedObject(AppTest):
         parent._unregister_child(child)
         assert child not in parent.children
 
+    def test_child_containers_allocated_lazily(self):
+        obj = PositionedObject(ORIGIN, None)
+        assert obj._children is None
+        assert obj._descendant_index is None
+        assert list(obj.descendants) == []
+        assert obj._children is None
+        assert obj.children == []
+
+    def test_subclasses_without_slots_accept_new_attributes(self):
+        class MockSubclass(PositionedObject):
+            pass
+
+        obj = MockSubclass(ORIGIN, None)
+        obj.some_new_attribute = 1
+        assert obj.some_new_attribute == 1
+
+    def test_unregister_missing_child_fails(self):
+        parent = PositionedObject(ORIGIN, None)
+        child = PositionedObject(ORIGIN, None)
+        with self.assertRaises(ValueError):
+            parent._unregister_child(child)
+
+    def test_remove_keeps_order_of_other_children(self):
+        parent = PositionedObject(ORIGIN, None)
+        children = [PositionedObject(ORIGIN, parent) for _ in range(5)]
+        children[1].remove()
+        children[3].parent = None
+        assert parent.children == [children[0], children[2], children[4]]
+        children[3].parent = parent
+        assert parent.children == [children[0], children[2], children[4], children[3]]
+
+    def test_modifying_children_list_does_not_change_tree(self):
+        parent = PositionedObject(ORIGIN, None)
+        child = PositionedObject(ORIGIN, parent)
+        parent.children.clear()
+        assert parent.children == [child]
+
     def test_setting_parent_registers_self_with_parent(self):
         parent = PositionedObject(ORIGIN, None)
         child = PositionedObject(ORIGIN, parent)
@@ -121,6 +194,49 @@ class TestPositionedObject(AppTest):
         # Assert descendants content
         assert {child_2} == descendants_set
 
+    def test_descendants_order_puts_children_after_their_descendants(self):
+        root = PositionedObject(ORIGIN, None)
+        child_1 = PositionedObject(ORIGIN, root)
+        subchild_1 = PositionedObject(ORIGIN, child_1)
+        child_2 = PositionedObject(ORIGIN, root)
+        assert list(root.descendants) == [subchild_1, child_1, child_2]
+
+    def test_descendants_of_deep_tree(self):
+        root = PositionedObject(ORIGIN, None)
+        node = root
+        for _ in range(2000):
+            node = PositionedObject(ORIGIN, node)
+        descendants = list(root.descendants)
+        assert len(descendants) == 2000
+        assert descendants[0] is node
+
+    def test_descendant_index_follows_reparenting_and_removal(self):
+        class MockDifferentClass(PositionedObject):
+            test_attr = 1
+
+        root_1 = PositionedObject(ORIGIN, None)
+        root_2 = PositionedObject(ORIGIN, None)
+        child = PositionedObject(ORIGIN, root_1)
+        subchild = MockDifferentClass(ORIGIN, child)
+        assert list(root_1.descendants_with_attribute("test_attr")) == [subchild]
+        child.parent = root_2
+        assert list(root_1.descendants_of_exact_class(MockDifferentClass)) == []
+        assert list(root_2.descendants_of_exact_class(MockDifferentClass)) == [subchild]
+        subchild.remove()
+        assert list(root_2.descendants_with_attribute("test_attr")) == []
+        assert list(child.descendants_of_class_or_subclass(PositionedObject)) == []
+
+    def test_descendant_index_follows_children_setter(self):
+        class MockDifferentClass(PositionedObject):
+            pass
+
+        root = PositionedObject(ORIGIN, None)
+        parent = PositionedObject(ORIGIN, root)
+        child_1 = MockDifferentClass(ORIGIN, parent)
+        child_2 = MockDifferentClass(ORIGIN, parent)
+        parent.children = [child_2]
+        assert list(root.descendants_of_exact_class(MockDifferentClass)) == [child_2]
+
     def test_ancestors(self):
         root = PositionedObject(ORIGIN, None)
         child_1 = PositionedObject(ORIGIN, root)
@@ -197,6 +313,53 @@ class TestPositionedObject(AppTest):
         expected = (page_4_x + Unit(99)) - (page_1_x + Unit(5))
         assert_almost_equal(relative_x, expected)
 
+    def test_map_to_follows_ancestor_pos_changes(self):
+        root = PositionedObject((Unit(1), Unit(2)), None)
+        source = PositionedObject((Unit(3), Unit(4)), root)
+        destination = PositionedObject((Unit(5), Unit(6)), None)
+        child = PositionedObject((Unit(7), Unit(8)), destination)
+        assert_almost_equal(source.map_to(child), Point(Unit(8), Unit(8)))
+        root.pos = (Unit(10), Unit(20))
+        assert_almost_equal(source.map_to(child), Point(Unit(-1), Unit(-10)))
+        destination.x = Unit(0)
+        assert_almost_equal(source.map_x_to(child), Unit(-6))
+
+    def test_map_to_follows_reparenting(self):
+        parent_1 = PositionedObject((Unit(10), Unit(0)), None)
+        parent_2 = PositionedObject((Unit(20), Unit(0)), None)
+        source = PositionedObject(ORIGIN, None)
+        child = PositionedObject((Unit(1), Unit(0)), parent_1)
+        subchild = PositionedObject((Unit(1), Unit(0)), child)
+        assert_almost_equal(source.map_x_to(subchild), Unit(12))
+        child.parent = parent_2
+        assert_almost_equal(source.map_x_to(subchild), Unit(22))
+
+    def test_map_to_within_flowable(self):
+        parent = PositionedObject((Mm(100), Mm(0)), self.flowable)
+        child = PositionedObject((Mm(20), Mm(1)), parent)
+        assert_almost_equal(self.flowable.map_to(child), Point(Mm(120), Mm(1)))
+        assert_almost_equal(child.map_to(self.flowable), Point(Mm(-120), Mm(-1)))
+        outside = PositionedObject((Mm(5), Mm(0)), None)
+        self.flowable.pos = (Mm(10), Mm(0))
+        assert_almost_equal(outside.map_x_to(child), Mm(125))
+        assert_almost_equal(self.flowable.descendant_pos(child), Point(Mm(120), Mm(1)))
+
+    def test_descendant_pos_x(self):
+        root = PositionedObject((Mm(1), Mm(2)), None)
+        parent = PositionedObject((Mm(10), Mm(0)), root)
+        child = PositionedObject((Mm(20), Mm(1)), parent)
+        pos_x = root.descendant_pos_x(child)
+        assert type(pos_x) == Mm
+        assert_almost_equal(pos_x, Mm(30))
+
+    def test_map_to_without_common_ancestor_fails(self):
+        obj = PositionedObject(ORIGIN, None)
+        neoscore.shutdown()
+        neoscore.setup()
+        other = PositionedObject(ORIGIN, None)
+        with self.assertRaises(ValueError):
+            obj.map_to(other)
+
     def test_distance_to(self):
         source = PositionedObject((Unit(1), Unit(2)), None)
         destination = PositionedObject((Unit(3), Unit(10)), None)
@@ -210,3 +373,82 @@ class TestPositionedObject(AppTest):
         page_pos = neoscore.document.pages[2].canvas_pos()
         relative_pos = canvas_pos - page_pos
         assert_almost_equal(relative_pos, Point(Mm(5), Mm(6)))
+
+    def test_render_cached_property_not_cached_outside_render(self):
+        obj = _CountingObject(ORIGIN, None)
+        assert obj.counted == 1
+        assert obj.counted == 2
+
+    def test_render_cached_property_cached_within_epoch(self):
+        obj = _CountingObject(ORIGIN, None)
+        _begin_render_epoch()
+        try:
+            assert obj.counted == 1
+            assert obj.counted == 1
+        finally:
+            _end_render_epoch()
+        assert obj.counted == 2
+
+    def test_render_cached_property_invalidated_by_new_epoch(self):
+        obj = _CountingObject(ORIGIN, None)
+        first_epoch = _begin_render_epoch()
+        obj.counted
+        _begin_render_epoch()
+        assert obj.counted == 2
+        _begin_render_epoch(first_epoch)
+        assert obj.counted == 3
+        _end_render_epoch()
+
+    def test_render_cached_property_invalidated_by_mark_dirty(self):
+        obj = _CountingObject(ORIGIN, None)
+        _begin_render_epoch()
+        try:
+            obj.counted
+            obj.pos = (Mm(1), Mm(2))
+            assert obj.counted == 2
+        finally:
+            _end_render_epoch()
+
+    def test_document_render_recomputes_render_cached_properties(self):
+        obj = _CountingObject(ORIGIN, None)
+        neoscore.document.render(False, Brush())
+        assert obj.compute_count == 1
+        neoscore.document.render(False, Brush())
+        assert obj.compute_count == 2
+
+    def test_document_render_reuses_render_caches_when_unchanged(self):
+        neoscore.document.reuse_render_caches = True
+        obj = _CountingObject(ORIGIN, None)
+        neoscore.document.render(False, Brush())
+        neoscore.document.render(False, Brush())
+        assert obj.compute_count == 1
+        PositionedObject(ORIGIN, None)
+        neoscore.document.render(False, Brush())
+        assert obj.compute_count == 2
+
+    def test_has_render_hooks(self):
+        assert not PositionedObject._has_render_hooks
+        assert not _CountingObject._has_render_hooks
+        assert _HookRecordingObject._has_render_hooks
+        assert Flowable._has_render_hooks
+
+    def test_document_render_runs_hooks_on_descendants_first(self):
+        log = []
+        parent = _HookRecordingObject(ORIGIN, None, log)
+        plain = PositionedObject(ORIGIN, parent)
+        child = _HookRecordingObject(ORIGIN, plain, log)
+        sibling = _HookRecordingObject(ORIGIN, None, log)
+        neoscore.document.render(False, Brush())
+        pre_calls = [obj for call, obj in log if call == "pre"]
+        assert len(pre_calls) == 3
+        assert set(pre_calls) == {parent, child, sibling}
+        assert pre_calls.index(child) < pre_calls.index(parent)
+        assert [obj for call, obj in log if call == "post"] == pre_calls
+
+    def test_document_render_replaces_previous_interfaces(self):
+        obj = Text((Mm(1), Mm(2)), None, "test")
+        neoscore.document.render(False, Brush())
+        first_interfaces = list(obj.interfaces)
+        neoscore.document.render(False, Brush())
+        assert len(obj.interfaces) == 1
+        assert obj.interfaces[0] is not first_interfaces[0]
@@ -24,3 +24,20 @@ def test_rect_merge():
     r1 = Rect(Mm(2), Mm(-10), Mm(1), Mm(30))
     r2 = Rect(Mm(-5), Mm(10), Mm(15), Mm(2))
     assert r1.merge(r2) == Rect(Mm(-5), Mm(-10), Mm(15), Mm(30))
+
+
+def test_rect_intersects():
+    rect = Rect(Mm(0), Mm(0), Mm(10), Mm(10))
+    assert rect.intersects(Rect(Mm(5), Mm(5), Mm(10), Mm(10)))
+    assert rect.intersects(Rect(Mm(2), Mm(2), Mm(1), Mm(1)))
+    assert rect.intersects(Rect(Mm(10), Mm(0), Mm(5), Mm(5)))
+    assert not rect.intersects(Rect(Mm(11), Mm(0), Mm(5), Mm(5)))
+    assert not rect.intersects(Rect(Mm(0), Mm(-6), Mm(5), Mm(5)))
+
+
+def test_rect_contains():
+    rect = Rect(Mm(0), Mm(0), Mm(10), Mm(10))
+    assert rect.contains(Rect(Mm(2), Mm(2), Mm(1), Mm(1)))
+    assert rect.contains(rect)
+    assert not rect.contains(Rect(Mm(5), Mm(5), Mm(10), Mm(1)))
+    assert not Rect(Mm(2), Mm(2), Mm(1), Mm(1)).contains(rect)
@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from neoscore.core.point import Point
+from neoscore.core.rect import Rect
+from neoscore.core.spatial_index import SpatialIndex
+from neoscore.core.units import Unit
+
+
+def _rect(x, y, width, height) -> Rect:
+    return Rect(Unit(x), Unit(y), Unit(width), Unit(height))
+
+
+class TestSpatialIndex(unittest.TestCase):
+    def test_empty_index(self):
+        index = SpatialIndex([])
+        assert len(index) == 0
+        assert index.items_at(Point(Unit(0), Unit(0))) == []
+        assert index.items_in(_rect(0, 0, 10, 10)) == []
+
+    def test_items_at(self):
+        index = SpatialIndex([(_rect(0, 0, 10, 10), "a"), (_rect(5, 5, 10, 10), "b")])
+        assert index.items_at(Point(Unit(2), Unit(2))) == ["a"]
+        assert index.items_at(Point(Unit(7), Unit(7))) == ["a", "b"]
+        assert index.items_at(Point(Unit(15), Unit(15))) == ["b"]
+        assert index.items_at(Point(Unit(20), Unit(2))) == []
+
+    def test_items_in(self):
+        index = SpatialIndex([(_rect(0, 0, 10, 10), "a"), (_rect(50, 0, 10, 10), "b")])
+        assert index.items_in(_rect(8, 8, 10, 10)) == ["a"]
+        assert index.items_in(_rect(-5, -5, 100, 100)) == ["a", "b"]
+        assert index.items_in(_rect(20, 0, 10, 10)) == []
+
+    def test_items_with_several_rects_found_once(self):
+        index = SpatialIndex(
+            [
+                (_rect(0, 0, 10, 10), "a"),
+                (_rect(20, 0, 10, 10), "b"),
+                (_rect(40, 0, 10, 10), "a"),
+            ]
+        )
+        assert len(index) == 2
+        assert index.items_at(Point(Unit(45), Unit(5))) == ["a"]
+        assert index.items_in(_rect(0, 0, 50, 10)) == ["a", "b"]
+
+    def test_results_in_order_given(self):
+        entries = [(_rect(100 - i, 0, 1, 1), i) for i in range(100)]
+        index = SpatialIndex(entries)
+        assert index.items_in(_rect(0, 0, 200, 1)) == list(range(100))
+
+    def test_matches_brute_force_search(self):
+        rng = random.Random(0)
+        entries = [
+            (
+                _rect(
+                    rng.uniform(0, 1000),
+                    rng.uniform(0, 1000),
+                    rng.uniform(0, 30),
+                    rng.uniform(0, 30),
+                ),
+                i,
+            )
+            for i in range(2000)
+        ]
+        index = SpatialIndex(entries)
+        for _ in range(50):
+            query = _rect(rng.uniform(0, 1000), rng.uniform(0, 1000), 50, 20)
+            expected = [
+                i
+                for rect, i in entries
+                if rect.x <= query.x + query.width
+                and rect.x + rect.width >= query.x
+                and rect.y <= query.y + query.height
+                and rect.y + rect.height >= query.y
+            ]
+            assert index.items_in(query) == expected
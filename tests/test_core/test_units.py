@@ -19,6 +19,12 @@ class TestUnit(unittest.TestCase):
     def test_init_from_other_compatible_type(self):
         assert Unit(MockUnit(1)).base_value == 2
 
+    def test_from_base_value(self):
+        unit = MockUnit._from_base_value(10)
+        assert type(unit) == MockUnit
+        assert unit.base_value == 10
+        assert unit.display_value == 5
+
     def test_display_value(self):
         assert Unit(123.456).display_value == 123.456
         assert MockUnit(5).display_value == 5
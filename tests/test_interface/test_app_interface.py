@@ -1,6 +1,18 @@
+import os
 import random
+import re
+import tempfile
+import zlib
+
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtWidgets import QGraphicsItem
 
 from neoscore.core import neoscore
+from neoscore.core.color import Color
+from neoscore.core.point import ORIGIN
+from neoscore.core.rect import Rect
+from neoscore.core.text import Text
+from neoscore.core.units import Mm, Unit
 
 from ..helpers import AppTest
 
@@ -13,3 +25,162 @@ class TestAppInterface(AppTest):
             neoscore.app_interface.viewport_scale = set_scale
             got_scale = neoscore.app_interface.viewport_scale
             self.assertAlmostEqual(set_scale, got_scale)
+
+    def test_render_vector_pdf(self):
+        text = Text(ORIGIN, None, "test")
+        neoscore._render_document(False, neoscore.background_brush)
+        rects = [
+            Rect(Mm(0), Mm(0), Mm(100), Mm(50)),
+            Rect(Mm(0), Mm(0), Unit(200), Unit(300)),
+        ]
+        with tempfile.TemporaryDirectory() as out_dir:
+            out_path = os.path.join(out_dir, "out.pdf")
+            neoscore.app_interface.render_vector_pdf(rects, out_path)
+            with open(out_path, "rb") as f:
+                pdf = f.read()
+        assert len(re.findall(rb"/Type /Page\b", pdf)) == 2
+        media_boxes = re.findall(rb"/MediaBox \[0 0 ([\d.]+) ([\d.]+)\]", pdf)
+        assert [(round(float(w)), round(float(h))) for w, h in media_boxes] == [
+            (round(Mm(100).base_value), round(Mm(50).base_value)),
+            (200, 300),
+        ]
+        # Text is drawn as vectors, not cached pixmaps
+        assert b"/Subtype /Image" not in pdf
+        # Item cache modes are restored
+        qt_object = text.interfaces[0]._qt_object
+        assert qt_object.cacheMode() == QGraphicsItem.CacheMode.DeviceCoordinateCache
+
+    def test_render_pdf_streams_pages_in_order(self):
+        Text(ORIGIN, None, "test")
+        neoscore._render_document(False, neoscore.background_brush)
+        rects = [
+            Rect(Mm(0), Mm(0), Unit(72 * (i + 1)), Unit(36 * (i + 1))) for i in range(4)
+        ]
+        with tempfile.TemporaryDirectory() as out_dir:
+            out_path = os.path.join(out_dir, "out.pdf")
+            neoscore.app_interface.render_pdf(
+                rects, out_path, 10, Color("#ffffff"), max_in_flight_pages=1
+            )
+            with open(out_path, "rb") as f:
+                pdf = f.read()
+        assert len(re.findall(rb"/Type /Page\b", pdf)) == 4
+        assert re.findall(rb"/MediaBox \[([^\]]*)\]", pdf) == [
+            b"0 0 72 36",
+            b"0 0 144 72",
+            b"0 0 216 108",
+            b"0 0 288 144",
+        ]
+        widths = [int(w) for w in re.findall(rb"/Width (\d+)", pdf)]
+        assert widths == sorted(set(widths))
+        assert len(widths) == 4
+
+    def test_render_pdf_page_encodes_rgb_without_alpha(self):
+        initial_brush = neoscore.background_brush
+        try:
+            neoscore.set_background_brush(Color(10, 20, 30))
+            neoscore._render_document(False, neoscore.background_brush)
+            page = neoscore.app_interface.render_pdf_page(
+                Rect(Mm(0), Mm(0), Unit(72), Unit(36)), 10, Color(10, 20, 30)
+            )
+        finally:
+            neoscore.set_background_brush(initial_brush)
+        pixel_count = page.pixel_width * page.pixel_height
+        assert pixel_count > 0
+        assert zlib.decompress(page.data) == bytes([10, 20, 30]) * pixel_count
+
+    def test_encode_pdf_page_keeps_channel_order(self):
+        q_image = QImage(3, 1, QImage.Format_RGB32)
+        for x, color in enumerate(["#ff0000", "#00ff00", "#0000ff"]):
+            q_image.setPixelColor(x, 0, QColor(color))
+        page = neoscore.app_interface._encode_pdf_page(q_image)
+        assert zlib.decompress(page.data) == bytes([255, 0, 0, 0, 255, 0, 0, 0, 255])
+
+    def test_content_rect_of_blank_image(self):
+        q_image = QImage(20, 10, QImage.Format_RGB32)
+        q_image.fill(QColor("#ffffff"))
+        assert neoscore.app_interface._content_rect(q_image, QColor("#ffffff")) is None
+
+    def test_content_rect_scans_to_outermost_pixels(self):
+        q_image = QImage(50, 40, QImage.Format_ARGB32)
+        q_image.fill(QColor("#ffffff"))
+        q_image.setPixelColor(30, 5, QColor("#000000"))
+        q_image.setPixelColor(10, 20, QColor("#ff0000"))
+        q_image.setPixelColor(12, 33, QColor("#0000ff"))
+        rect = neoscore.app_interface._content_rect(q_image, QColor("#ffffff"))
+        assert (rect.x(), rect.y(), rect.width(), rect.height()) == (10, 5, 21, 29)
+
+    def test_content_rect_with_content_on_edges(self):
+        q_image = QImage(50, 40, QImage.Format_RGB32)
+        q_image.fill(QColor("#ffffff"))
+        q_image.setPixelColor(0, 39, QColor("#000000"))
+        q_image.setPixelColor(49, 0, QColor("#000000"))
+        rect = neoscore.app_interface._content_rect(q_image, QColor("#ffffff"))
+        assert (rect.x(), rect.y(), rect.width(), rect.height()) == (0, 0, 50, 40)
+
+    def test_content_rect_with_transparent_background(self):
+        q_image = QImage(50, 40, QImage.Format_ARGB32)
+        q_image.fill(QColor(0, 0, 0, 0))
+        q_image.setPixelColor(20, 10, QColor("#000000"))
+        rect = neoscore.app_interface._content_rect(q_image, QColor(0, 0, 0, 0))
+        assert (rect.x(), rect.y(), rect.width(), rect.height()) == (20, 10, 1, 1)
+
+    def test_autocrop(self):
+        q_image = QImage(50, 40, QImage.Format_ARGB32)
+        q_image.fill(QColor("#ffffff"))
+        q_image.setPixelColor(10, 5, QColor("#000000"))
+        q_image.setPixelColor(30, 20, QColor("#000000"))
+        cropped = neoscore.app_interface._autocrop(q_image, QColor("#ffffff"))
+        assert (cropped.width(), cropped.height()) == (21, 16)
+        assert cropped.pixelColor(0, 0) == QColor("#000000")
+        assert q_image.width() == 50
+
+    def test_render_image_crop_to_items(self):
+        Text((Mm(20), Mm(20)), None, "test")
+        full_buffer = bytearray()
+        cropped_buffer = bytearray()
+        rect = Rect(Mm(0), Mm(0), Mm(100), Mm(100))
+        neoscore.render_image(rect, full_buffer, 72)
+        neoscore.render_image(rect, cropped_buffer, 72, crop_to_items=True)
+        full = QImage.fromData(bytes(full_buffer))
+        cropped = QImage.fromData(bytes(cropped_buffer))
+        assert 0 < cropped.width() < full.width() / 2
+        assert 0 < cropped.height() < full.height() / 2
+        assert cropped.width() > 10
+
+    def test_render_pixels_rgba(self):
+        initial_brush = neoscore.background_brush
+        try:
+            neoscore.set_background_brush(Color(10, 20, 30))
+            neoscore._render_document(False, neoscore.background_brush)
+            pixels = neoscore.app_interface.render_pixels(
+                Rect(Mm(0), Mm(0), Unit(72), Unit(36)),
+                72,
+                Color(10, 20, 30),
+                False,
+                True,
+                False,
+            )
+        finally:
+            neoscore.set_background_brush(initial_brush)
+        assert pixels.channels == 4
+        assert pixels.shape == (pixels.height, pixels.width, 4)
+        assert pixels.width > pixels.height > 0
+        assert bytes(pixels.row(0)[:4]) == bytes([10, 20, 30, 255])
+
+    def test_render_pixels_grayscale(self):
+        initial_brush = neoscore.background_brush
+        try:
+            neoscore.set_background_brush(Color(255, 255, 255))
+            neoscore._render_document(False, neoscore.background_brush)
+            pixels = neoscore.app_interface.render_pixels(
+                Rect(Mm(0), Mm(0), Unit(72), Unit(36)),
+                72,
+                Color(255, 255, 255),
+                False,
+                False,
+                True,
+            )
+        finally:
+            neoscore.set_background_brush(initial_brush)
+        assert pixels.channels == 1
+        assert bytes(pixels.row(pixels.height - 1)) == bytes([255]) * pixels.width
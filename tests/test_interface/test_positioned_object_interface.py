@@ -1,6 +1,8 @@
-from PyQt5.QtWidgets import QGraphicsSimpleTextItem
+from PyQt5.QtWidgets import QGraphicsRectItem, QGraphicsSimpleTextItem
 
-from neoscore.core.point import ORIGIN
+from neoscore.core.point import ORIGIN, Point
+from neoscore.core.rect import Rect
+from neoscore.core.units import Unit
 from neoscore.interface.positioned_object_interface import PositionedObjectInterface
 
 from ..helpers import AppTest
@@ -24,3 +26,20 @@ class TestPositionedObjectInterface(AppTest):
         interface._register_qt_object(qt_obj)
         assert qt_obj.parentItem() == parent_interface._qt_object
         assert qt_obj.scene() is not None
+
+    def test_scene_bounding_rect(self):
+        interface = PositionedObjectInterface(
+            Point(Unit(10), Unit(20)), None, 1, 0, ORIGIN
+        )
+        assert interface.scene_bounding_rect() is None
+        qt_obj = QGraphicsRectItem(0, 0, 5, 6)
+        qt_obj.setPos(10, 20)
+        interface._register_qt_object(qt_obj)
+        assert interface.scene_bounding_rect() == Rect(
+            Unit(9.5), Unit(19.5), Unit(6), Unit(7)
+        )
+
+    def test_scene_bounding_rect_of_empty_object(self):
+        interface = PositionedObjectInterface(ORIGIN, None, 1, 0, ORIGIN)
+        interface._register_qt_object(QGraphicsSimpleTextItem())
+        assert interface.scene_bounding_rect() is None
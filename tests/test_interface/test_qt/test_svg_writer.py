@@ -0,0 +1,112 @@
+import re
+import xml.etree.ElementTree as ET
+
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QBrush, QColor, QPainterPath, QPen
+from PyQt5.QtWidgets import QGraphicsScene
+
+from neoscore.interface.qt.q_clipping_path import QClippingPath
+from neoscore.interface.qt.svg_writer import scene_to_svg
+
+from ...helpers import AppTest
+
+_SVG_NS = "{http://www.w3.org/2000/svg}"
+_XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+
+def _square_path(size: float) -> QPainterPath:
+    path = QPainterPath()
+    path.addRect(0, 0, size, size)
+    return path
+
+
+class TestSvgWriter(AppTest):
+    def setUp(self):
+        super().setUp()
+        self.scene = QGraphicsScene()
+
+    def _add_path(self, path: QPainterPath, x: float, y: float, **kwargs):
+        item = QClippingPath(path, **kwargs)
+        item.setBrush(QBrush(QColor("#ff0000")))
+        item.setPen(QPen(0))
+        item.setPos(x, y)
+        self.scene.addItem(item)
+        return item
+
+    def _export(self, rect=QRectF(0, 0, 100, 50), bg_color=None) -> ET.Element:
+        return ET.fromstring(scene_to_svg(self.scene, rect, bg_color))
+
+    def test_document_size_and_view_box(self):
+        root = self._export(QRectF(10, 20, 100, 50))
+        assert root.get("width") == "100pt"
+        assert root.get("height") == "50pt"
+        assert root.get("viewBox") == "10 20 100 50"
+
+    def test_repeated_paths_share_one_definition(self):
+        for i in range(20):
+            self._add_path(_square_path(2), i * 3, 5)
+        root = self._export()
+        definitions = root.findall(f"{_SVG_NS}defs/{_SVG_NS}path")
+        assert len(definitions) == 1
+        uses = root.findall(f"{_SVG_NS}use")
+        assert len(uses) == 20
+        assert {use.get(_XLINK_HREF) for use in uses} == {
+            "#" + definitions[0].get("id")
+        }
+        assert uses[1].get("transform") == "translate(3 5)"
+        assert uses[1].get("fill") == "#ff0000"
+
+    def test_scaled_paths_share_definition(self):
+        self._add_path(_square_path(2), 0, 0)
+        self._add_path(_square_path(2), 10, 0, scale=3)
+        root = self._export()
+        assert len(root.findall(f"{_SVG_NS}defs/{_SVG_NS}path")) == 1
+        assert root.findall(f"{_SVG_NS}use")[1].get("transform") == (
+            "matrix(3 0 0 3 10 0)"
+        )
+
+    def test_distinct_paths_get_distinct_definitions(self):
+        self._add_path(_square_path(2), 0, 0)
+        self._add_path(_square_path(4), 10, 0)
+        root = self._export()
+        assert len(root.findall(f"{_SVG_NS}defs/{_SVG_NS}path")) == 2
+
+    def test_path_data(self):
+        path = QPainterPath()
+        path.moveTo(1, 2)
+        path.lineTo(3.5, 4)
+        path.cubicTo(5, 6, 7, 8, 9, 10)
+        self._add_path(path, 0, 0)
+        root = self._export()
+        definition = root.find(f"{_SVG_NS}defs/{_SVG_NS}path")
+        assert definition.get("d") == "M1 2L3.5 4C5 6 7 8 9 10"
+
+    def test_clipped_paths_are_shifted_and_clipped(self):
+        self._add_path(_square_path(40), 0, 0, clip_start_x=10, clip_width=20)
+        root = self._export()
+        group = root.find(f"{_SVG_NS}g")
+        clip_id = re.fullmatch(r"url\(#(.*)\)", group.get("clip-path")).group(1)
+        clip_rect = root.find(f"{_SVG_NS}defs/{_SVG_NS}clipPath[@id='{clip_id}']/*")
+        assert clip_rect.get("width") == "20"
+        assert group.find(f"{_SVG_NS}use").get("transform") == "translate(-10 0)"
+
+    def test_items_outside_rect_are_skipped(self):
+        self._add_path(_square_path(2), 0, 0)
+        self._add_path(_square_path(2), 500, 0)
+        root = self._export()
+        assert len(root.findall(f"{_SVG_NS}use")) == 1
+
+    def test_background_color(self):
+        root = self._export(bg_color=QColor("#00ff00"))
+        background = root.find(f"{_SVG_NS}rect")
+        assert background.get("fill") == "#00ff00"
+        assert background.get("width") == "100"
+
+    def test_transparent_background_is_omitted(self):
+        root = self._export(bg_color=QColor(0, 0, 0, 0))
+        assert root.find(f"{_SVG_NS}rect") is None
+
+    def test_other_items_are_painted(self):
+        self.scene.addText("hello")
+        root = self._export()
+        assert "hello" in ET.tostring(root, encoding="unicode")
@@ -147,3 +147,9 @@ class TestNotehead(AppTest):
         assert note.music_chars == [MusicChar(self.staff.music_font, "noteheadBlack")]
         note.glyph_override = "gClef"
         assert note.music_chars == [MusicChar(self.staff.music_font, "gClef")]
+
+    def test_noteheads_have_no_instance_dict(self):
+        note = Notehead(Mm(10), self.staff, "c'", (1, 4))
+        assert not hasattr(note, "__dict__")
+        with self.assertRaises(AttributeError):
+            note.some_new_attribute = 1
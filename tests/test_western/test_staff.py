@@ -4,8 +4,9 @@ from neoscore.core import neoscore
 from neoscore.core.flowable import Flowable
 from neoscore.core.paper import Paper
 from neoscore.core.pen import Pen
-from neoscore.core.point import ORIGIN, Point
+from neoscore.core.point import ORIGIN
 from neoscore.core.units import Mm
+from neoscore.interface.path_interface import ResolvedLineTo, ResolvedMoveTo
 from neoscore.western import clef_type
 from neoscore.western.clef import Clef
 from neoscore.western.staff import NoClefError, Staff
@@ -107,18 +108,20 @@ class TestStaff(AppTest):
             staff.unit(-1),
         ]
 
-    def test_path_drawing(self):
+    def test_staff_segment_path_elements(self):
         staff = Staff((Mm(2), Mm(3)), self.flowable, Mm(10), None, Mm(1))
-        path = staff._create_staff_segment_path(Point(Mm(2), Mm(3)), Mm(10), True)
-        self.flowable.pre_render_hook()
-        self.flowable.render()
-        # Top line
-        assert path.elements[0].pos == Point(Mm(0), Mm(0))
-        assert path.elements[0].parent == path
-        assert path.elements[1].pos == Point(Mm(10), Mm(0))
-        assert path.elements[1].parent == path
-        # Second line
-        assert path.elements[2].pos == Point(Mm(0), Mm(1))
-        assert path.elements[2].parent == path
-        assert path.elements[3].pos == Point(Mm(10), Mm(1))
-        assert path.elements[3].parent == path
+        elements = staff._staff_segment_path_elements(Mm(10))
+        assert elements == [
+            # Top line
+            ResolvedMoveTo(Mm(0), Mm(0)),
+            ResolvedLineTo(Mm(10), Mm(0)),
+            # Second line
+            ResolvedMoveTo(Mm(0), Mm(1)),
+            ResolvedLineTo(Mm(10), Mm(1)),
+            ResolvedMoveTo(Mm(0), Mm(2)),
+            ResolvedLineTo(Mm(10), Mm(2)),
+            ResolvedMoveTo(Mm(0), Mm(3)),
+            ResolvedLineTo(Mm(10), Mm(3)),
+            ResolvedMoveTo(Mm(0), Mm(4)),
+            ResolvedLineTo(Mm(10), Mm(4)),
+        ]